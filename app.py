@@ -13,11 +13,16 @@ from ui.forms import (
 )
 from ui.layout import mostrar_titulo
 from ui.materias_ui import render_materias_section
-from logic.utils import cargar_profesores, cargar_materias, leer_json
-from logic.asignador import asignar_horarios
+from ui.escenarios_ui import render_escenarios_section
+from logic.utils import cargar_profesores, cargar_materias, cargar_horarios
+from logic.franjas import grilla
+from logic.validaciones import validar_profesores
+from logic.asignador import resolver_horarios, reasignar_horarios
+from logic.optimizador import optimizar_horarios
+from logic.cache import CacheResultados, clave_contenido
 
 RUTA_LOGO = "assets/logo.png"
-RUTA_HORARIOS = "data/horarios.json"
+RUTA_CACHE = ".cache/horarios"
 
 # ------------------- Layout principal -------------------
 def main():
@@ -33,7 +38,7 @@ def main():
     with col2:
         menu = st.radio(
             "Menú",
-            ["Gestión de Profesores", "Gestión de Materias", "Configuración de Horarios"],
+            ["Gestión de Profesores", "Gestión de Materias", "Configuración de Horarios", "Escenarios"],
             index=0
         )
     with col1:
@@ -59,24 +64,127 @@ def main():
                 st.info("Debe registrar al menos un profesor para calcular horarios.")
             else:
                 seleccionados = seleccionar_profesores_para_calculo(profesores)
+                limite = st.number_input("Tiempo máximo de cálculo (segundos)", min_value=1, max_value=600, value=30, step=1)
+                optimizar = st.checkbox(
+                    "Optimizar calidad (menos horas muertas, carga repartida, menos clases temprano)", value=True
+                )
                 if seleccionados and st.button("Calcular horarios", type="primary"):
-                    horarios_base = leer_json(RUTA_HORARIOS)
-                    asignaciones, errores = asignar_horarios(seleccionados, horarios_base)
-                    if asignaciones:
-                        st.success("Asignaciones realizadas:")
-                        st.dataframe(pd.DataFrame(asignaciones), use_container_width=True, hide_index=True)
-                        # Carga horaria por profesor
-                        st.markdown("#### Carga horaria por profesor")
-                        df = pd.DataFrame(asignaciones)
-                        resumen = df.groupby('profesor').agg(
-                            bloques=('horario', 'count'),
-                        ).reset_index()
-                        resumen['horas'] = resumen['bloques'] * 2
-                        st.dataframe(resumen, use_container_width=True, hide_index=True)
+                    horarios_base = cargar_horarios()
+                    errores = validar_profesores(seleccionados)
+                    if errores:
+                        st.error("Corrija los datos de los profesores antes de calcular:")
+                        for fila, mensaje in errores:
+                            st.markdown(f"- {seleccionados[fila - 1].get('nombre') or f'Profesor #{fila}'}: {mensaje}")
                     else:
-                        st.error("No se pudo asignar horarios:")
-                        for e in errores:
-                            st.markdown(f"- {e}")
+                        cache = obtener_cache_horarios()
+                        # El límite de tiempo no entra en la clave: solo se guardan resultados no truncados
+                        clave = clave_contenido(seleccionados, horarios_base, optimizar=optimizar)
+                        resultado = cache.obtener(clave)
+                        if resultado is not None:
+                            st.caption("Resultado recuperado de la caché: los datos no cambiaron desde el último cálculo.")
+                        else:
+                            anteriores = st.session_state.get("ultima_asignacion")
+                            resultado = calcular_horarios(seleccionados, horarios_base, limite, optimizar, anteriores)
+                            # La caché se comparte entre sesiones: solo se guardan cálculos
+                            # completos desde cero, no reparaciones de la solución de esta sesión
+                            if not resultado.agotado and not anteriores:
+                                cache.guardar(clave, resultado)
+                        st.session_state["resultado_horarios"] = resultado
+                        if resultado.completo:
+                            st.session_state["ultima_asignacion"] = resultado.asignaciones
+                            st.session_state["cambios_horario"] = {"profesores": [], "materias": []}
+                resultado = st.session_state.get("resultado_horarios")
+                if resultado:
+                    mostrar_resultado_horarios(resultado)
+
+        elif menu == "Escenarios":
+            render_escenarios_section()
+
+@st.cache_resource
+def obtener_cache_horarios():
+    """Caché de resultados compartida por todas las sesiones del servidor."""
+    return CacheResultados(RUTA_CACHE)
+
+def calcular_horarios(seleccionados, horarios_base, limite, optimizar, anteriores=None):
+    """
+    Ejecuta el asignador y la optimización opcional. Si hay una asignación
+    `anteriores` de esta sesión, repara solo lo afectado por las ediciones y
+    no optimiza: el optimizador movería también los bloques conservados.
+    """
+    barra = st.progress(0.0)
+    estado = st.empty()
+
+    def mostrar_progreso(p):
+        barra.progress(min(p["colocados"] / max(p["total"], 1), 1.0))
+        estado.caption(
+            f"Bloques colocados: {p['colocados']}/{p['total']} · "
+            f"Retrocesos: {p['retrocesos']} · {p['transcurrido']:.1f} s"
+        )
+
+    if anteriores:
+        # Reparar solo lo afectado por las ediciones desde el último cálculo
+        cambios = st.session_state.get("cambios_horario", {})
+        resultado = reasignar_horarios(
+            seleccionados, horarios_base, anteriores, cambios,
+            limite_tiempo=limite, progreso=mostrar_progreso, estadisticas=True,
+        )
+    else:
+        resultado = resolver_horarios(
+            seleccionados, horarios_base, limite_tiempo=limite, progreso=mostrar_progreso, estadisticas=True
+        )
+    if anteriores:
+        if resultado.completo:
+            estado.caption("Reparación incremental: se conservaron las franjas no afectadas por los cambios.")
+    elif resultado.completo and optimizar:
+        resultado.asignaciones, resumen = optimizar_horarios(
+            resultado.asignaciones, seleccionados, horarios_base, limite_tiempo=5
+        )
+        estado.caption(f"Costo del horario: {resumen['costo_inicial']:.1f} → {resumen['costo_final']:.1f}")
+    return resultado
+
+def mostrar_carga_horaria(asignaciones):
+    """Muestra la tabla de asignaciones y la carga horaria por profesor."""
+    st.dataframe(pd.DataFrame(asignaciones), use_container_width=True, hide_index=True)
+    # Carga horaria por profesor: las horas salen de la duración real de cada franja
+    st.markdown("#### Carga horaria por profesor")
+    df = pd.DataFrame(asignaciones)
+    df['horas'] = df['horario'].map(grilla(cargar_horarios()).horas)
+    resumen = df.groupby('profesor').agg(
+        bloques=('horario', 'count'),
+        horas=('horas', 'sum'),
+    ).reset_index()
+    st.dataframe(resumen, use_container_width=True, hide_index=True)
+
+def mostrar_resultado_horarios(resultado):
+    """Muestra el resultado del cálculo; permite aceptar el mejor parcial si se agotó el tiempo."""
+    if resultado.completo:
+        st.success("Asignaciones realizadas:")
+        mostrar_carga_horaria(resultado.asignaciones)
+    elif resultado.agotado and resultado.asignaciones:
+        st.warning(
+            f"{resultado.errores[0]} ({resultado.bloques_pendientes} bloques pendientes)."
+        )
+        mostrar_carga_horaria(resultado.asignaciones)
+        if st.button("Aceptar mejor resultado"):
+            st.session_state["ultima_asignacion"] = resultado.asignaciones
+            st.session_state["cambios_horario"] = {"profesores": [], "materias": []}
+            st.success("Se aceptó la asignación parcial; el próximo cálculo partirá de ella.")
+        with st.expander("Bloques sin asignar"):
+            for e in resultado.errores[1:]:
+                st.markdown(f"- {e}")
+    else:
+        st.error("No se pudo asignar horarios:")
+        for e in resultado.errores:
+            st.markdown(f"- {e}")
+    if resultado.estadisticas:
+        stats = resultado.estadisticas
+        with st.expander("Estadísticas del cálculo"):
+            st.markdown(
+                f"- Componentes: {stats.componentes} · Nodos: {stats.nodos} · "
+                f"Retrocesos: {stats.retrocesos} · Podas: {stats.podas}"
+            )
+            st.markdown("- Tiempos: " + ", ".join(f"{fase} {seg * 1000:.1f} ms" for fase, seg in stats.tiempos.items()))
+            st.markdown("- Picos: " + ", ".join(f"{clave} {valor}" for clave, valor in stats.picos.items()))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
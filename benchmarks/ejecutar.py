@@ -0,0 +1,221 @@
+"""
+Suite de rendimiento del asignador, del gestor de materias y de los cargadores.
+
+Uso:
+    python -m benchmarks.ejecutar [--niveles pequeno,mediano,grande]
+                                  [--suites asignador,materias,utils]
+                                  [--semilla 0] [--repeticiones 3]
+                                  [--salida bench_output.json]
+
+Los resultados se escriben en JSON para comparar versiones entre sí.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generador import generar_instancia
+from logic import utils
+from logic.asignador import reasignar_horarios, resolver_horarios
+from logic.factibilidad import verificar_factibilidad
+from logic.optimizador import optimizar_horarios
+
+# nivel: (profesores, materias del catálogo, días, franjas por día)
+NIVELES = {
+    "pequeno": (20, 30, 5, 4),
+    "mediano": (100, 50, 5, 5),
+    "grande": (300, 60, 5, 6),
+}
+
+
+def _medir(funcion, repeticiones):
+    """Ejecuta la función varias veces y retorna (tiempos, último resultado)."""
+    tiempos, resultado = [], None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, resultado
+
+
+def _registro(suite, caso, nivel, tiempos, **extra):
+    return {
+        "suite": suite,
+        "caso": caso,
+        "nivel": nivel,
+        "repeticiones": len(tiempos),
+        "mejor_s": min(tiempos),
+        "mediana_s": statistics.median(tiempos),
+        **extra,
+    }
+
+
+def suite_asignador(nivel, instancia, repeticiones):
+    profesores, _, grilla = instancia
+    registros = []
+    tiempos, _ = _medir(lambda: verificar_factibilidad(profesores, grilla), repeticiones)
+    registros.append(_registro("asignador", "verificar_factibilidad", nivel, tiempos))
+    for procesos in (1, None):
+        tiempos, resultado = _medir(
+            lambda: resolver_horarios(profesores, grilla, procesos=procesos, estadisticas=True), repeticiones
+        )
+        stats = resultado.estadisticas
+        registros.append(_registro(
+            "asignador", f"resolver_horarios[procesos={procesos or 'auto'}]", nivel, tiempos,
+            completo=resultado.completo, bloques=len(resultado.asignaciones),
+            nodos=stats.nodos, retrocesos=stats.retrocesos, fases_s=stats.tiempos,
+        ))
+    if not resultado.completo:
+        return registros
+    asignaciones = resultado.asignaciones
+    tiempos, (_, resumen) = _medir(
+        lambda: optimizar_horarios(asignaciones, profesores, grilla, iteraciones=20000), repeticiones
+    )
+    registros.append(_registro(
+        "asignador", "optimizar_horarios[20000]", nivel, tiempos,
+        costo_inicial=resumen["costo_inicial"], costo_final=resumen["costo_final"],
+    ))
+    editados = copy.deepcopy(profesores)
+    editados[0]["horarios_disponibles"] = editados[0]["horarios_disponibles"][::-1][:-1]
+    tiempos, _ = _medir(
+        lambda: reasignar_horarios(editados, grilla, asignaciones, {"profesores": [editados[0]["nombre"]]}),
+        repeticiones,
+    )
+    registros.append(_registro("asignador", "reasignar_horarios[1 profesor]", nivel, tiempos))
+    return registros
+
+
+def suite_materias(nivel, instancia, repeticiones, directorio):
+    from logic.materias_manager import MateriasManager
+
+    _, catalogo, _ = instancia
+    ruta = os.path.join(directorio, f"materias_{nivel}.json")
+    registros = []
+
+    def agregar_todas():
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        manager = MateriasManager(ruta)
+        for materia in catalogo:
+            manager.add_materia(materia)
+        return manager
+
+    tiempos, manager = _medir(agregar_todas, repeticiones)
+    registros.append(_registro("materias", f"add_materia x{len(catalogo)}", nivel, tiempos))
+
+    def agregar_en_lote():
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        return MateriasManager(ruta).add_many(catalogo)
+
+    tiempos, _ = _medir(agregar_en_lote, repeticiones)
+    registros.append(_registro("materias", f"add_many x{len(catalogo)}", nivel, tiempos))
+    manager = agregar_todas()
+    codigos = [m["codigo"] for m in catalogo]
+    tiempos, _ = _medir(lambda: [manager.get_materia_by_codigo(c) for c in codigos], repeticiones)
+    registros.append(_registro("materias", f"get_materia_by_codigo x{len(codigos)}", nivel, tiempos))
+    tiempos, _ = _medir(lambda: [manager.get_materias_by_semestre(s) for s in range(1, 11)], repeticiones)
+    registros.append(_registro("materias", "get_materias_by_semestre x10", nivel, tiempos))
+    tiempos, _ = _medir(
+        lambda: [manager.update_materia(m["codigo"], dict(m, horas_semanales=m["horas_semanales"]))
+                 for m in catalogo[:20]],
+        repeticiones,
+    )
+    registros.append(_registro("materias", "update_materia x20", nivel, tiempos))
+
+    def eliminar_y_reponer():
+        for m in catalogo[:20]:
+            manager.delete_materia(m["codigo"])
+        for m in catalogo[:20]:
+            manager.add_materia(m)
+
+    tiempos, _ = _medir(eliminar_y_reponer, repeticiones)
+    registros.append(_registro("materias", "delete_materia+add_materia x20", nivel, tiempos))
+    return registros
+
+
+def suite_utils(nivel, instancia, repeticiones, directorio):
+    profesores, catalogo, _ = instancia
+    rutas = {
+        "RUTA_PROFESORES": os.path.join(directorio, f"profesores_{nivel}.json"),
+        "RUTA_MATERIAS": os.path.join(directorio, f"materias_data_{nivel}.json"),
+        "RUTA_MALLA_CURRICULAR": os.path.join(directorio, f"malla_{nivel}.json"),
+    }
+    originales = {nombre: getattr(utils, nombre) for nombre in rutas}
+    for nombre, ruta in rutas.items():
+        setattr(utils, nombre, ruta)
+    try:
+        utils.escribir_json(rutas["RUTA_PROFESORES"], profesores)
+        utils.escribir_json(rutas["RUTA_MATERIAS"], catalogo)
+        utils.escribir_json(rutas["RUTA_MALLA_CURRICULAR"], catalogo)
+        registros = []
+        for nombre, funcion in (
+            ("cargar_profesores", utils.cargar_profesores),
+            ("cargar_materias", utils.cargar_materias),
+            ("cargar_malla_curricular", utils.cargar_malla_curricular),
+        ):
+            tiempos, _ = _medir(funcion, repeticiones)
+            registros.append(_registro("utils", nombre, nivel, tiempos))
+        tiempos, _ = _medir(lambda: [utils.obtener_materias_por_semestre(s) for s in range(1, 11)], repeticiones)
+        registros.append(_registro("utils", "obtener_materias_por_semestre x10", nivel, tiempos))
+        codigos = [m["codigo"] for m in catalogo[:50]]
+        tiempos, _ = _medir(lambda: [utils.buscar_materia_por_codigo(c) for c in codigos], repeticiones)
+        registros.append(_registro("utils", f"buscar_materia_por_codigo x{len(codigos)}", nivel, tiempos))
+        nombre = profesores[len(profesores) // 2]["nombre"]
+        tiempos, _ = _medir(lambda: utils.actualizar_profesor(nombre, profesores[len(profesores) // 2]), repeticiones)
+        registros.append(_registro("utils", "actualizar_profesor", nivel, tiempos))
+        return registros
+    finally:
+        for nombre, valor in originales.items():
+            setattr(utils, nombre, valor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de horarios_app")
+    parser.add_argument("--niveles", default=",".join(NIVELES), help="Niveles de escala separados por coma")
+    parser.add_argument("--suites", default="asignador,materias,utils", help="Suites separadas por coma")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", default="bench_output.json")
+    args = parser.parse_args(argv)
+
+    suites = args.suites.split(",")
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for nivel in args.niveles.split(","):
+            n_profesores, n_materias, dias, franjas = NIVELES[nivel]
+            instancia = generar_instancia(n_profesores, n_materias, dias, franjas, semilla=args.semilla)
+            if "asignador" in suites:
+                resultados += suite_asignador(nivel, instancia, args.repeticiones)
+            if "materias" in suites:
+                resultados += suite_materias(nivel, instancia, args.repeticiones, directorio)
+            if "utils" in suites:
+                resultados += suite_utils(nivel, instancia, args.repeticiones, directorio)
+            for registro in resultados:
+                if registro["nivel"] == nivel:
+                    print(f"{registro['suite']:10} {nivel:8} {registro['caso']:45} {registro['mejor_s'] * 1000:10.2f} ms")
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "semilla": args.semilla,
+        "niveles": {nivel: NIVELES[nivel] for nivel in args.niveles.split(",")},
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Generador reproducible de instancias sintéticas para pruebas de rendimiento.
+Produce grillas de franjas, catálogos de materias con el formato de
+resources/materias.json y profesores con el formato de data/profesores.json.
+"""
+import random
+
+DIAS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
+PREFIJOS = ["FUNDAMENTOS DE", "ANÁLISIS", "PROGRAMACIÓN", "SISTEMAS", "REDES", "BASES DE DATOS",
+            "INGENIERÍA DE", "ESTADÍSTICA", "FÍSICA", "ARQUITECTURA DE"]
+
+
+def generar_grilla(dias=5, franjas_por_dia=4, hora_inicio=7, duracion=2):
+    """Grilla semanal con el formato "Día H-H" de data/horarios.json."""
+    grilla = []
+    for dia in DIAS[:dias]:
+        for k in range(franjas_por_dia):
+            inicio = hora_inicio + k * duracion
+            grilla.append(f"{dia} {inicio}-{inicio + duracion}")
+    return grilla
+
+
+def generar_catalogo(n_materias, semestres=10, semilla=0):
+    """Catálogo de materias repartidas por semestre, como resources/materias.json."""
+    rnd = random.Random(semilla)
+    catalogo = []
+    for k in range(n_materias):
+        semestre = k % semestres + 1
+        horas = rnd.choice([2, 4, 4, 6])
+        catalogo.append({
+            "codigo": f"GEN{semestre:02d}{k:04d}",
+            "nombre": f"{rnd.choice(PREFIJOS)} {k + 1}",
+            "semestre": semestre,
+            "horas_semanales": horas,
+            "horas_semestrales": horas * 16,
+        })
+    return catalogo
+
+
+def generar_profesores(n_profesores, catalogo, grilla, densidad=0.6, semilla=0):
+    """
+    Profesores que dictan secciones (materia, paralelo) del catálogo.
+
+    Cada paralelo de un semestre cursa todas las materias de ese semestre;
+    se crean tantos paralelos como hagan falta para dar al menos una sección a
+    cada profesor. La disponibilidad de cada profesor cubre una fracción
+    `densidad` de la grilla y nunca menos que su propia demanda.
+    """
+    rnd = random.Random(semilla)
+    por_semestre = {}
+    for materia in catalogo:
+        por_semestre.setdefault(materia["semestre"], []).append(materia)
+    materias_por_paralelo = max(len(catalogo), 1)
+    paralelos = max(1, -(-int(n_profesores * 1.5) // materias_por_paralelo))
+    secciones = []
+    for p in range(paralelos):
+        for semestre in sorted(por_semestre):
+            for materia in por_semestre[semestre]:
+                secciones.append({
+                    "codigo": materia["codigo"],
+                    "nombre": materia["nombre"],
+                    "semestre": semestre,
+                    "paralelo": chr(ord("A") + p % 26) + ("" if p < 26 else str(p // 26)),
+                    "duracion": materia["horas_semanales"],
+                })
+    rnd.shuffle(secciones)
+    profesores = [{"nombre": f"Profesor {k + 1:04d}", "horarios_disponibles": [], "materias": []}
+                  for k in range(n_profesores)]
+    for k, seccion in enumerate(secciones):
+        profesores[k % n_profesores]["materias"].append(seccion)
+    for prof in profesores:
+        demanda = sum((m["duracion"] + 1) // 2 for m in prof["materias"])
+        cantidad = min(len(grilla), max(demanda + 2, int(len(grilla) * densidad)))
+        prof["horarios_disponibles"] = sorted(rnd.sample(grilla, cantidad), key=grilla.index)
+    return profesores
+
+
+def generar_instancia(n_profesores, n_materias, dias=5, franjas_por_dia=4, densidad=0.6, semilla=0):
+    """Retorna (profesores, catalogo, grilla) para los parámetros dados."""
+    grilla = generar_grilla(dias, franjas_por_dia)
+    catalogo = generar_catalogo(n_materias, semilla=semilla)
+    profesores = generar_profesores(n_profesores, catalogo, grilla, densidad, semilla)
+    return profesores, catalogo, grilla
@@ -0,0 +1,482 @@
+"""
+Almacenamiento intercambiable de profesores, materias y franjas.
+Cada colección se identifica por su ruta JSON histórica (por ejemplo
+"data/profesores.json"), de modo que las funciones de utils.py y el gestor de
+materias conservan sus firmas sin importar dónde viven los datos.
+
+- AlmacenJSON (por defecto): un archivo JSON por colección con un diario de
+  cambios de solo anexado que se compacta de forma atómica.
+- AlmacenSQLite: una tabla genérica con índices por código, nombre y semestre;
+  las modificaciones de un registro son actualizaciones de una fila.
+
+El almacén activo se elige con la variable de entorno HORARIOS_ALMACEN
+("json", "json:legible" o "sqlite:ruta/a/la/base.db") o con configurar_almacen().
+Los archivos JSON se guardan compactos; "json:legible" los escribe con sangría.
+
+Uso de la herramienta de migración:
+    python -m logic.almacenamiento importar --db data/horarios.db
+    python -m logic.almacenamiento exportar --db data/horarios.db [--legible]
+"""
+import argparse
+import os
+import sqlite3
+import threading
+
+from logic.diario import (
+    DiarioDesfasado, aplicar, anotar, eliminar_diario, escribir_atomico, huella, huella_archivo,
+    leer_operaciones, marcar_compactado, posicion, ruta_diario,
+    operacion_agregar, operacion_eliminar, operacion_reemplazar,
+)
+from logic.codificacion import cargar, volcar, volcar_texto
+from logic.concurrencia import bloqueo_escritura, verificar_operaciones
+from logic.instantaneas import firma, leer_instantanea, registrar
+from logic.repositorio import Repositorio
+
+# Campos por los que se reemplaza o elimina un registro
+CAMPOS_CLAVE = ("codigo", "nombre")
+
+# Operaciones que el diario acumula como mínimo antes de compactar
+MAX_DIARIO = 200
+
+COLECCIONES = (
+    "data/profesores.json",
+    "data/materias.json",
+    "data/horarios.json",
+    "resources/materias.json",
+)
+
+
+def _buscador(repositorio, ruta, registros):
+    """
+    Búsqueda buscar(campo, valor) -> posición sobre `registros`, el estado
+    vigente de la colección. Por nombre usa el índice del repositorio, que se
+    construye una vez por versión; los demás campos se recorren.
+    """
+    def buscar(campo, valor):
+        if campo == "nombre":
+            indice = repositorio.profesores(ruta)
+            if indice.profesores is registros:
+                return indice.posicion.get(valor)
+        return posicion(registros, campo, valor)
+    return buscar
+
+
+class AlmacenJSON:
+    """
+    Un archivo JSON por colección más su diario de cambios (ver logic/diario.py).
+    Agregar, reemplazar o eliminar un registro anexa una línea al diario; el
+    archivo completo solo se reescribe al compactar o al reemplazar la colección.
+    """
+
+    def __init__(self, max_diario=MAX_DIARIO, legible=False):
+        """
+        Args:
+            max_diario: Operaciones que se acumulan en el diario antes de
+                compactar (nunca menos que la cantidad de registros)
+            legible: Escribir los archivos con sangría en lugar de compactos
+        """
+        self.max_diario = max_diario
+        self.legible = legible
+        self.repositorio = Repositorio(self.leer)
+        self._estados = {}
+        self._huellas = {}
+
+    def existe(self, ruta):
+        return os.path.exists(ruta)
+
+    @staticmethod
+    def _firma(ruta):
+        try:
+            return firma(ruta)
+        except FileNotFoundError:
+            return None
+
+    def version(self, ruta):
+        """Firma de la versión actual: (archivo, diario), o None si no existe."""
+        base = self._firma(ruta)
+        if base is None:
+            return None
+        return base, self._firma(ruta_diario(ruta))
+
+    def _huella(self, ruta, firma_base):
+        """Huella del contenido del archivo con firma `firma_base`; se calcula una vez por firma."""
+        clave = os.path.abspath(ruta)
+        guardada = self._huellas.get(clave)
+        if guardada is None or guardada[0] != firma_base:
+            guardada = (firma_base, huella_archivo(ruta))
+            self._huellas[clave] = guardada
+        return guardada[1]
+
+    def _estado(self, ruta, bloqueado=False):
+        """
+        Retorna (versión, registros, operaciones en el diario) reproduciendo el
+        diario si cambió. Si el archivo se reemplazó por fuera y el diario tiene
+        cambios sobre el contenido anterior, se aplican sobre el nuevo y se
+        compacta; para eso se toma el bloqueo de escritura, salvo que quien
+        llama ya lo tenga (`bloqueado`).
+        """
+        version = self.version(ruta)
+        if version is None:
+            raise FileNotFoundError(f"No existe el archivo {ruta}")
+        clave = os.path.abspath(ruta)
+        guardado = self._estados.get(clave)
+        if guardado is not None and guardado[0] == version:
+            return guardado
+        registros = leer_instantanea(ruta)
+        try:
+            operaciones = leer_operaciones(ruta, self._huella(ruta, version[0])) if version[1] else []
+        except DiarioDesfasado as e:
+            if not bloqueado:
+                with bloqueo_escritura(ruta):
+                    return self._estado(ruta, bloqueado=True)
+            registros = list(registros)
+            for operacion in e.operaciones:
+                aplicar(registros, operacion)
+            self._escribir(ruta, registros)
+            return self._estados[clave]
+        if operaciones:
+            registros = list(registros)
+            for operacion in operaciones:
+                aplicar(registros, operacion)
+        estado = (version, registros, len(operaciones))
+        self._estados[clave] = estado
+        return estado
+
+    def leer(self, ruta):
+        """
+        Retorna los registros de la colección (compartidos, de solo lectura).
+
+        Raises:
+            FileNotFoundError, ErrorDecodificacion
+        """
+        return self._estado(ruta)[1]
+
+    def escribir(self, ruta, registros):
+        """Reemplaza la colección con una instantánea nueva, escrita de forma atómica, y descarta el diario."""
+        with bloqueo_escritura(ruta):
+            self._escribir(ruta, registros)
+
+    def _escribir(self, ruta, registros):
+        registros = list(registros)
+        contenido = volcar(registros, self.legible)
+        base = huella(contenido)
+        # Si hay una caída antes de eliminar el diario, la marca lo identifica como ya aplicado
+        marcar_compactado(ruta, base)
+        escribir_atomico(ruta, contenido)
+        eliminar_diario(ruta)
+        registrar(ruta, registros)
+        clave = os.path.abspath(ruta)
+        version = self.version(ruta)
+        self._huellas[clave] = (version[0], base)
+        self._estados[clave] = (version, registros, 0)
+
+    def compactar(self, ruta):
+        """Vuelca el estado vigente (instantánea + diario) en una instantánea nueva."""
+        with bloqueo_escritura(ruta):
+            self._escribir(ruta, self._estado(ruta, bloqueado=True)[1])
+
+    def aplicar_lote(self, ruta, operaciones):
+        """
+        Aplica varias operaciones del diario con una sola escritura (líneas
+        anexadas o, si el diario crece demasiado, una instantánea nueva).
+        Retorna cuántos registros tocó cada operación.
+
+        Raises:
+            ConflictoEdicion: si falla alguna precondición ("esperado", "unico")
+        """
+        with bloqueo_escritura(ruta):
+            # Bajo el bloqueo el estado se relee si otro proceso escribió
+            try:
+                version, registros, pendientes = self._estado(ruta, bloqueado=True)
+            except FileNotFoundError:
+                version, registros, pendientes = None, [], 0
+            buscar = _buscador(self.repositorio, ruta, registros)
+            operaciones = verificar_operaciones(registros, operaciones, buscar)
+            nuevos = list(registros)
+            tocados = []
+            for operacion in operaciones:
+                # Las posiciones del índice valen mientras el lote no haya cambiado la lista
+                tocados.append(aplicar(nuevos, operacion, None if any(tocados) else buscar))
+            efectivas = [op for op, n in zip(operaciones, tocados) if n]
+            if not efectivas:
+                return tocados
+            if version is None or pendientes + len(efectivas) > max(self.max_diario, len(nuevos)):
+                self._escribir(ruta, nuevos)
+            else:
+                # Sin operaciones vigentes el diario se reinicia sobre la base actual
+                anotar(ruta, self._huella(ruta, version[0]), efectivas, nuevo=pendientes == 0)
+                self._estados[os.path.abspath(ruta)] = (self.version(ruta), nuevos, pendientes + len(efectivas))
+            return tocados
+
+    def agregar(self, ruta, registro, unico=None):
+        """Agrega un registro; con `unico`, falla si ya hay otro con el mismo valor en ese campo."""
+        self.aplicar_lote(ruta, [operacion_agregar(registro, unico)])
+
+    def reemplazar(self, ruta, campo, valor, registro, esperado=None):
+        """
+        Reemplaza el primer registro con `campo == valor`. Retorna True si existía.
+        Con `esperado`, falla si la etiqueta del registro actual no coincide.
+        """
+        return self.aplicar_lote(ruta, [operacion_reemplazar(campo, valor, registro, esperado)])[0] > 0
+
+    def eliminar(self, ruta, campo, valor, esperado=None):
+        """Elimina todos los registros con `campo == valor`. Retorna cuántos eliminó."""
+        return self.aplicar_lote(ruta, [operacion_eliminar(campo, valor, esperado)])[0]
+
+    def buscar_codigo(self, ruta, codigo):
+        return self.repositorio.materias(ruta).buscar_codigo(codigo)
+
+    def buscar_nombre(self, ruta, nombre):
+        """Búsqueda sin distinguir mayúsculas."""
+        return self.repositorio.materias(ruta).buscar_nombre(nombre)
+
+    def de_semestre(self, ruta, semestre):
+        return self.repositorio.materias(ruta).de_semestre(semestre)
+
+
+class AlmacenSQLite:
+    """
+    Todas las colecciones en una tabla `registros` de SQLite.
+    Cada fila guarda el registro serializado y, aparte e indexados, su código,
+    nombre (exacto y en minúsculas) y semestre. Las lecturas completas se
+    guardan en memoria hasta que la versión de la colección cambia.
+    """
+
+    def __init__(self, ruta_db):
+        self.ruta_db = ruta_db
+        self._local = threading.local()
+        self._lecturas = {}
+        self.repositorio = Repositorio(self.leer)
+        with self._conexion() as con:
+            # En modo WAL los lectores no esperan a los escritores
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript("""
+                CREATE TABLE IF NOT EXISTS registros (
+                    id INTEGER PRIMARY KEY,
+                    coleccion TEXT NOT NULL,
+                    codigo TEXT,
+                    nombre TEXT,
+                    nombre_min TEXT,
+                    semestre INTEGER,
+                    datos TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_registros_codigo ON registros (coleccion, codigo);
+                CREATE INDEX IF NOT EXISTS idx_registros_nombre ON registros (coleccion, nombre);
+                CREATE INDEX IF NOT EXISTS idx_registros_nombre_min ON registros (coleccion, nombre_min);
+                CREATE INDEX IF NOT EXISTS idx_registros_semestre ON registros (coleccion, semestre);
+                CREATE TABLE IF NOT EXISTS colecciones (
+                    nombre TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                );
+            """)
+
+    def _conexion(self):
+        # sqlite3 no comparte conexiones entre hilos; Streamlit atiende cada sesión en uno
+        con = getattr(self._local, "conexion", None)
+        if con is None:
+            directorio = os.path.dirname(self.ruta_db)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            con = sqlite3.connect(self.ruta_db)
+            self._local.conexion = con
+        return con
+
+    @staticmethod
+    def _fila(coleccion, registro):
+        if isinstance(registro, dict):
+            nombre = registro.get("nombre")
+            return (
+                coleccion, registro.get("codigo"), nombre,
+                nombre.lower() if isinstance(nombre, str) else None,
+                registro.get("semestre"), volcar_texto(registro),
+            )
+        return (coleccion, None, None, None, None, volcar_texto(registro))
+
+    @staticmethod
+    def _nueva_version(con, ruta):
+        con.execute(
+            "INSERT INTO colecciones (nombre, version) VALUES (?, 1) "
+            "ON CONFLICT(nombre) DO UPDATE SET version = version + 1",
+            (ruta,),
+        )
+
+    def existe(self, ruta):
+        return self.version(ruta) is not None
+
+    def version(self, ruta):
+        fila = self._conexion().execute("SELECT version FROM colecciones WHERE nombre = ?", (ruta,)).fetchone()
+        return fila[0] if fila else None
+
+    def leer(self, ruta):
+        """
+        Retorna los registros de la colección (compartidos, de solo lectura).
+
+        Raises:
+            FileNotFoundError: si la colección nunca se escribió
+        """
+        version = self.version(ruta)
+        if version is None:
+            raise FileNotFoundError(f"La colección '{ruta}' no existe en {self.ruta_db}")
+        guardada = self._lecturas.get(ruta)
+        if guardada is not None and guardada[0] == version:
+            return guardada[1]
+        filas = self._conexion().execute(
+            "SELECT datos FROM registros WHERE coleccion = ? ORDER BY id", (ruta,)
+        ).fetchall()
+        registros = [cargar(datos) for datos, in filas]
+        self._lecturas[ruta] = (version, registros)
+        return registros
+
+    def escribir(self, ruta, registros):
+        """Reemplaza la colección completa en una sola transacción."""
+        with self._conexion() as con:
+            con.execute("DELETE FROM registros WHERE coleccion = ?", (ruta,))
+            con.executemany(
+                "INSERT INTO registros (coleccion, codigo, nombre, nombre_min, semestre, datos) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [self._fila(ruta, r) for r in registros],
+            )
+            self._nueva_version(con, ruta)
+
+    def _ejecutar(self, con, ruta, operacion):
+        tipo = operacion["op"]
+        if tipo == "agregar":
+            con.execute(
+                "INSERT INTO registros (coleccion, codigo, nombre, nombre_min, semestre, datos) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._fila(ruta, operacion["registro"]),
+            )
+            return 1
+        campo, valor = operacion["campo"], operacion["valor"]
+        if campo not in CAMPOS_CLAVE:
+            raise ValueError(f"Campo de búsqueda no indexado: {campo}")
+        if tipo == "reemplazar":
+            fila = con.execute(
+                f"SELECT id FROM registros WHERE coleccion = ? AND {campo} = ? ORDER BY id LIMIT 1", (ruta, valor)
+            ).fetchone()
+            if fila is None:
+                return 0
+            con.execute(
+                "UPDATE registros SET coleccion = ?, codigo = ?, nombre = ?, nombre_min = ?, semestre = ?, "
+                "datos = ? WHERE id = ?",
+                self._fila(ruta, operacion["registro"]) + (fila[0],),
+            )
+            return 1
+        if tipo == "eliminar":
+            return con.execute(f"DELETE FROM registros WHERE coleccion = ? AND {campo} = ?", (ruta, valor)).rowcount
+        raise ValueError(f"Operación desconocida: {tipo}")
+
+    def aplicar_lote(self, ruta, operaciones):
+        """
+        Aplica varias operaciones en una sola transacción. Retorna cuántas filas tocó cada una.
+
+        Raises:
+            ConflictoEdicion: si falla alguna precondición ("esperado", "unico")
+        """
+        with self._conexion() as con:
+            # Toma el bloqueo de escritura antes de verificar las precondiciones
+            con.execute("BEGIN IMMEDIATE")
+            if any("esperado" in o or "unico" in o for o in operaciones):
+                try:
+                    actuales = self.leer(ruta)
+                except FileNotFoundError:
+                    actuales = []
+                operaciones = verificar_operaciones(
+                    actuales, operaciones, _buscador(self.repositorio, ruta, actuales)
+                )
+            tocados = [self._ejecutar(con, ruta, operacion) for operacion in operaciones]
+            if any(tocados):
+                self._nueva_version(con, ruta)
+        return tocados
+
+    def agregar(self, ruta, registro, unico=None):
+        """Agrega un registro; con `unico`, falla si ya hay otro con el mismo valor en ese campo."""
+        self.aplicar_lote(ruta, [operacion_agregar(registro, unico)])
+
+    def reemplazar(self, ruta, campo, valor, registro, esperado=None):
+        """
+        Reemplaza el primer registro con `campo == valor`. Retorna True si existía.
+        Con `esperado`, falla si la etiqueta del registro actual no coincide.
+        """
+        return self.aplicar_lote(ruta, [operacion_reemplazar(campo, valor, registro, esperado)])[0] > 0
+
+    def eliminar(self, ruta, campo, valor, esperado=None):
+        """Elimina todos los registros con `campo == valor`. Retorna cuántos eliminó."""
+        return self.aplicar_lote(ruta, [operacion_eliminar(campo, valor, esperado)])[0]
+
+    def _uno(self, consulta, parametros):
+        fila = self._conexion().execute(consulta, parametros).fetchone()
+        return cargar(fila[0]) if fila else None
+
+    def buscar_codigo(self, ruta, codigo):
+        return self._uno(
+            "SELECT datos FROM registros WHERE coleccion = ? AND codigo = ? ORDER BY id LIMIT 1", (ruta, codigo)
+        )
+
+    def buscar_nombre(self, ruta, nombre):
+        """Búsqueda sin distinguir mayúsculas."""
+        return self._uno(
+            "SELECT datos FROM registros WHERE coleccion = ? AND nombre_min = ? ORDER BY id LIMIT 1",
+            (ruta, nombre.lower()),
+        )
+
+    def de_semestre(self, ruta, semestre):
+        filas = self._conexion().execute(
+            "SELECT datos FROM registros WHERE coleccion = ? AND semestre = ? ORDER BY id", (ruta, semestre)
+        ).fetchall()
+        return [cargar(datos) for datos, in filas]
+
+
+_almacen = None
+
+
+def crear_almacen(descripcion):
+    """Crea un almacén a partir de "json", "json:legible" o "sqlite:ruta.db"."""
+    tipo, _, ruta = descripcion.partition(":")
+    if tipo == "json" and ruta in ("", "legible"):
+        return AlmacenJSON(legible=ruta == "legible")
+    if tipo == "sqlite" and ruta:
+        return AlmacenSQLite(ruta)
+    raise ValueError(f"Almacén desconocido: {descripcion}")
+
+
+def obtener_almacen():
+    """Retorna el almacén activo del proceso (JSON si no se configuró otro)."""
+    global _almacen
+    if _almacen is None:
+        _almacen = crear_almacen(os.environ.get("HORARIOS_ALMACEN", "json"))
+    return _almacen
+
+
+def configurar_almacen(almacen):
+    """Reemplaza el almacén activo del proceso."""
+    global _almacen
+    _almacen = almacen
+
+
+def copiar_colecciones(origen, destino, colecciones=COLECCIONES):
+    """Copia las colecciones existentes de un almacén a otro. Retorna las copiadas."""
+    copiadas = []
+    for ruta in colecciones:
+        if origen.existe(ruta):
+            destino.escribir(ruta, origen.leer(ruta))
+            copiadas.append(ruta)
+    return copiadas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migración de datos entre JSON y SQLite")
+    parser.add_argument("accion", choices=("importar", "exportar"),
+                        help="importar: JSON -> SQLite; exportar: SQLite -> JSON")
+    parser.add_argument("--db", default="data/horarios.db", help="Ruta de la base SQLite")
+    parser.add_argument("--legible", action="store_true", help="Exportar los JSON con sangría")
+    args = parser.parse_args(argv)
+
+    json_, sqlite = AlmacenJSON(legible=args.legible), AlmacenSQLite(args.db)
+    origen, destino = (json_, sqlite) if args.accion == "importar" else (sqlite, json_)
+    for ruta in copiar_colecciones(origen, destino):
+        print(f"{args.accion}: {ruta} ({len(destino.leer(ruta))} registros)")
+
+
+if __name__ == "__main__":
+    main()
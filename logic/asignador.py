@@ -1,33 +1,750 @@
 """
 Algoritmo principal de asignación de horarios con backtracking.
+
+El problema se modela como un CSP: cada bloque semanal de una materia (una
+franja de la grilla, de dos horas en la grilla habitual) es una variable cuyo
+dominio son los horarios disponibles de su profesor. Dos bloques no pueden
+ocupar franjas que se superpongan si son del mismo profesor o de la misma
+cohorte (semestre y, si existe, paralelo), porque los estudiantes no podrían
+asistir a ambas clases. Una materia sin paralelo la cursa todo el semestre,
+así que choca también con cada sección de ese semestre. La búsqueda combina ordenamiento MRV
+(mínimo de valores restantes), forward checking y backjumping dirigido por
+conflictos (FC-CBJ), por lo que es completa: si existe una asignación válida
+la encuentra. Antes de buscar, una verificación de flujo máximo descarta en
+tiempo polinomial las instancias sin solución. Con un límite de tiempo funciona como algoritmo "anytime" y
+conserva la mejor asignación parcial encontrada hasta ese momento.
 """
+import os
+import time
+from dataclasses import dataclass, field
+
+from logic.factibilidad import verificar_factibilidad
+from logic.franjas import bits, contar, grilla, menor_bit, rango
+from logic.modelo import Asignacion, Slot, cargar_profesores, clave_cohorte, cohortes_ocupadas
+
+# Por debajo de este número de bloques no compensa arrancar procesos
+MIN_BLOQUES_PARALELO = 400
+# Segundos entre dos reportes de progreso consecutivos
+INTERVALO_PROGRESO = 0.2
+
+
+@dataclass
+class Estadisticas:
+    """
+    Instrumentación de una ejecución del asignador.
+
+    nodos: variables seleccionadas por la búsqueda
+    retrocesos: saltos atrás (backjumps) realizados
+    podas: valores descartados porque el forward checking vació un dominio vecino
+    tiempos: segundos por fase (carga, presolve, busqueda, postproceso); con
+        varios procesos es la suma de lo que cada componente consumió
+    picos: tamaños máximos de variables, recursos, profundidad de la pila y
+        conjunto conflicto en una componente
+    """
+    componentes: int = 0
+    nodos: int = 0
+    retrocesos: int = 0
+    podas: int = 0
+    tiempos: dict = field(default_factory=lambda: dict.fromkeys(("carga", "presolve", "busqueda", "postproceso"), 0.0))
+    picos: dict = field(default_factory=lambda: dict.fromkeys(("variables", "recursos", "profundidad", "conflicto"), 0))
+
+    def combinar(self, otra):
+        """Acumula las estadísticas de otra componente."""
+        self.componentes += otra.componentes
+        self.nodos += otra.nodos
+        self.retrocesos += otra.retrocesos
+        self.podas += otra.podas
+        for fase, segundos in otra.tiempos.items():
+            self.tiempos[fase] += segundos
+        for clave, valor in otra.picos.items():
+            self.picos[clave] = max(self.picos[clave], valor)
+
+
+@dataclass
+class ResultadoAsignacion:
+    """Resultado de una ejecución del asignador."""
+    asignaciones: list = field(default_factory=list)
+    errores: list = field(default_factory=list)
+    completo: bool = False
+    agotado: bool = False
+    bloques_pendientes: int = 0
+    estadisticas: Estadisticas = None
+
 
-def asignar_horarios(profesores, horarios):
+class _Variable:
     """
-    Asigna bloques de horario a las materias de los profesores según restricciones básicas.
-    Retorna (asignaciones, errores).
+    Un bloque de una materia. `profesor` es la posición del profesor en el
+    subproblema, `k` la posición del bloque dentro de la materia, `cadena` los
+    índices de todos los bloques de la materia, `dominio` la máscara de
+    franjas del profesor y `recursos` los recursos que ocupa.
     """
-    asignaciones = []
+    __slots__ = ("profesor", "materia", "k", "cadena", "dominio", "recursos")
+
+    def __init__(self, profesor, materia, k, cadena, dominio, recursos):
+        self.profesor = profesor
+        self.materia = materia
+        self.k = k
+        self.cadena = cadena
+        self.dominio = dominio
+        self.recursos = recursos
+
+
+def _construir_variables(profesores, indice):
+    """
+    Crea una variable por cada bloque requerido por las materias.
+    Retorna (variables, cohortes, errores). Los recursos 0..P-1 son los
+    profesores y P.. las cohortes listadas en `cohortes`; cada bloque ocupa
+    su profesor y las cohortes de cohortes_ocupadas.
+    """
+    variables = []
     errores = []
-    for prof in profesores:
-        usados = set()
-        for mat in prof["materias"]:
-            bloques_necesarios = (mat["duracion"] + 1) // 2
-            bloques_asignados = []
-            for h in prof["horarios_disponibles"]:
-                if h not in usados and h in horarios and len(bloques_asignados) < bloques_necesarios:
-                    bloques_asignados.append(h)
-                    usados.add(h)
-            if len(bloques_asignados) < bloques_necesarios:
-                errores.append(f"No hay suficientes bloques para {mat['nombre']} de {prof['nombre']}")
-            for b in bloques_asignados:
-                asignaciones.append({
-                    "profesor": prof["nombre"],
-                    "materia": mat["nombre"],
-                    "semestre": mat["semestre"],
-                    "duracion": mat["duracion"],
-                    "horario": b
-                })
+    ocupa = cohortes_ocupadas(mat.cohorte for prof in profesores for mat in prof.materias)
+    cohortes = {c: len(profesores) + r for r, c in enumerate(ocupa)}
+    for p, prof in enumerate(profesores):
+        disponibles = indice.mascara(prof.horarios_disponibles)
+        for mat in prof.materias:
+            bloques_necesarios = indice.bloques_para(mat.duracion)
+            if contar(disponibles) < bloques_necesarios:
+                errores.append(f"No hay suficientes bloques para {mat.nombre} de {prof.nombre}")
+                continue
+            recursos = (p, *(cohortes[c] for c in ocupa[mat.cohorte]))
+            cadena = tuple(range(len(variables), len(variables) + bloques_necesarios))
+            for k in range(bloques_necesarios):
+                variables.append(_Variable(p, mat, k, cadena, disponibles, recursos))
+    return variables, list(cohortes), errores
+
+
+class _Busqueda:
+    """
+    Motor FC-CBJ sobre las variables de bloque.
+
+    Restricciones:
+      - Un profesor no puede ocupar la misma franja dos veces.
+      - Una cohorte de estudiantes no puede tener dos clases en la misma franja.
+      - Los bloques de una misma materia son intercambiables; para no explorar
+        permutaciones equivalentes se exige que aparezcan en orden creciente
+        de franja.
+
+    Dominios, ocupaciones y valores probados son máscaras de bits sobre el
+    índice de franjas, por lo que calcular el dominio vigente de una variable
+    es una expresión AND de tiempo constante. Cada recurso (profesor o
+    cohorte) mantiene su máscara de ocupación y un índice franja -> variable
+    titular, de modo que verificar un choque no requiere recorrer las
+    asignaciones acumuladas. Si la grilla tiene franjas que se superponen,
+    `solapes` (máscara por franja, ver IndiceFranjas) amplía cada ocupación a
+    las franjas con las que choca.
+
+    Para reparaciones locales, `fijas` (variable -> bit) son asignaciones que
+    la búsqueda no puede modificar y `preferidas` (variable -> bit) indica el
+    valor que se prueba primero en cada variable libre.
+    """
+
+    def __init__(self, variables, n_franjas, n_recursos, fijas=None, preferidas=None, solapes=None):
+        self.variables = variables
+        self.n_franjas = n_franjas
+        self.solapes = solapes
+        self.n = len(variables)
+        self.valor = [-1] * self.n
+        self.posicion = [-1] * self.n
+        self.probados = [0] * self.n
+        self.conflictos = [set() for _ in range(self.n)]
+        # Máscara de franjas ocupadas y variable titular de cada franja, por recurso
+        self.ocupacion = [0] * n_recursos
+        self.titular = [[-1] * n_franjas for _ in range(n_recursos)]
+        self.fijas = set(fijas or ())
+        for v, i in (fijas or {}).items():
+            self._asignar(v, i, -1)
+        self.preferidas = preferidas or {}
+        self.libres = [v for v in range(self.n) if v not in self.fijas]
+        # Matriz de conflictos: variables libres que comparten algún recurso con v
+        por_recurso = {}
+        for v in self.libres:
+            for r in variables[v].recursos:
+                por_recurso.setdefault(r, []).append(v)
+        vecinos = {v: set() for v in self.libres}
+        for grupo in por_recurso.values():
+            for v in grupo:
+                vecinos[v].update(grupo)
+        self.vecinos = {v: sorted(vs - {v}) for v, vs in vecinos.items()}
+        self.fallo = None
+        self.mejor = list(self.valor)
+        self.profundidad_mejor = 0
+        self.nodos = 0
+        self.retrocesos = 0
+        self.podas = 0
+        self.pico_conflicto = 0
+
+    # ---------------- Dominios y conflictos ----------------
+    def _bloqueadas(self, ocupadas):
+        if self.solapes is None:
+            return ocupadas
+        bloqueadas = 0
+        for i in bits(ocupadas):
+            bloqueadas |= self.solapes[i]
+        return bloqueadas
+
+    def _limites(self, v):
+        """Retorna (inferior, culpable_inf, superior, culpable_sup) por orden entre hermanos."""
+        var = self.variables[v]
+        cadena, k = var.cadena, var.k
+        inferior, culpable_inf = -1, None
+        for j in range(k - 1, -1, -1):
+            w = cadena[j]
+            if self.valor[w] >= 0:
+                inferior, culpable_inf = self.valor[w], w
+                break
+        superior, culpable_sup = self.n_franjas, None
+        for j in range(k + 1, len(cadena)):
+            w = cadena[j]
+            if self.valor[w] >= 0:
+                superior, culpable_sup = self.valor[w], w
+                break
+        return inferior, culpable_inf, superior, culpable_sup
+
+    def dominio(self, v):
+        """Máscara de valores consistentes para v (sin contar los ya probados)."""
+        var = self.variables[v]
+        inferior, _, superior, _ = self._limites(v)
+        ocupadas = 0
+        for r in var.recursos:
+            ocupadas |= self.ocupacion[r]
+        return var.dominio & ~self._bloqueadas(ocupadas) & ~self.probados[v] & rango(inferior, superior)
+
+    def culpables(self, v):
+        """Variables asignadas responsables de los valores eliminados del dominio de v."""
+        var = self.variables[v]
+        inferior, culpable_inf, superior, culpable_sup = self._limites(v)
+        culpables = set(self.conflictos[v])
+        ocupadas = 0
+        for r in var.recursos:
+            choques = var.dominio & self._bloqueadas(self.ocupacion[r])
+            for i in bits(choques):
+                if self.solapes is None:
+                    culpables.add(self.titular[r][i])
+                else:
+                    for j in bits(self.solapes[i] & self.ocupacion[r]):
+                        culpables.add(self.titular[r][j])
+            ocupadas |= choques
+        fuera = var.dominio & ~ocupadas & ~rango(inferior, superior)
+        if fuera & ((1 << (inferior + 1)) - 1):
+            culpables.add(culpable_inf)
+        if fuera >> superior:
+            culpables.add(culpable_sup)
+        culpables.discard(v)
+        culpables -= self.fijas
+        return culpables
+
+    # ---------------- Asignación ----------------
+    def _asignar(self, v, i, profundidad):
+        self.valor[v] = i
+        self.posicion[v] = profundidad
+        for r in self.variables[v].recursos:
+            self.ocupacion[r] |= 1 << i
+            self.titular[r][i] = v
+
+    def _desasignar(self, v):
+        i = self.valor[v]
+        for r in self.variables[v].recursos:
+            self.ocupacion[r] &= ~(1 << i)
+            self.titular[r][i] = -1
+        self.valor[v] = -1
+        self.posicion[v] = -1
+
+    def _seleccionar(self):
+        """Heurística MRV; en empate prefiere la variable con más vecinos libres."""
+        mejor, clave_mejor = None, None
+        for v in self.libres:
+            if self.valor[v] >= 0:
+                continue
+            libres = sum(1 for w in self.vecinos[v] if self.valor[w] < 0)
+            clave = (contar(self.dominio(v)), -libres)
+            if clave_mejor is None or clave < clave_mejor:
+                mejor, clave_mejor = v, clave
+                if clave[0] == 0:
+                    break
+        return mejor
+
+    def _forward_check(self, v):
+        """Retorna la primera variable vecina sin valores posibles, o None."""
+        for w in self.vecinos[v]:
+            if self.valor[w] < 0 and not self.dominio(w):
+                return w
+        return None
+
+    def resolver(self, limite=None, progreso=None):
+        """
+        Ejecuta la búsqueda.
+
+        Args:
+            limite: Hora (time.time()) a la que se detiene la búsqueda, o None
+            progreso: Función opcional llamada como progreso(colocados, retrocesos)
+
+        Returns:
+            True si encontró una asignación completa, False si demostró que no
+            existe y None si se alcanzó el límite. En todos los casos `mejor`
+            contiene la asignación parcial con más bloques colocados.
+        """
+        pila = []
+        proximo_reporte = time.time() if progreso else None
+        v = self._seleccionar()
+        while v is not None:
+            self.nodos += 1
+            if limite is not None or progreso:
+                ahora = time.time()
+                if limite is not None and ahora >= limite:
+                    return None
+                if progreso and ahora >= proximo_reporte:
+                    progreso(len(pila), self.retrocesos)
+                    proximo_reporte = ahora + INTERVALO_PROGRESO
+            candidatos = self.dominio(v)
+            if candidatos:
+                i = self.preferidas.get(v, -1)
+                if i < 0 or not candidatos >> i & 1:
+                    i = menor_bit(candidatos)
+                self.probados[v] |= 1 << i
+                self._asignar(v, i, len(pila))
+                vacia = self._forward_check(v)
+                if vacia is not None:
+                    self.podas += 1
+                    self.conflictos[v] |= self.culpables(vacia) - {v}
+                    self._desasignar(v)
+                    continue
+                pila.append(v)
+                if len(pila) > self.profundidad_mejor:
+                    self.profundidad_mejor = len(pila)
+                    self.mejor = list(self.valor)
+                v = self._seleccionar()
+                continue
+
+            # Punto muerto: saltar a la variable más profunda del conjunto conflicto
+            conflicto = self.culpables(v)
+            if not conflicto:
+                self.fallo = v
+                return False
+            destino = max(conflicto, key=lambda w: self.posicion[w])
+            self.retrocesos += 1
+            if len(conflicto) > self.pico_conflicto:
+                self.pico_conflicto = len(conflicto)
+            while pila[-1] != destino:
+                u = pila.pop()
+                self._desasignar(u)
+                self.probados[u] = 0
+                self.conflictos[u].clear()
+            pila.pop()
+            self._desasignar(destino)
+            self.conflictos[destino] |= conflicto - {destino}
+            self.probados[v] = 0
+            self.conflictos[v].clear()
+            v = destino
+        self.mejor = list(self.valor)
+        if progreso:
+            progreso(len(pila), self.retrocesos)
+        return True
+
+
+def _mensaje_fallo(variables, profesores, v):
+    """Describe la materia que dejó sin salida a la búsqueda."""
+    var = variables[v]
+    return (
+        f"No hay suficientes bloques para {var.materia.nombre} de {profesores[var.profesor].nombre} "
+        f"sin cruces con otras materias del semestre {var.materia.semestre}"
+    )
+
+
+def _exportar(variables, valores, profesores, indice):
+    """
+    Convierte los valores de la búsqueda en objetos Asignacion.
+    Retorna una lista de asignaciones por profesor; los bloques sin valor se omiten.
+    """
+    slots = [Slot(i, franja) for i, franja in enumerate(indice.franjas)]
+    por_profesor = [[] for _ in profesores]
+    for v, var in enumerate(variables):
+        if valores[v] >= 0:
+            por_profesor[var.profesor].append(Asignacion(profesores[var.profesor], var.materia, slots[valores[v]]))
+    return por_profesor
+
+
+def _pendientes(variables, valores, profesores):
+    """Mensajes por cada materia con bloques sin asignar."""
+    faltantes = {}
+    for v, var in enumerate(variables):
+        if valores[v] < 0:
+            clave = (var.profesor, var.cadena[0])
+            faltantes[clave] = faltantes.get(clave, 0) + 1
+    return [
+        f"Sin asignar: {n} bloque(s) de {variables[v].materia.nombre} de {profesores[p].nombre}"
+        for (p, v), n in faltantes.items()
+    ]
+
+
+def _bloques_de_lista(profesores, indice):
+    """Cantidad total de bloques requeridos por una lista de profesores."""
+    return sum(indice.bloques_para(mat.duracion) for prof in profesores for mat in prof.materias)
+
+
+def componentes_independientes(profesores):
+    """
+    Agrupa a los profesores en componentes conexas del grafo de restricciones.
+    Dos profesores quedan en la misma componente si dictan materias de una
+    misma cohorte, o una materia sin paralelo y una sección de su semestre
+    (directa o transitivamente); componentes distintas no comparten ningún
+    recurso y se pueden resolver por separado.
+    Retorna una lista de listas de índices, ordenada por el menor índice.
+    """
+    profesores = cargar_profesores(profesores)
+    padre = list(range(len(profesores)))
+
+    def raiz(p):
+        while padre[p] != p:
+            padre[p] = padre[padre[p]]
+            p = padre[p]
+        return p
+
+    ocupa = cohortes_ocupadas(mat.cohorte for prof in profesores for mat in prof.materias if mat.duracion)
+    duenio = {}
+    for p, prof in enumerate(profesores):
+        for mat in prof.materias:
+            if mat.duracion == 0:
+                continue
+            for cohorte in ocupa[mat.cohorte]:
+                q = duenio.setdefault(cohorte, p)
+                a, b = raiz(p), raiz(q)
+                if a != b:
+                    padre[max(a, b)] = min(a, b)
+    grupos = {}
+    for p in range(len(profesores)):
+        grupos.setdefault(raiz(p), []).append(p)
+    return sorted(grupos.values())
+
+
+def _resolver_componente(profesores, horarios, limite=None, progreso=None):
+    """
+    Resuelve un subproblema independiente (lista de Profesor).
+    Retorna (por_profesor, errores, estado, pendientes, estadisticas) donde
+    estado es True (completo), False (sin solución) o None (límite de tiempo
+    alcanzado).
+    """
+    stats = Estadisticas(componentes=1)
+    t0 = time.perf_counter()
+    indice = grilla(horarios)
+    variables, cohortes, errores = _construir_variables(profesores, indice)
+    t1 = time.perf_counter()
+    if not errores:
+        errores = verificar_factibilidad(profesores, horarios)
+    t2 = time.perf_counter()
+    stats.tiempos["carga"] = t1 - t0
+    stats.tiempos["presolve"] = t2 - t1
+    if errores:
+        return [[] for _ in profesores], errores, False, _bloques_de_lista(profesores, indice), stats
+    busqueda = _Busqueda(variables, len(indice), len(profesores) + len(cohortes), solapes=_solapes(indice))
+    t3 = time.perf_counter()
+    estado = busqueda.resolver(limite, progreso)
+    t4 = time.perf_counter()
+    por_profesor = _exportar(variables, busqueda.mejor, profesores, indice)
+    pendientes = busqueda.mejor.count(-1)
+    if estado is False:
+        errores = [_mensaje_fallo(variables, profesores, busqueda.fallo)]
+    elif estado is None:
+        errores = _pendientes(variables, busqueda.mejor, profesores)
+    stats.tiempos["carga"] += t3 - t2
+    stats.tiempos["busqueda"] = t4 - t3
+    stats.tiempos["postproceso"] = time.perf_counter() - t4
+    stats.nodos, stats.retrocesos, stats.podas = busqueda.nodos, busqueda.retrocesos, busqueda.podas
+    stats.picos.update(
+        variables=len(variables),
+        recursos=len(profesores) + len(cohortes),
+        profundidad=busqueda.profundidad_mejor,
+        conflicto=busqueda.pico_conflicto,
+    )
+    return por_profesor, errores, estado, pendientes, stats
+
+
+def resolver_horarios(profesores, horarios, procesos=None, limite_tiempo=None, progreso=None,
+                      estadisticas=False):
+    """
+    Asigna bloques de horario a las materias de los profesores respetando su
+    disponibilidad y sin cruces entre materias de un mismo semestre.
+
+    El problema se divide en componentes independientes (profesores que no
+    comparten cohortes) que se resuelven por separado; si hay varias y el
+    problema es grande se reparten en un pool de procesos. `procesos` fija la
+    cantidad de procesos (1 desactiva el paralelismo; None usa todos los
+    núcleos). El resultado no depende del número de procesos.
+
+    Args:
+        profesores: Lista de profesores con sus materias y horarios disponibles
+        horarios: Grilla de franjas horarias
+        procesos: Cantidad máxima de procesos para resolver componentes
+        limite_tiempo: Segundos de búsqueda; al agotarse se retorna la mejor
+            asignación parcial encontrada
+        progreso: Función opcional que recibe un diccionario con `colocados`,
+            `total`, `retrocesos` y `transcurrido`
+        estadisticas: Si es True, el resultado incluye un objeto Estadisticas
+
+    Returns:
+        ResultadoAsignacion
+    """
+    inicio = time.time()
+    t0 = time.perf_counter()
+    limite = inicio + limite_tiempo if limite_tiempo is not None else None
+    try:
+        profesores = cargar_profesores(profesores)
+    except ValueError as e:
+        return ResultadoAsignacion(errores=[str(e)], estadisticas=Estadisticas() if estadisticas else None)
+    indice = grilla(horarios)
+    componentes = componentes_independientes(profesores)
+    subproblemas = [[profesores[p] for p in comp] for comp in componentes]
+    total = _bloques_de_lista(profesores, indice)
+    procesos = os.cpu_count() if procesos is None else procesos
+    procesos = min(procesos or 1, len(subproblemas))
+    t_carga = time.perf_counter() - t0
+    acumulado = {"colocados": 0, "retrocesos": 0}
+
+    def reportar(colocados, retrocesos):
+        if progreso:
+            progreso({
+                "colocados": acumulado["colocados"] + colocados,
+                "total": total,
+                "retrocesos": acumulado["retrocesos"] + retrocesos,
+                "transcurrido": time.time() - inicio,
+            })
+
+    if procesos > 1 and total >= MIN_BLOQUES_PARALELO:
+        # Importado aquí: multiprocessing solo se carga si se usa
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        resultados = [None] * len(subproblemas)
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = {
+                ejecutor.submit(_resolver_componente, sub, horarios, limite): c
+                for c, sub in enumerate(subproblemas)
+            }
+            for futuro in as_completed(futuros):
+                c = futuros[futuro]
+                resultados[c] = futuro.result()
+                acumulado["colocados"] += _bloques_de_lista(subproblemas[c], indice) - resultados[c][3]
+                acumulado["retrocesos"] += resultados[c][4].retrocesos
+                reportar(0, 0)
+    else:
+        resultados = []
+        for sub in subproblemas:
+            resultado = _resolver_componente(sub, horarios, limite, reportar if progreso else None)
+            resultados.append(resultado)
+            acumulado["colocados"] += _bloques_de_lista(sub, indice) - resultado[3]
+            acumulado["retrocesos"] += resultado[4].retrocesos
+    t1 = time.perf_counter()
+
+    # Reconstruir el orden original de los profesores
+    por_profesor = [None] * len(profesores)
+    resultado = ResultadoAsignacion(completo=True)
+    stats = Estadisticas()
+    for comp, (asignaciones, errores, estado, pendientes, stats_comp) in zip(componentes, resultados):
+        stats.combinar(stats_comp)
+        resultado.errores.extend(errores)
+        resultado.completo = resultado.completo and estado is True
+        resultado.agotado = resultado.agotado or estado is None
+        resultado.bloques_pendientes += pendientes
+        for p, bloques in zip(comp, asignaciones):
+            por_profesor[p] = bloques
+    resultado.asignaciones = [a.como_dict() for bloques in por_profesor for a in bloques]
+    if resultado.agotado:
+        resultado.errores.insert(
+            0, f"Tiempo agotado tras {limite_tiempo} s: se conserva la mejor asignación parcial encontrada"
+        )
+    if estadisticas:
+        stats.tiempos["carga"] += t_carga
+        stats.tiempos["postproceso"] += time.perf_counter() - t1
+        stats.tiempos["total"] = time.perf_counter() - t0
+        resultado.estadisticas = stats
+    return resultado
+
+
+def asignar_horarios(profesores, horarios, procesos=None, limite_tiempo=None, estadisticas=False):
+    """
+    Asigna bloques de horario a las materias de los profesores respetando su
+    disponibilidad y sin cruces entre materias de un mismo semestre.
+    Ver resolver_horarios para el detalle de los parámetros.
+    Retorna (asignaciones, errores); asignaciones es None si no se obtuvo una
+    asignación completa. Con estadisticas=True retorna
+    (asignaciones, errores, estadisticas).
+    """
+    resultado = resolver_horarios(profesores, horarios, procesos, limite_tiempo, estadisticas=estadisticas)
+    asignaciones = resultado.asignaciones if resultado.completo else None
+    errores = [] if resultado.completo else resultado.errores
+    if estadisticas:
+        return asignaciones, errores, resultado.estadisticas
+    return asignaciones, errores
+
+
+def _solapes(indice):
+    """Tabla de solapamientos para la búsqueda, o None si la grilla es disjunta."""
+    return None if indice.disjunta else indice.solapes
+
+
+def _solucion_previa(variables, profesores, indice, anteriores):
+    """
+    Relaciona la solución previa con las variables actuales.
+    Retorna (preferidas, validos): el bit sugerido para cada variable y el
+    conjunto de profesores cuya asignación previa sigue siendo aplicable tal
+    cual (mismas materias, misma cohorte y franjas aún disponibles).
+    """
+    previas = {}
+    for a in anteriores or []:
+        i = indice.bit(a["horario"])
+        clave = (a["profesor"], a["materia"])
+        previas.setdefault(clave, []).append((i, clave_cohorte(a)))
+    preferidas = {}
+    validos = set(range(len(profesores)))
+    vistas = set()
+    for v, var in enumerate(variables):
+        if var.k:
+            continue
+        p = var.profesor
+        mat = var.materia
+        clave = (profesores[p].nombre, mat.nombre)
+        bloques = sorted(previas.get(clave, []), key=lambda b: -1 if b[0] is None else b[0])
+        cadena = var.cadena
+        if clave in vistas or len(bloques) != len(cadena):
+            validos.discard(p)
+        vistas.add(clave)
+        for w, (i, cohorte) in zip(cadena, bloques):
+            if i is None or not var.dominio >> i & 1 or cohorte != mat.cohorte:
+                validos.discard(p)
+                continue
+            preferidas[w] = i
+    return preferidas, validos
+
+
+def reasignar_horarios(profesores, horarios, anteriores, cambios=None, limite_tiempo=None, progreso=None,
+                       estadisticas=False):
+    """
+    Repara una asignación previa después de editar profesores o materias.
+
+    Solo se liberan los bloques de los profesores afectados: los nombrados en
+    `cambios` ({"profesores": [...], "materias": [...]}), los que dictan una
+    materia modificada y aquellos cuya asignación previa ya no aplica
+    (profesores nuevos, disponibilidad o materias distintas). Los profesores
+    eliminados simplemente desaparecen. El resto conserva sus franjas y la
+    búsqueda parte de la solución previa. Si la reparación local no tiene
+    solución se liberan también los profesores que comparten semestre con los
+    afectados y, como último recurso, se resuelve todo el problema.
+
+    `limite_tiempo`, `progreso` y `estadisticas` funcionan como en
+    resolver_horarios: el límite cubre todas las rondas de reparación y, si se
+    agota, se retorna la mejor asignación parcial encontrada.
+
+    Returns:
+        ResultadoAsignacion
+    """
+    inicio = time.time()
+    t0 = time.perf_counter()
+    limite = inicio + limite_tiempo if limite_tiempo is not None else None
+    stats = Estadisticas(componentes=1)
+
+    def terminar(resultado):
+        if estadisticas:
+            stats.tiempos["total"] = time.perf_counter() - t0
+            resultado.estadisticas = stats
+        return resultado
+
+    try:
+        profesores = cargar_profesores(profesores)
+    except ValueError as e:
+        return terminar(ResultadoAsignacion(errores=[str(e)]))
+    indice = grilla(horarios)
+    variables, cohortes, errores = _construir_variables(profesores, indice)
+    t1 = time.perf_counter()
+    stats.tiempos["carga"] = t1 - t0
+    if not errores:
+        errores = verificar_factibilidad(profesores, horarios)
+    stats.tiempos["presolve"] = time.perf_counter() - t1
     if errores:
-        return None, errores
-    return asignaciones, [] 
\ No newline at end of file
+        return terminar(ResultadoAsignacion(errores=errores, bloques_pendientes=_bloques_de_lista(profesores, indice)))
+    t1 = time.perf_counter()
+    preferidas, validos = _solucion_previa(variables, profesores, indice, anteriores)
+    cambios = cambios or {}
+    editados = set(cambios.get("profesores", []))
+    materias = set(cambios.get("materias", []))
+    afectados = {
+        p for p, prof in enumerate(profesores)
+        if p not in validos or prof.nombre in editados
+        or any(m.nombre in materias for m in prof.materias)
+    }
+
+    # Las franjas conservadas deben seguir siendo compatibles entre sí
+    ocupadas = {}
+    por_profesor = {}
+    for v, var in enumerate(variables):
+        por_profesor.setdefault(var.profesor, []).append(v)
+    for p, vs in por_profesor.items():
+        if p in afectados:
+            continue
+        propias = {}
+        for v in vs:
+            for r in variables[v].recursos:
+                propias[r] = propias.get(r, 0) | 1 << preferidas[v]
+        if any(indice.bloqueadas(ocupadas.get(r, 0)) & m for r, m in propias.items()):
+            afectados.add(p)
+        else:
+            for r, m in propias.items():
+                ocupadas[r] = ocupadas.get(r, 0) | m
+
+    cohortes_afectadas = {r for p in afectados for v in por_profesor.get(p, []) for r in variables[v].recursos[1:]}
+    vecindad = afectados | {
+        var.profesor for var in variables if not cohortes_afectadas.isdisjoint(var.recursos[1:])
+    }
+    rondas = [afectados, vecindad, set(range(len(profesores)))]
+    n_recursos = len(profesores) + len(cohortes)
+    stats.tiempos["carga"] += time.perf_counter() - t1
+    stats.picos.update(variables=len(variables), recursos=n_recursos)
+    acumulado = {"fijas": 0, "retrocesos": 0}
+
+    def reportar(colocados, retrocesos):
+        progreso({
+            "colocados": acumulado["fijas"] + colocados,
+            "total": len(variables),
+            "retrocesos": acumulado["retrocesos"] + retrocesos,
+            "transcurrido": time.time() - inicio,
+        })
+
+    busqueda = None
+    mejor = None
+    estado = False
+    for i, libres in enumerate(rondas):
+        if i and libres == rondas[i - 1]:
+            continue
+        t2 = time.perf_counter()
+        fijas = {v: preferidas[v] for v, var in enumerate(variables) if var.profesor not in libres}
+        busqueda = _Busqueda(variables, len(indice), n_recursos, fijas, preferidas, _solapes(indice))
+        acumulado["fijas"] = len(fijas)
+        t3 = time.perf_counter()
+        estado = busqueda.resolver(limite, reportar if progreso else None)
+        stats.tiempos["carga"] += t3 - t2
+        stats.tiempos["busqueda"] += time.perf_counter() - t3
+        stats.nodos += busqueda.nodos
+        stats.retrocesos += busqueda.retrocesos
+        stats.podas += busqueda.podas
+        stats.picos["profundidad"] = max(stats.picos["profundidad"], len(fijas) + busqueda.profundidad_mejor)
+        stats.picos["conflicto"] = max(stats.picos["conflicto"], busqueda.pico_conflicto)
+        acumulado["retrocesos"] += busqueda.retrocesos
+        if mejor is None or busqueda.mejor.count(-1) < mejor.count(-1):
+            mejor = busqueda.mejor
+        if estado is not False:
+            break
+
+    t4 = time.perf_counter()
+    por_profesor = _exportar(variables, mejor, profesores, indice)
+    resultado = ResultadoAsignacion(
+        asignaciones=[a.como_dict() for bloques in por_profesor for a in bloques],
+        completo=estado is True,
+        agotado=estado is None,
+        bloques_pendientes=mejor.count(-1),
+    )
+    if estado is None:
+        resultado.errores = [
+            f"Tiempo agotado tras {limite_tiempo} s: se conserva la mejor asignación parcial encontrada"
+        ] + _pendientes(variables, mejor, profesores)
+    elif estado is False:
+        resultado.errores = [_mensaje_fallo(variables, profesores, busqueda.fallo)]
+    stats.tiempos["postproceso"] = time.perf_counter() - t4
+    return terminar(resultado)
@@ -0,0 +1,131 @@
+"""
+Caché de resultados direccionada por contenido.
+La clave de cada resultado es el hash SHA-256 de la serialización canónica de
+sus entradas (profesores, grilla y opciones del asignador), así que un cambio en
+los datos produce otra clave y la entrada vieja simplemente deja de usarse.
+Tiene dos niveles: uno en memoria con política LRU y otro en disco con un
+tamaño máximo, del que se descartan primero los archivos menos usados.
+
+La instancia de la aplicación se comparte entre las sesiones de Streamlit,
+que corren en hilos distintos: el nivel en memoria se protege con un candado.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Forma parte de cada clave: al cambiar el asignador, el optimizador o
+# ResultadoAsignacion se incrementa y los resultados viejos del disco dejan de usarse
+VERSION = 1
+
+
+def clave_contenido(*partes, **opciones):
+    """
+    Calcula la clave de un conjunto de entradas.
+
+    La serialización ordena las claves de los diccionarios, de modo que dos
+    entradas iguales producen la misma clave sin importar el orden en que se
+    construyeron. El orden de las listas sí cuenta. Incluye VERSION.
+    """
+    canonico = json.dumps(
+        {"version": VERSION, "partes": partes, "opciones": opciones},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+
+class CacheResultados:
+    """Caché de dos niveles (memoria LRU y disco acotado por tamaño)."""
+
+    def __init__(self, directorio=None, max_memoria=32, max_bytes_disco=64 * 1024 * 1024):
+        """
+        Inicializa la caché.
+
+        Args:
+            directorio: Carpeta del nivel en disco, o None para usar solo memoria
+            max_memoria: Cantidad máxima de resultados en memoria
+            max_bytes_disco: Tamaño máximo total de los archivos en disco
+        """
+        self.directorio = directorio
+        self.max_memoria = max_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._candado = threading.Lock()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.pkl")
+
+    def obtener(self, clave):
+        """Retorna una copia del resultado guardado con la clave, o None si no existe."""
+        with self._candado:
+            datos = self._memoria.get(clave)
+            if datos is not None:
+                self._memoria.move_to_end(clave)
+        if datos is not None:
+            return pickle.loads(datos)
+        if not self.directorio:
+            return None
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as f:
+                datos = f.read()
+            valor = pickle.loads(datos)
+            # La fecha de modificación registra el último uso para el descarte
+            os.utime(ruta)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        self._recordar(clave, datos)
+        return valor
+
+    def guardar(self, clave, valor):
+        """Guarda un resultado en ambos niveles."""
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        self._recordar(clave, datos)
+        if not self.directorio:
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(datos)
+            os.replace(temporal, self._ruta(clave))
+        except OSError:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            return
+        self._recortar_disco()
+
+    def limpiar(self):
+        """Elimina todos los resultados de memoria y disco."""
+        with self._candado:
+            self._memoria.clear()
+        if self.directorio and os.path.isdir(self.directorio):
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith(".pkl"):
+                    os.remove(os.path.join(self.directorio, nombre))
+
+    def _recordar(self, clave, datos):
+        with self._candado:
+            self._memoria[clave] = datos
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    def _recortar_disco(self):
+        archivos = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(".pkl"):
+                info = entrada.stat()
+                archivos.append((info.st_mtime, info.st_size, entrada.path))
+        total = sum(tamano for _, tamano, _ in archivos)
+        for _, tamano, ruta in sorted(archivos):
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                continue
+            total -= tamano
@@ -0,0 +1,179 @@
+"""
+Generación de horarios sin interfaz, para ejecuciones programadas (cron) y
+pruebas de escenarios desde la línea de comandos.
+
+Uso:
+    python -m logic.cli [--profesores data/profesores.json] [--horarios data/horarios.json]
+                        [--materias resources/materias.json]
+                        [--limite 30] [--procesos N] [--semilla 0] [--sin-optimizar]
+                        [--formato json|csv] [--salida horario.json]
+
+Sin --profesores/--horarios se usan las colecciones de la aplicación a
+través del almacén activo (HORARIOS_ALMACEN), así que los cambios pendientes
+en el diario o una base SQLite se respetan. Las rutas indicadas de forma
+explícita se leen siempre como archivos JSON.
+
+En formato JSON la salida incluye asignaciones, errores y la carga por
+profesor; en CSV se escriben las asignaciones en --salida y la carga en
+"<salida>_carga.csv".
+
+Códigos de salida:
+    0  asignación completa
+    1  no existe una asignación completa
+    2  argumentos inválidos
+    3  datos de entrada inválidos o ilegibles
+    4  tiempo agotado: se escribió la mejor asignación parcial
+"""
+import argparse
+import csv
+import os
+import sys
+
+from logic.almacenamiento import obtener_almacen
+from logic.asignador import resolver_horarios
+from logic.codificacion import ErrorDecodificacion, leer_archivo, volcar
+from logic.franjas import grilla
+from logic.optimizador import optimizar_horarios
+from logic.utils import RUTA_HORARIOS, RUTA_PROFESORES
+from logic.validaciones import validar_horarios, validar_profesores
+
+SALIDA_COMPLETA = 0
+SALIDA_INFACTIBLE = 1
+SALIDA_DATOS_INVALIDOS = 3
+SALIDA_PARCIAL = 4
+
+CAMPOS_ASIGNACION = ["profesor", "materia", "semestre", "paralelo", "duracion", "horario"]
+CAMPOS_CARGA = ["profesor", "bloques", "horas"]
+
+
+def carga_por_profesor(asignaciones, profesores, horarios):
+    """
+    Bloques y horas asignados a cada profesor, en el orden de `profesores`
+    (incluye a los que no recibieron bloques). Las horas salen de la
+    duración real de cada franja de la grilla.
+    """
+    horas_de = grilla(horarios).horas
+    carga = {p["nombre"]: {"profesor": p["nombre"], "bloques": 0, "horas": 0} for p in profesores}
+    for a in asignaciones:
+        fila = carga.setdefault(a["profesor"], {"profesor": a["profesor"], "bloques": 0, "horas": 0})
+        fila["bloques"] += 1
+        fila["horas"] += horas_de(a["horario"])
+    return list(carga.values())
+
+
+def _leer(ruta, descripcion, coleccion=None):
+    """Lee un archivo JSON indicado por el usuario o, si no hay ruta, la colección del almacén."""
+    try:
+        if ruta is None:
+            ruta = coleccion
+            return obtener_almacen().leer(coleccion)
+        return leer_archivo(ruta)
+    except FileNotFoundError:
+        raise ValueError(f"No se encontró el archivo de {descripcion}: {ruta}")
+    except ErrorDecodificacion as e:
+        raise ValueError(f"El archivo de {descripcion} no es JSON válido ({ruta}): {e}")
+
+
+def _validar(profesores, horarios, catalogo):
+    """Errores de los datos de entrada, como mensajes listos para mostrar."""
+    errores = [f"Franja #{fila}: {mensaje}" for fila, mensaje in validar_horarios(horarios)]
+    for fila, mensaje in validar_profesores(profesores, horarios):
+        nombre = profesores[fila - 1].get("nombre") if isinstance(profesores[fila - 1], dict) else None
+        errores.append(f"{nombre or f'Profesor #{fila}'}: {mensaje}")
+    if catalogo is not None and not errores:
+        nombres = {m.get("nombre") for m in catalogo if isinstance(m, dict)}
+        for profesor in profesores:
+            for materia in profesor["materias"]:
+                if materia["nombre"] not in nombres:
+                    errores.append(f"{profesor['nombre']}: la materia '{materia['nombre']}' no está en el catálogo")
+    return errores
+
+
+def _escribir_csv(ruta, campos, filas):
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.DictWriter(f, fieldnames=campos, restval="", extrasaction="ignore")
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def _ruta_carga(salida):
+    base, extension = os.path.splitext(salida)
+    return f"{base}_carga{extension or '.csv'}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera horarios sin la interfaz de Streamlit")
+    parser.add_argument("--profesores", default=None,
+                        help=f"Archivo JSON de profesores (por defecto la colección {RUTA_PROFESORES})")
+    parser.add_argument("--horarios", default=None,
+                        help=f"Archivo JSON con la grilla (por defecto la colección {RUTA_HORARIOS})")
+    parser.add_argument("--materias", default=None,
+                        help="Catálogo de materias; si se indica, cada materia dictada debe existir en él")
+    parser.add_argument("--limite", type=float, default=30, help="Segundos máximos de búsqueda")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos para resolver (por defecto, todos los núcleos)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la optimización (resultado reproducible)")
+    parser.add_argument("--sin-optimizar", action="store_true", help="No mejorar la calidad del horario")
+    parser.add_argument("--limite-optimizacion", type=float, default=5, help="Segundos máximos de optimización")
+    parser.add_argument("--formato", choices=("json", "csv"), default="json")
+    parser.add_argument("--salida", default="-", help="Archivo de salida ('-' para la salida estándar, solo JSON)")
+    args = parser.parse_args(argv)
+    if args.formato == "csv" and args.salida == "-":
+        parser.error("el formato csv requiere --salida")
+
+    try:
+        profesores = _leer(args.profesores, "profesores", RUTA_PROFESORES)
+        horarios = _leer(args.horarios, "horarios", RUTA_HORARIOS)
+        catalogo = _leer(args.materias, "materias") if args.materias else None
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return SALIDA_DATOS_INVALIDOS
+    errores = _validar(profesores, horarios, catalogo)
+    if errores:
+        print("Datos de entrada inválidos:", file=sys.stderr)
+        for mensaje in errores:
+            print(f"- {mensaje}", file=sys.stderr)
+        return SALIDA_DATOS_INVALIDOS
+
+    resultado = resolver_horarios(profesores, horarios, args.procesos, args.limite, estadisticas=True)
+    optimizacion = None
+    if resultado.completo and not args.sin_optimizar:
+        resultado.asignaciones, optimizacion = optimizar_horarios(
+            resultado.asignaciones, profesores, horarios,
+            limite_tiempo=args.limite_optimizacion, semilla=args.semilla,
+        )
+    carga = carga_por_profesor(resultado.asignaciones, profesores, horarios)
+
+    if args.formato == "csv":
+        _escribir_csv(args.salida, CAMPOS_ASIGNACION, resultado.asignaciones)
+        _escribir_csv(_ruta_carga(args.salida), CAMPOS_CARGA, carga)
+    else:
+        informe = {
+            "completo": resultado.completo,
+            "agotado": resultado.agotado,
+            "bloques_pendientes": resultado.bloques_pendientes,
+            "errores": resultado.errores,
+            "asignaciones": resultado.asignaciones,
+            "carga": carga,
+            "optimizacion": optimizacion,
+            "tiempos": resultado.estadisticas.tiempos,
+        }
+        datos = volcar(informe, legible=True) + b"\n"
+        if args.salida == "-":
+            sys.stdout.buffer.write(datos)
+            sys.stdout.flush()
+        else:
+            with open(args.salida, "wb") as f:
+                f.write(datos)
+
+    if resultado.completo:
+        print(f"Horario completo: {len(resultado.asignaciones)} bloques asignados", file=sys.stderr)
+        return SALIDA_COMPLETA
+    for mensaje in resultado.errores:
+        print(f"- {mensaje}", file=sys.stderr)
+    if resultado.agotado:
+        return SALIDA_PARCIAL
+    return SALIDA_INFACTIBLE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
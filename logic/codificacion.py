@@ -0,0 +1,63 @@
+"""
+Codificación JSON de los datos de la aplicación.
+Toda lectura y escritura de JSON de las colecciones (archivos, diarios, filas
+de SQLite) pasa por este módulo, así que el códec se elige en un solo lugar:
+orjson si está instalado (`pip install orjson`) y la biblioteca estándar si no.
+
+Ambos producen el mismo JSON: UTF-8 sin escapar acentos y, por defecto,
+compacto (sin sangría), que es el formato de almacenamiento. `legible=True`
+escribe con sangría de dos espacios, para exportar o revisar los archivos.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Los errores de decodificación de ambos códecs (y los de UTF-8) son ValueError
+ErrorDecodificacion = ValueError
+
+if orjson is not None:
+    CODEC = "orjson"
+
+    def cargar(datos):
+        """Analiza JSON desde bytes o str."""
+        return orjson.loads(datos)
+
+    def volcar(datos, legible=False):
+        """Serializa a bytes UTF-8, compacto o con sangría de dos espacios."""
+        opciones = orjson.OPT_NON_STR_KEYS
+        if legible:
+            opciones |= orjson.OPT_INDENT_2
+        return orjson.dumps(datos, option=opciones)
+else:
+    CODEC = "json"
+
+    def cargar(datos):
+        """Analiza JSON desde bytes o str."""
+        return json.loads(datos)
+
+    def volcar(datos, legible=False):
+        """Serializa a bytes UTF-8, compacto o con sangría de dos espacios."""
+        if legible:
+            texto = json.dumps(datos, ensure_ascii=False, indent=2)
+        else:
+            texto = json.dumps(datos, ensure_ascii=False, separators=(",", ":"))
+        return texto.encode("utf-8")
+
+
+def volcar_texto(datos, legible=False):
+    """Como volcar, pero retorna str (por ejemplo para columnas TEXT de SQLite)."""
+    return volcar(datos, legible).decode("utf-8")
+
+
+def leer_archivo(ruta):
+    """
+    Lee y analiza un archivo JSON.
+
+    Raises:
+        FileNotFoundError, ErrorDecodificacion
+    """
+    with open(ruta, 'rb') as f:
+        return cargar(f.read())
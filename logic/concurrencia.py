@@ -0,0 +1,93 @@
+"""
+Control de concurrencia para ediciones de varios usuarios.
+Cada registro tiene una etiqueta (ETag): el hash de su contenido. Quien edita
+envía la etiqueta del registro que vio; si al escribir el registro ya no
+coincide, otro usuario lo cambió y la escritura se rechaza con
+ConflictoEdicion en lugar de pisar su cambio.
+
+Los escritores se serializan con un bloqueo consultivo (fcntl.flock) sobre un
+archivo ".lock" junto a los datos; los lectores nunca lo toman, porque el
+diario se anexa por líneas y las instantáneas se reemplazan de forma atómica.
+"""
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from logic.diario import posicion
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo queda la exclusión entre hilos del proceso
+    fcntl = None
+
+_candados = {}
+_candado_global = threading.Lock()
+
+
+class ConflictoEdicion(Exception):
+    """El registro cambió (o ya existe) desde que el usuario lo leyó."""
+
+
+def etiqueta(registro):
+    """Etiqueta del contenido de un registro; no depende del orden de sus claves."""
+    canonico = json.dumps(registro, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()[:16]
+
+
+def _candado_hilos(ruta):
+    with _candado_global:
+        return _candados.setdefault(ruta, threading.Lock())
+
+
+@contextmanager
+def bloqueo_escritura(ruta):
+    """Exclusión mutua entre escritores de la misma ruta, en este y en otros procesos."""
+    with _candado_hilos(ruta):
+        if fcntl is None:
+            yield
+            return
+        with open(ruta + ".lock", "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def verificar_operaciones(registros, operaciones, buscar=None):
+    """
+    Comprueba las precondiciones de las operaciones contra el estado vigente y
+    retorna las operaciones sin ellas (listas para aplicar y anotar).
+
+    - "esperado": etiqueta que debe tener el registro a reemplazar o eliminar
+    - "unico": campo cuyo valor no debe existir ya al agregar
+
+    `buscar(campo, valor)` retorna la posición del primer registro con ese
+    valor, o None; por defecto recorre `registros`.
+
+    Raises:
+        ConflictoEdicion
+    """
+    if buscar is None:
+        buscar = partial(posicion, registros)
+    limpias = []
+    for operacion in operaciones:
+        esperado = operacion.get("esperado")
+        unico = operacion.get("unico")
+        if esperado is not None:
+            campo, valor = operacion["campo"], operacion["valor"]
+            i = buscar(campo, valor)
+            if i is None:
+                raise ConflictoEdicion(f"El registro '{valor}' fue eliminado por otro usuario")
+            if etiqueta(registros[i]) != esperado:
+                raise ConflictoEdicion(f"El registro '{valor}' fue modificado por otro usuario")
+        if unico is not None:
+            valor = operacion["registro"].get(unico)
+            if buscar(unico, valor) is not None:
+                raise ConflictoEdicion(f"Ya existe un registro con {unico} '{valor}'")
+        if esperado is not None or unico is not None:
+            operacion = {k: v for k, v in operacion.items() if k not in ("esperado", "unico")}
+        limpias.append(operacion)
+    return limpias
@@ -0,0 +1,222 @@
+"""
+Diario de cambios de solo anexado para las colecciones JSON.
+Junto a cada archivo (por ejemplo "data/profesores.json") vive un diario
+("data/profesores.json.diario") con una operación por línea. El estado vigente
+es la última instantánea del archivo más las operaciones del diario, así que
+un cambio de un registro escribe una línea en lugar del archivo completo.
+
+La primera línea del diario guarda la huella (SHA-256 del contenido) del
+archivo sobre el que se aplica, así que tocar el archivo sin cambiarlo (un
+checkout, un respaldo, `touch`) no invalida el diario. Antes de reemplazar el
+archivo, la compactación anota la huella de la nueva instantánea; un diario
+que sobreviva a una caída entre el renombrado y su eliminación termina con esa
+marca y se reconoce como ya aplicado. Si el archivo cambió por fuera y el
+diario tiene cambios sin esa marca, leer_operaciones lanza DiarioDesfasado con
+ellos, para que el almacén los aplique sobre el contenido nuevo.
+"""
+import hashlib
+import os
+import stat
+import tempfile
+
+from logic.codificacion import ErrorDecodificacion, cargar, volcar
+
+SUFIJO = ".diario"
+
+
+def ruta_diario(ruta):
+    return ruta + SUFIJO
+
+
+def _leer_umask():
+    # os.umask solo se puede consultar cambiándola: se hace una vez, al importar,
+    # y no en cada escritura, donde otros hilos podrían crear archivos entretanto
+    mascara = os.umask(0)
+    os.umask(mascara)
+    return mascara
+
+
+_UMASK = _leer_umask()
+
+
+def _permisos(ruta):
+    """Permisos del archivo existente o, si es nuevo, los de un open() normal (0o666 menos umask)."""
+    try:
+        return stat.S_IMODE(os.stat(ruta).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+class DiarioDesfasado(Exception):
+    """El archivo cambió por fuera del almacén y el diario tiene cambios pendientes sobre la versión anterior."""
+
+    def __init__(self, ruta, operaciones):
+        super().__init__(f"{ruta} cambió fuera de la aplicación con {len(operaciones)} cambios sin compactar")
+        self.operaciones = operaciones
+
+
+def huella(contenido):
+    """Huella del contenido (bytes) de una instantánea."""
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def huella_archivo(ruta):
+    with open(ruta, 'rb') as f:
+        return huella(f.read())
+
+
+def escribir_atomico(ruta, datos, legible=False):
+    """
+    Escribe el JSON (compacto, o con sangría si `legible`) en un temporal del
+    mismo directorio y lo renombra sobre la ruta. El archivo conserva sus
+    permisos (mkstemp crea el temporal solo para el dueño). `datos` también
+    puede ser el contenido ya serializado (bytes).
+    """
+    contenido = datos if isinstance(datos, bytes) else volcar(datos, legible)
+    directorio = os.path.dirname(ruta) or "."
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(contenido)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporal, _permisos(ruta))
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def leer_operaciones(ruta, base):
+    """
+    Retorna las operaciones del diario que aplican sobre el archivo con huella
+    `base`. Un diario inexistente, vacío o ya compactado en esa instantánea no
+    aporta operaciones; una última línea truncada por una caída a mitad de
+    escritura se descarta.
+
+    Raises:
+        DiarioDesfasado: si el diario se escribió sobre otro contenido y sus
+            cambios no están en `base`
+    """
+    try:
+        with open(ruta_diario(ruta), 'rb') as f:
+            lineas = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    if not lineas:
+        return []
+    try:
+        cabecera = cargar(lineas[0])
+    except ErrorDecodificacion:
+        # La cabecera se escribe junto con las primeras operaciones: no hay ninguna completa
+        return []
+    operaciones = []
+    compactado = None
+    for linea in lineas[1:]:
+        try:
+            operacion = cargar(linea)
+        except ErrorDecodificacion:
+            break
+        if "compactado" in operacion:
+            compactado = operacion["compactado"]
+        else:
+            operaciones.append(operacion)
+            compactado = None
+    if cabecera.get("base") == base:
+        return operaciones
+    if compactado == base or not operaciones:
+        return []
+    raise DiarioDesfasado(ruta, operaciones)
+
+
+def _con_condiciones(operacion, **condiciones):
+    # Precondiciones de concurrencia (ver logic/concurrencia.py); no se anotan
+    operacion.update({k: v for k, v in condiciones.items() if v is not None})
+    return operacion
+
+
+def operacion_agregar(registro, unico=None):
+    return _con_condiciones({"op": "agregar", "registro": registro}, unico=unico)
+
+
+def operacion_reemplazar(campo, valor, registro, esperado=None):
+    return _con_condiciones({"op": "reemplazar", "campo": campo, "valor": valor, "registro": registro},
+                            esperado=esperado)
+
+
+def operacion_eliminar(campo, valor, esperado=None):
+    return _con_condiciones({"op": "eliminar", "campo": campo, "valor": valor}, esperado=esperado)
+
+
+def _anexar(ruta, lineas, nuevo=False):
+    with open(ruta_diario(ruta), 'wb' if nuevo else 'ab') as f:
+        f.write(b"\n".join(lineas) + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def anotar(ruta, base, operaciones, nuevo):
+    """
+    Agrega operaciones al diario en una sola escritura. Varias operaciones se
+    guardan como un lote de una línea, de modo que una caída las descarta
+    todas o ninguna. Si `nuevo` es True el diario se reinicia con la cabecera
+    de la huella `base` (no había diario vigente para esa base).
+    """
+    if len(operaciones) > 1:
+        operaciones = [{"op": "lote", "operaciones": list(operaciones)}]
+    lineas = [volcar(operacion) for operacion in operaciones]
+    if nuevo:
+        lineas.insert(0, volcar({"base": base}))
+    _anexar(ruta, lineas, nuevo)
+
+
+def marcar_compactado(ruta, nueva_base):
+    """
+    Anota que el estado del diario queda en la instantánea con huella
+    `nueva_base`; se llama antes de reemplazar el archivo (ver leer_operaciones).
+    """
+    if os.path.exists(ruta_diario(ruta)):
+        _anexar(ruta, [volcar({"compactado": nueva_base})])
+
+
+def posicion(registros, campo, valor):
+    """Posición del primer registro con `campo == valor`, o None (búsqueda lineal)."""
+    return next((i for i, r in enumerate(registros) if r.get(campo) == valor), None)
+
+
+def aplicar(registros, operacion, buscar=None):
+    """
+    Aplica una operación sobre la lista (la modifica). Retorna cuántos registros tocó.
+
+    `buscar(campo, valor)` puede reemplazar a la búsqueda lineal de `posicion`
+    (por ejemplo con un índice); debe corresponder al estado actual de la lista.
+    """
+    tipo = operacion["op"]
+    if tipo == "lote":
+        return sum(aplicar(registros, o) for o in operacion["operaciones"])
+    if tipo == "agregar":
+        registros.append(operacion["registro"])
+        return 1
+    campo, valor = operacion["campo"], operacion["valor"]
+    i = buscar(campo, valor) if buscar else posicion(registros, campo, valor)
+    if tipo == "reemplazar":
+        if i is None:
+            return 0
+        registros[i] = operacion["registro"]
+        return 1
+    if tipo == "eliminar":
+        if i is None:
+            return 0
+        antes = len(registros)
+        registros[:] = [r for r in registros if r.get(campo) != valor]
+        return antes - len(registros)
+    raise ValueError(f"Operación desconocida en el diario: {tipo}")
+
+
+def eliminar_diario(ruta):
+    try:
+        os.remove(ruta_diario(ruta))
+    except FileNotFoundError:
+        pass
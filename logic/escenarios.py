@@ -0,0 +1,240 @@
+"""
+Comparación de escenarios hipotéticos ("¿y si...?") sobre un conjunto base.
+
+Un escenario es un nombre más una lista de cambios declarativos que se
+aplican sobre una copia de los profesores y la grilla base, con el mismo
+formato de operación que el diario ({"op": ..., ...}):
+
+    {"op": "quitar_horarios", "profesor": "Ana", "horarios": ["Lunes 7-9"]}
+    {"op": "agregar_horarios", "profesor": "Ana", "horarios": ["Sábado 8-10"]}
+    {"op": "agregar_materia", "profesor": "Ana",
+     "materia": {"nombre": "PROGRAMACIÓN I", "semestre": 1, "duracion": 4, "paralelo": "B"}}
+    {"op": "quitar_materia", "profesor": "Ana", "materia": "PROGRAMACIÓN I"}
+    {"op": "agregar_profesor", "profesor": {"nombre": ..., "horarios_disponibles": [...], "materias": [...]}}
+    {"op": "quitar_profesor", "profesor": "Ana"}
+    {"op": "agregar_franjas", "horarios": ["Sábado 8-10"]}
+    {"op": "quitar_franjas", "horarios": ["Viernes 13-15"]}
+
+Los escenarios se resuelven en un pool de procesos. Los datos base se envían
+una sola vez a cada proceso (inicializador del pool) y cada tarea recibe solo
+sus cambios. El inicializador valida los profesores base, los convierte en
+objetos Profesor y analiza la grilla una sola vez; cada escenario aplica sus
+cambios sobre esos objetos y solo vuelve a validar los profesores que cambió.
+"""
+import os
+from dataclasses import replace
+
+from logic.asignador import resolver_horarios
+from logic.franjas import grilla
+from logic.modelo import Materia, Profesor, cargar_profesores
+from logic.optimizador import evaluar_horario, optimizar_horarios
+from logic.validaciones import validar_materia_dictada, validar_profesor, validar_profesores
+
+NOMBRE_BASE = "Base"
+
+# Datos base de cada proceso del pool (ver _iniciar)
+_base = None
+
+
+def _nombre(profesor):
+    if isinstance(profesor, Profesor):
+        return profesor.nombre
+    return profesor.get("nombre") if isinstance(profesor, dict) else None
+
+
+def _buscar(profesores, nombre):
+    for i, profesor in enumerate(profesores):
+        if _nombre(profesor) == nombre:
+            return i
+    raise ValueError(f"No existe el profesor '{nombre}'")
+
+
+def _exigir_validos(registro, errores):
+    # Los datos nuevos de un cambio se validan al aplicarlo, antes de convertirlos
+    if errores:
+        raise ValueError(f"{_nombre(registro) or 'Registro'}: {'; '.join(errores)}")
+
+
+def aplicar_cambios(profesores, horarios, cambios):
+    """
+    Aplica los cambios de un escenario sobre profesores ya convertidos
+    (modelo.cargar_profesores). Los datos base no se modifican: cada profesor
+    que un cambio toca se reemplaza por una copia y el resto se comparte.
+
+    Returns:
+        Tupla (profesores, horarios) del escenario
+
+    Raises:
+        ValueError: si un cambio es desconocido, se refiere a un profesor
+            inexistente, agrega un profesor repetido o trae datos inválidos
+    """
+    profesores, horarios = list(profesores), list(horarios)
+    for cambio in cambios:
+        tipo = cambio.get("op")
+        if tipo == "quitar_horarios":
+            i = _buscar(profesores, cambio["profesor"])
+            quitar = set(cambio["horarios"])
+            actuales = profesores[i].horarios_disponibles
+            profesores[i] = replace(profesores[i], horarios_disponibles=tuple(h for h in actuales if h not in quitar))
+        elif tipo == "agregar_horarios":
+            i = _buscar(profesores, cambio["profesor"])
+            actuales = profesores[i].horarios_disponibles
+            nuevos = tuple(h for h in dict.fromkeys(cambio["horarios"]) if h not in actuales)
+            profesores[i] = replace(profesores[i], horarios_disponibles=actuales + nuevos)
+        elif tipo == "agregar_materia":
+            i = _buscar(profesores, cambio["profesor"])
+            _exigir_validos(cambio["materia"], validar_materia_dictada(cambio["materia"]))
+            materia = Materia.desde_dict(cambio["materia"])
+            profesores[i] = replace(profesores[i], materias=profesores[i].materias + (materia,))
+        elif tipo == "quitar_materia":
+            i = _buscar(profesores, cambio["profesor"])
+            materias = profesores[i].materias
+            profesores[i] = replace(profesores[i], materias=tuple(m for m in materias if m.nombre != cambio["materia"]))
+        elif tipo == "agregar_profesor":
+            datos = cambio["profesor"]
+            _exigir_validos(datos, validar_profesor(datos))
+            if any(p.nombre == datos["nombre"] for p in profesores):
+                raise ValueError(f"Ya existe el profesor '{datos['nombre']}'")
+            profesores.append(Profesor.desde_dict(datos, len(profesores)))
+        elif tipo == "quitar_profesor":
+            del profesores[_buscar(profesores, cambio["profesor"])]
+        elif tipo == "agregar_franjas":
+            horarios += [h for h in cambio["horarios"] if h not in horarios]
+        elif tipo == "quitar_franjas":
+            quitar = set(cambio["horarios"])
+            horarios = [h for h in horarios if h not in quitar]
+            # Nadie puede seguir disponible en una franja que ya no existe
+            for i, profesor in enumerate(profesores):
+                if not quitar.isdisjoint(profesor.horarios_disponibles):
+                    profesores[i] = replace(profesor, horarios_disponibles=tuple(
+                        h for h in profesor.horarios_disponibles if h not in quitar
+                    ))
+        else:
+            raise ValueError(f"Cambio desconocido: {tipo}")
+    return profesores, horarios
+
+
+def _validar_cambiados(profesores, horarios, base):
+    """
+    Valida solo los profesores que el escenario reemplazó o agregó (los que no
+    son objetos de la base, ya validada). Retorna (fila, mensaje) como
+    validar_profesores.
+    """
+    originales = {id(p) for p in base}
+    cambiados = [(fila, p) for fila, p in enumerate(profesores, start=1) if id(p) not in originales]
+    errores = validar_profesores([p.como_dict() for _, p in cambiados], horarios)
+    return [(cambiados[k - 1][0], mensaje) for k, mensaje in errores]
+
+
+def _iniciar(profesores, horarios, opciones):
+    """
+    Inicializador de cada proceso: valida los profesores base, los convierte
+    en objetos Profesor y analiza la grilla, una sola vez por proceso.
+    """
+    global _base
+    errores = validar_profesores(profesores, horarios)
+    if errores:
+        # Sin una base válida ningún escenario se resuelve: todos reportan sus errores
+        errores = [f"{_nombre(profesores[f - 1]) or f'Profesor #{f}'}: {m}" for f, m in errores]
+        _base = (None, horarios, opciones, errores)
+    else:
+        _base = (cargar_profesores(profesores), horarios, opciones, [])
+    grilla(horarios)
+
+
+def _evaluar(escenario):
+    """Resuelve un escenario sobre los datos base del proceso. Retorna su fila de comparación."""
+    base, horarios, opciones, errores_base = _base
+    fila = {
+        "escenario": escenario.get("nombre", ""),
+        "factible": False,
+        "agotado": False,
+        "bloques_pendientes": None,
+        "bloques_asignados": 0,
+        "costo": None,
+        "huecos": None,
+        "dispersion": None,
+        "temprano": None,
+        "errores": [],
+    }
+    if errores_base:
+        fila["errores"] = list(errores_base)
+        return fila
+    try:
+        profesores, horarios = aplicar_cambios(base, horarios, escenario.get("cambios", ()))
+    except (KeyError, TypeError, ValueError) as e:
+        fila["errores"] = [f"Cambio inválido: {e}"]
+        return fila
+    errores = _validar_cambiados(profesores, horarios, base)
+    if errores:
+        fila["errores"] = [f"{_nombre(profesores[f - 1]) or f'Profesor #{f}'}: {m}" for f, m in errores]
+        return fila
+    # Tras quitar profesores, el id vuelve a ser la posición (modelo.cargar_profesores)
+    profesores = [p if p.id == i else replace(p, id=i) for i, p in enumerate(profesores)]
+
+    resultado = resolver_horarios(profesores, horarios, procesos=1, limite_tiempo=opciones["limite_tiempo"])
+    fila.update(
+        factible=resultado.completo,
+        agotado=resultado.agotado,
+        bloques_pendientes=resultado.bloques_pendientes,
+        bloques_asignados=len(resultado.asignaciones),
+        errores=resultado.errores,
+    )
+    if resultado.completo:
+        asignaciones = resultado.asignaciones
+        if opciones["optimizar"]:
+            asignaciones, _ = optimizar_horarios(
+                asignaciones, profesores, horarios, opciones["objetivo"],
+                limite_tiempo=opciones["limite_optimizacion"], semilla=opciones["semilla"],
+            )
+        calidad = evaluar_horario(asignaciones, profesores, horarios, opciones["objetivo"])
+        fila.update((clave, calidad[clave]) for clave in ("costo", "huecos", "dispersion", "temprano"))
+    return fila
+
+
+def comparar_escenarios(profesores, horarios, escenarios, procesos=None, limite_tiempo=None,
+                        optimizar=True, limite_optimizacion=5, semilla=0, objetivo=None, incluir_base=True):
+    """
+    Resuelve cada escenario y arma una tabla comparativa.
+
+    Args:
+        profesores: Profesores base (diccionarios). Si no son válidos, todos
+            los escenarios reportan sus errores sin resolverse
+        horarios: Grilla base
+        escenarios: Lista de {"nombre": str, "cambios": [cambio, ...]}
+        procesos: Procesos del pool (1 resuelve en este proceso; None usa todos los núcleos)
+        limite_tiempo: Segundos de búsqueda por escenario
+        optimizar: Mejorar cada horario factible antes de medir su calidad,
+            como al calcular desde la aplicación
+        limite_optimizacion: Segundos máximos de optimización por escenario
+        semilla: Semilla de la optimización (comparación reproducible)
+        objetivo: Pesos de la calidad (optimizador.Objetivo por defecto)
+        incluir_base: Agregar primero el escenario sin cambios, como referencia
+
+    Returns:
+        Una fila por escenario, en orden, con factible, agotado,
+        bloques_pendientes, bloques_asignados, costo (menor es mejor),
+        huecos, dispersion, temprano y errores
+    """
+    escenarios = list(escenarios)
+    if incluir_base:
+        escenarios.insert(0, {"nombre": NOMBRE_BASE, "cambios": []})
+    opciones = {
+        "limite_tiempo": limite_tiempo,
+        "optimizar": optimizar,
+        "limite_optimizacion": limite_optimizacion,
+        "semilla": semilla,
+        "objetivo": objetivo,
+    }
+    procesos = os.cpu_count() if procesos is None else procesos
+    procesos = min(procesos or 1, len(escenarios))
+    if procesos <= 1:
+        _iniciar(profesores, horarios, opciones)
+        return [_evaluar(escenario) for escenario in escenarios]
+
+    # Importado aquí: multiprocessing solo se carga si se usa
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar,
+                             initargs=(profesores, horarios, opciones)) as ejecutor:
+        return list(ejecutor.map(_evaluar, escenarios))
@@ -0,0 +1,190 @@
+"""
+Verificación rápida de factibilidad previa a la búsqueda.
+Modela la demanda de bloques de cada materia contra las franjas disponibles de
+profesores y cohortes como una red de flujo y calcula su flujo máximo (Dinic).
+Si el flujo no cubre la demanda, el problema no tiene solución y se reporta qué
+profesor o semestre está sobresuscrito, en tiempo polinomial y sin buscar.
+"""
+from collections import deque
+
+from logic.franjas import bits, contar, grilla
+from logic.modelo import cargar_profesores
+
+
+class _RedFlujo:
+    """Red de flujo con listas de adyacencia para el algoritmo de Dinic."""
+
+    def __init__(self):
+        self.destino = []
+        self.capacidad = []
+        self.adyacencia = []
+
+    def nodo(self):
+        self.adyacencia.append([])
+        return len(self.adyacencia) - 1
+
+    def arista(self, u, v, capacidad):
+        self.adyacencia[u].append(len(self.destino))
+        self.destino.append(v)
+        self.capacidad.append(capacidad)
+        self.adyacencia[v].append(len(self.destino))
+        self.destino.append(u)
+        self.capacidad.append(0)
+
+    def _niveles(self, fuente, sumidero):
+        nivel = [-1] * len(self.adyacencia)
+        nivel[fuente] = 0
+        cola = deque([fuente])
+        while cola:
+            u = cola.popleft()
+            for e in self.adyacencia[u]:
+                v = self.destino[e]
+                if self.capacidad[e] and nivel[v] < 0:
+                    nivel[v] = nivel[u] + 1
+                    cola.append(v)
+        return nivel if nivel[sumidero] >= 0 else None
+
+    def _empujar(self, u, sumidero, flujo, nivel, siguiente):
+        if u == sumidero:
+            return flujo
+        adyacentes = self.adyacencia[u]
+        while siguiente[u] < len(adyacentes):
+            e = adyacentes[siguiente[u]]
+            v = self.destino[e]
+            if self.capacidad[e] and nivel[v] == nivel[u] + 1:
+                empujado = self._empujar(v, sumidero, min(flujo, self.capacidad[e]), nivel, siguiente)
+                if empujado:
+                    self.capacidad[e] -= empujado
+                    self.capacidad[e ^ 1] += empujado
+                    return empujado
+            siguiente[u] += 1
+        return 0
+
+    def flujo_maximo(self, fuente, sumidero):
+        total = 0
+        while True:
+            nivel = self._niveles(fuente, sumidero)
+            if nivel is None:
+                return total
+            siguiente = [0] * len(self.adyacencia)
+            while True:
+                empujado = self._empujar(fuente, sumidero, float("inf"), nivel, siguiente)
+                if not empujado:
+                    break
+                total += empujado
+
+    def alcanzables(self, fuente):
+        """Nodos alcanzables desde la fuente en la red residual (lado S del corte mínimo)."""
+        vistos = {fuente}
+        cola = deque([fuente])
+        while cola:
+            u = cola.popleft()
+            for e in self.adyacencia[u]:
+                v = self.destino[e]
+                if self.capacidad[e] and v not in vistos:
+                    vistos.add(v)
+                    cola.append(v)
+        return vistos
+
+
+def _nombre_cohorte(cohorte):
+    semestre, paralelo = cohorte
+    return f"semestre {semestre}" if paralelo is None else f"semestre {semestre} (paralelo {paralelo})"
+
+
+def verificar_factibilidad(profesores, horarios):
+    """
+    Verifica condiciones necesarias para que exista una asignación.
+
+    Cada unidad de flujo es un bloque: fuente -> materia (capacidad igual a sus
+    bloques) -> franja del profesor (capacidad 1) -> franja de la cohorte
+    (capacidad 1) -> sumidero. Toda asignación válida induce un flujo que
+    satura la demanda, por lo que un flujo máximo menor demuestra que no hay
+    solución. La condición es necesaria pero no suficiente (tampoco modela
+    el choque entre franjas distintas que se superponen).
+
+    Args:
+        profesores: Lista de profesores (diccionarios u objetos Profesor)
+        horarios: Grilla de franjas horarias
+
+    Returns:
+        Lista de errores; vacía si la instancia pasa la verificación
+    """
+    try:
+        profesores = cargar_profesores(profesores)
+    except ValueError as e:
+        return [str(e)]
+    indice = grilla(horarios)
+    materias = []
+    demanda_profesor = {}
+    demanda_cohorte = {}
+    cobertura_cohorte = {}
+    for p, prof in enumerate(profesores):
+        disponibles = indice.mascara(prof.horarios_disponibles)
+        for mat in prof.materias:
+            bloques = indice.bloques_para(mat.duracion)
+            if not bloques:
+                continue
+            cohorte = mat.cohorte
+            materias.append((p, cohorte, bloques, disponibles))
+            demanda_profesor[p] = demanda_profesor.get(p, 0) + bloques
+            demanda_cohorte[cohorte] = demanda_cohorte.get(cohorte, 0) + bloques
+            cobertura_cohorte[cohorte] = cobertura_cohorte.get(cohorte, 0) | disponibles
+
+    # Cotas directas: dan el diagnóstico más claro
+    errores = []
+    for p, demanda in demanda_profesor.items():
+        capacidad = contar(indice.mascara(profesores[p].horarios_disponibles))
+        if demanda > capacidad:
+            errores.append(
+                f"El profesor {profesores[p].nombre} requiere {demanda} bloques "
+                f"pero solo tiene {capacidad} franjas disponibles"
+            )
+    for cohorte, demanda in demanda_cohorte.items():
+        capacidad = contar(cobertura_cohorte[cohorte])
+        if demanda > capacidad:
+            errores.append(
+                f"El {_nombre_cohorte(cohorte)} requiere {demanda} bloques pero sus "
+                f"profesores solo cubren {capacidad} franjas"
+            )
+    if errores:
+        return errores
+
+    red = _RedFlujo()
+    fuente, sumidero = red.nodo(), red.nodo()
+    nodo_materia = []
+    franja_profesor = {}
+    franja_cohorte = {}
+    for p, cohorte, bloques, disponibles in materias:
+        m = red.nodo()
+        nodo_materia.append(m)
+        red.arista(fuente, m, bloques)
+        for i in bits(disponibles):
+            if (p, i) not in franja_profesor:
+                entrada, salida = red.nodo(), red.nodo()
+                red.arista(entrada, salida, 1)
+                franja_profesor[(p, i)] = (entrada, salida, set())
+            entrada, salida, enlazadas = franja_profesor[(p, i)]
+            red.arista(m, entrada, 1)
+            if (cohorte, i) not in franja_cohorte:
+                nodo = red.nodo()
+                red.arista(nodo, sumidero, 1)
+                franja_cohorte[(cohorte, i)] = nodo
+            if cohorte not in enlazadas:
+                enlazadas.add(cohorte)
+                red.arista(salida, franja_cohorte[(cohorte, i)], 1)
+
+    demanda = sum(bloques for _, _, bloques, _ in materias)
+    flujo = red.flujo_maximo(fuente, sumidero)
+    if flujo >= demanda:
+        return []
+
+    # Las materias del lado de la fuente en el corte mínimo forman el conjunto sobresuscrito
+    lado_fuente = red.alcanzables(fuente)
+    implicadas = [materias[k] for k, m in enumerate(nodo_materia) if m in lado_fuente]
+    nombres_prof = sorted({profesores[p].nombre for p, _, _, _ in implicadas})
+    nombres_cohorte = [_nombre_cohorte(c) for c in sorted({c for _, c, _, _ in implicadas}, key=str)]
+    return [
+        f"Sobredemanda en {', '.join(nombres_cohorte)}: las materias de {', '.join(nombres_prof)} "
+        f"necesitan al menos {demanda - flujo} franja(s) más de las disponibles sin cruces"
+    ]
@@ -0,0 +1,186 @@
+"""
+Grilla horaria y representación de franjas como máscaras de bits.
+Cada franja de la grilla semanal (por ejemplo "Lunes 7-9", "Sábado 8:30-10" o
+"Jueves 18-21") se interna a un índice de bit y se analiza una sola vez en
+(día, inicio, fin), en minutos. Disponibilidades y ocupaciones son enteros,
+de modo que las consultas de choque y de franjas libres son operaciones
+AND/popcount; los solapamientos y contigüidades entre franjas de duración
+arbitraria quedan precalculados como máscaras por franja.
+"""
+from collections import Counter
+from functools import lru_cache
+
+# Duración de bloque supuesta cuando la grilla no tiene franjas con horario
+MINUTOS_BLOQUE = 120
+
+
+class IndiceFranjas:
+    """
+    Interna las franjas de una grilla a posiciones de bit, respetando su orden.
+
+    Para cada franja i:
+      dia[i], inicio[i], fin[i]: día y minutos desde medianoche (None si la
+          franja no tiene el formato "Día H[:MM]-H[:MM]"; se trata como opaca)
+      solapes[i]: máscara de las franjas que se superponen con i (incluida i)
+      contiguas[i]: máscara de las franjas del mismo día que empiezan cuando i
+          termina o terminan cuando i empieza
+    `disjunta` indica que ninguna franja se superpone con otra, el caso de la
+    grilla habitual; entonces ocupar una franja solo bloquea esa franja.
+    """
+
+    def __init__(self, franjas):
+        """
+        Inicializa el índice.
+
+        Args:
+            franjas: Lista de franjas en el orden de la grilla (duplicados se ignoran)
+        """
+        self.franjas = list(dict.fromkeys(franjas))
+        self.indice = {f: i for i, f in enumerate(self.franjas)}
+        self.completa = (1 << len(self.franjas)) - 1
+        self.dia, self.inicio, self.fin = [], [], []
+        for franja in self.franjas:
+            partes = _analizar(franja)
+            dia, inicio, fin = partes if partes else (None, None, None)
+            self.dia.append(dia)
+            self.inicio.append(inicio)
+            self.fin.append(fin)
+        self.dias = list(dict.fromkeys(d for d in self.dia if d is not None))
+
+        self.solapes = [1 << i for i in range(len(self.franjas))]
+        self.contiguas = [0] * len(self.franjas)
+        por_dia = {}
+        for i, dia in enumerate(self.dia):
+            if dia is not None:
+                por_dia.setdefault(dia, []).append(i)
+        for del_dia in por_dia.values():
+            for a in del_dia:
+                for b in del_dia:
+                    if a == b:
+                        continue
+                    if self.inicio[a] < self.fin[b] and self.inicio[b] < self.fin[a]:
+                        self.solapes[a] |= 1 << b
+                    elif self.fin[a] == self.inicio[b] or self.fin[b] == self.inicio[a]:
+                        self.contiguas[a] |= 1 << b
+        self.disjunta = all(m == 1 << i for i, m in enumerate(self.solapes))
+
+        duraciones = Counter(f - i for i, f in zip(self.inicio, self.fin) if i is not None)
+        self.minutos_bloque = duraciones.most_common(1)[0][0] if duraciones else MINUTOS_BLOQUE
+
+    def __len__(self):
+        return len(self.franjas)
+
+    def __contains__(self, franja):
+        return franja in self.indice
+
+    def bit(self, franja):
+        """Retorna el índice de bit de una franja o None si no pertenece a la grilla."""
+        return self.indice.get(franja)
+
+    def mascara(self, franjas):
+        """Convierte un iterable de franjas en máscara; las desconocidas se ignoran."""
+        mascara = 0
+        for f in franjas:
+            i = self.indice.get(f)
+            if i is not None:
+                mascara |= 1 << i
+        return mascara
+
+    def franjas_de(self, mascara):
+        """Retorna las franjas de una máscara en el orden de la grilla."""
+        return [self.franjas[i] for i in bits(mascara)]
+
+    def bloqueadas(self, ocupadas):
+        """Máscara de franjas que chocan con alguna de las ocupadas."""
+        if self.disjunta:
+            return ocupadas
+        bloqueadas = 0
+        for i in bits(ocupadas):
+            bloqueadas |= self.solapes[i]
+        return bloqueadas
+
+    def horas(self, franja):
+        """Duración en horas de una franja; las opacas o ajenas cuentan como un bloque."""
+        i = self.indice.get(franja)
+        if i is None or self.inicio[i] is None:
+            partes = _analizar(franja)
+            minutos = partes[2] - partes[1] if partes else self.minutos_bloque
+        else:
+            minutos = self.fin[i] - self.inicio[i]
+        return minutos / 60
+
+    def bloques_para(self, horas):
+        """Bloques de la grilla necesarios para cubrir `horas` semanales."""
+        return -(-horas * 60 // self.minutos_bloque)
+
+
+@lru_cache(maxsize=32)
+def _grilla(franjas):
+    return IndiceFranjas(franjas)
+
+
+def grilla(franjas):
+    """
+    Índice de una grilla, analizado una sola vez por proceso: llamadas con las
+    mismas franjas retornan el mismo objeto, que se trata como de solo lectura.
+    """
+    return _grilla(tuple(franjas))
+
+
+def contar(mascara):
+    """Cantidad de franjas en la máscara."""
+    return mascara.bit_count()
+
+
+def menor_bit(mascara):
+    """Índice del bit menos significativo encendido (la máscara no debe ser 0)."""
+    return (mascara & -mascara).bit_length() - 1
+
+
+def bits(mascara):
+    """Itera los índices de bit encendidos en orden creciente."""
+    while mascara:
+        menor = mascara & -mascara
+        yield menor.bit_length() - 1
+        mascara ^= menor
+
+
+def rango(inferior, superior):
+    """Máscara de los bits estrictamente entre inferior y superior."""
+    if superior <= inferior + 1:
+        return 0
+    return ((1 << superior) - 1) & ~((1 << (inferior + 1)) - 1)
+
+
+def _minutos(hora):
+    horas, _, minutos = hora.partition(":")
+    return int(horas) * 60 + (int(minutos) if minutos else 0)
+
+
+def _analizar(franja):
+    dia, _, horas = franja.rpartition(" ")
+    inicio, _, fin = horas.partition("-")
+    try:
+        inicio, fin = _minutos(inicio), _minutos(fin)
+    except ValueError:
+        return None
+    if not dia or fin <= inicio:
+        return None
+    return dia, inicio, fin
+
+
+def partes_franja(franja):
+    """
+    Separa una franja con formato "Día H[:MM]-H[:MM]" en (dia, inicio, fin),
+    con las horas como números ("Lunes 7:30-9" -> ("Lunes", 7.5, 9)).
+    Retorna None si la franja no tiene ese formato.
+    """
+    partes = _analizar(franja)
+    if partes is None:
+        return None
+    dia, inicio, fin = partes
+    return dia, _hora(inicio), _hora(fin)
+
+
+def _hora(minutos):
+    return minutos // 60 if minutos % 60 == 0 else minutos / 60
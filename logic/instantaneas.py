@@ -0,0 +1,72 @@
+"""
+Instantáneas compartidas de los archivos de datos.
+Cada archivo se analiza una sola vez por proceso y el resultado se comparte
+entre todas las sesiones de Streamlit (y entre llamadas de un mismo script).
+La instantánea se invalida sola cuando cambian la fecha de modificación
+(en nanosegundos) o el tamaño del archivo.
+
+Los datos retornados son compartidos: se tratan como de solo lectura. Quien
+necesite modificarlos debe copiar primero la lista (`list(datos)`) y guardar
+el resultado con las funciones de escritura, que invalidan la instantánea.
+"""
+import os
+import threading
+
+from logic.codificacion import leer_archivo
+
+_instantaneas = {}
+_candado = threading.Lock()
+
+
+def _leer(ruta):
+    return leer_archivo(ruta)
+
+
+def firma(ruta):
+    """Identifica la versión de un archivo por (mtime_ns, tamaño)."""
+    info = os.stat(ruta)
+    return info.st_mtime_ns, info.st_size
+
+
+def leer_instantanea(ruta, cargar=_leer):
+    """
+    Retorna el contenido analizado del archivo, reutilizando la última lectura
+    si el archivo no cambió.
+
+    Raises:
+        FileNotFoundError, ErrorDecodificacion: como una lectura normal
+    """
+    clave = os.path.abspath(ruta)
+    version = firma(clave)
+    guardada = _instantaneas.get(clave)
+    if guardada is not None and guardada[0] == version:
+        return guardada[1]
+    datos = cargar(clave)
+    with _candado:
+        # Si otro hilo guardó una versión más nueva mientras leíamos, se conserva
+        actual = _instantaneas.get(clave)
+        if actual is None or actual[0] <= version:
+            _instantaneas[clave] = (version, datos)
+    return datos
+
+
+def registrar(ruta, datos):
+    """
+    Publica como instantánea los datos recién escritos en el archivo, para que
+    la próxima lectura no tenga que volver a analizarlo. Quien llama no debe
+    modificar `datos` después.
+    """
+    clave = os.path.abspath(ruta)
+    version = firma(clave)
+    with _candado:
+        _instantaneas[clave] = (version, datos)
+    return version
+
+
+def invalidar(ruta=None):
+    """Descarta la instantánea de un archivo (o todas si no se indica ruta)."""
+    with _candado:
+        if ruta is None:
+            _instantaneas.clear()
+        else:
+            _instantaneas.pop(os.path.abspath(ruta), None)
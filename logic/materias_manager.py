@@ -3,47 +3,88 @@ Módulo para gestionar las materias del currículum.
 Maneja la lectura, escritura y validación de datos de materias.
 """
 
-import json
-import os
+import csv
+import io
 from typing import List, Dict, Optional, Tuple
-import streamlit as st
+
+from logic.almacenamiento import obtener_almacen
+from logic.codificacion import ErrorDecodificacion
+from logic.concurrencia import ConflictoEdicion
+from logic.validaciones import validar_materia, validar_materias
+from logic.diario import operacion_agregar, operacion_eliminar, operacion_reemplazar
+
+CAMPOS_CSV = ['codigo', 'nombre', 'semestre', 'horas_semanales', 'horas_semestrales']
+CAMPOS_ENTEROS = ('semestre', 'horas_semanales', 'horas_semestrales')
 
 
 class MateriasManager:
-    """Clase para gestionar las operaciones CRUD de materias."""
+    """
+    Clase para gestionar las operaciones CRUD de materias.
+
+    Mantiene el catálogo en memoria con índices por código y por semestre.
+    Las escrituras actualizan almacén e índices a la vez, y el catálogo solo se
+    vuelve a leer si cambió bajo nosotros desde la última lectura o escritura.
+
+    No depende de la interfaz: las operaciones retornan (éxito, mensaje) y un
+    error de lectura del catálogo queda en `error_carga` para que la interfaz
+    lo muestre.
+    """
     
-    def __init__(self, file_path: str = "resources/materias.json"):
+    def __init__(self, file_path: str = "resources/materias.json", almacen=None):
         """
         Inicializa el gestor de materias.
         
         Args:
-            file_path: Ruta al archivo JSON de materias
+            file_path: Ruta al archivo JSON de materias (nombre de la colección)
+            almacen: Almacén de datos; por defecto el activo del proceso
         """
         self.file_path = file_path
+        self._almacen = almacen or obtener_almacen()
+        self._version = None
+        self.error_carga: Optional[str] = None
+        self._indexar([])
         self._ensure_file_exists()
     
     def _ensure_file_exists(self) -> None:
         """Asegura que el archivo JSON existe, creándolo si es necesario."""
-        if not os.path.exists(self.file_path):
-            # Crear directorio solo si no es el directorio actual
-            dir_path = os.path.dirname(self.file_path)
-            if dir_path:
-                os.makedirs(dir_path, exist_ok=True)
+        if not self._almacen.existe(self.file_path):
             self._save_materias([])
     
     def load_materias(self) -> List[Dict]:
         """
         Carga las materias desde el archivo JSON.
+        La lista es una instantánea compartida: debe copiarse antes de modificarla.
+        Si el archivo no puede leerse retorna una lista vacía y deja el motivo
+        en `error_carga`.
         
         Returns:
             Lista de diccionarios con los datos de las materias
         """
+        self._sincronizar()
+        return self._materias
+
+    def _sincronizar(self) -> None:
+        """Recarga el catálogo solo si el archivo cambió bajo nosotros."""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            st.error(f"Error al cargar materias: {e}")
-            return []
+            version = self._almacen.version(self.file_path)
+            if version is not None and version == self._version:
+                return
+            materias = self._almacen.leer(self.file_path)
+            self.error_carga = None
+        except (FileNotFoundError, ErrorDecodificacion) as e:
+            self.error_carga = f"Error al cargar materias: {e}"
+            version, materias = None, []
+        self._indexar(materias)
+        self._version = version
+
+    def _indexar(self, materias: List[Dict]) -> None:
+        """Reconstruye los índices por código y semestre."""
+        self._materias = materias
+        self._posicion = {}
+        self._por_semestre = {}
+        for i, materia in enumerate(materias):
+            self._posicion.setdefault(materia.get('codigo'), i)
+            self._por_semestre.setdefault(materia.get('semestre'), []).append(materia)
     
     def _save_materias(self, materias: List[Dict]) -> bool:
         """
@@ -55,13 +96,31 @@ class MateriasManager:
         Returns:
             True si se guardó correctamente, False en caso contrario
         """
+        return self._aplicar(materias, "Error al guardar las materias", 'escribir', materias) is None
+
+    def _aplicar(self, materias: List[Dict], error: str, operacion: str, *args) -> Optional[str]:
+        """
+        Ejecuta una operación del almacén y deja `materias` como catálogo en memoria.
+
+        Args:
+            materias: Catálogo resultante de la operación
+            error: Mensaje a retornar (con el detalle) si la escritura falla
+            operacion: Método del almacén y, en `args`, sus argumentos
+
+        Returns:
+            None si se guardó correctamente; si no, el mensaje de error
+        """
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump(materias, file, ensure_ascii=False, indent=2)
-            return True
+            getattr(self._almacen, operacion)(self.file_path, *args)
+        except ConflictoEdicion as e:
+            # Otro usuario escribió primero: se descarta el catálogo en memoria
+            self._version = None
+            return f"{e}. Recargue los datos e intente de nuevo."
         except Exception as e:
-            st.error(f"Error al guardar materias: {e}")
-            return False
+            return f"{error}: {e}"
+        self._indexar(materias)
+        self._version = self._almacen.version(self.file_path)
+        return None
     
     def validate_materia(self, materia: Dict) -> Tuple[bool, str]:
         """
@@ -71,46 +130,11 @@ class MateriasManager:
             materia: Diccionario con los datos de la materia
             
         Returns:
-            Tupla con (es_válido, mensaje_error)
+            Tupla con (es_válido, mensaje_error); el mensaje reúne todos los errores
         """
-        # Validar campos requeridos
-        required_fields = ['codigo', 'nombre', 'semestre', 'horas_semanales', 'horas_semestrales']
-        for field in required_fields:
-            if field not in materia or not materia[field]:
-                return False, f"El campo '{field}' es obligatorio"
-        
-        # Validar código (no vacío y único)
-        if not isinstance(materia['codigo'], str) or len(materia['codigo'].strip()) == 0:
-            return False, "El código debe ser una cadena no vacía"
-        
-        # Validar nombre (no vacío)
-        if not isinstance(materia['nombre'], str) or len(materia['nombre'].strip()) == 0:
-            return False, "El nombre debe ser una cadena no vacía"
-        
-        # Validar semestre (1-10)
-        try:
-            semestre = int(materia['semestre'])
-            if semestre < 1 or semestre > 10:
-                return False, "El semestre debe estar entre 1 y 10"
-        except (ValueError, TypeError):
-            return False, "El semestre debe ser un número entero"
-        
-        # Validar horas semanales (positivo)
-        try:
-            horas_semanales = int(materia['horas_semanales'])
-            if horas_semanales <= 0:
-                return False, "Las horas semanales deben ser un número positivo"
-        except (ValueError, TypeError):
-            return False, "Las horas semanales deben ser un número entero"
-        
-        # Validar horas semestrales (positivo)
-        try:
-            horas_semestrales = int(materia['horas_semestrales'])
-            if horas_semestrales <= 0:
-                return False, "Las horas semestrales deben ser un número positivo"
-        except (ValueError, TypeError):
-            return False, "Las horas semestrales deben ser un número entero"
-        
+        errores = validar_materia(materia)
+        if errores:
+            return False, "; ".join(errores)
         return True, ""
     
     def add_materia(self, materia: Dict) -> Tuple[bool, str]:
@@ -129,26 +153,26 @@ class MateriasManager:
             return False, error_msg
         
         # Verificar que el código no exista
-        materias = self.load_materias()
-        if any(m['codigo'] == materia['codigo'] for m in materias):
+        self._sincronizar()
+        if materia['codigo'] in self._posicion:
             return False, f"Ya existe una materia con el código '{materia['codigo']}'"
         
-        # Agregar la materia
-        materias.append(materia)
-        
-        # Guardar
-        if self._save_materias(materias):
-            return True, f"Materia '{materia['nombre']}' agregada correctamente"
-        else:
-            return False, "Error al guardar la materia"
+        # Agregar y guardar la materia
+        error = self._aplicar(self._materias + [materia], "Error al guardar la materia", 'agregar', materia, 'codigo')
+        if error:
+            return False, error
+        return True, f"Materia '{materia['nombre']}' agregada correctamente"
     
-    def update_materia(self, codigo_original: str, materia_actualizada: Dict) -> Tuple[bool, str]:
+    def update_materia(self, codigo_original: str, materia_actualizada: Dict,
+                       esperado: Optional[str] = None) -> Tuple[bool, str]:
         """
         Actualiza una materia existente.
         
         Args:
             codigo_original: Código de la materia a actualizar
             materia_actualizada: Diccionario con los datos actualizados
+            esperado: Etiqueta de la versión que editó el usuario
+                (logic.concurrencia.etiqueta); si otro usuario la cambió, se rechaza
             
         Returns:
             Tupla con (éxito, mensaje)
@@ -158,15 +182,9 @@ class MateriasManager:
         if not is_valid:
             return False, error_msg
         
-        # Cargar materias
-        materias = self.load_materias()
-        
         # Buscar la materia
-        materia_index = None
-        for i, materia in enumerate(materias):
-            if materia['codigo'] == codigo_original:
-                materia_index = i
-                break
+        self._sincronizar()
+        materia_index = self._posicion.get(codigo_original)
         
         if materia_index is None:
             return False, f"No se encontró la materia con código '{codigo_original}'"
@@ -174,50 +192,216 @@ class MateriasManager:
         # Verificar que el nuevo código no exista (si cambió)
         nuevo_codigo = materia_actualizada['codigo']
         if nuevo_codigo != codigo_original:
-            if any(m['codigo'] == nuevo_codigo for m in materias):
+            if nuevo_codigo in self._posicion:
                 return False, f"Ya existe una materia con el código '{nuevo_codigo}'"
         
-        # Actualizar la materia
+        # Actualizar y guardar la materia
+        materias = list(self._materias)
         materias[materia_index] = materia_actualizada
-        
-        # Guardar
-        if self._save_materias(materias):
-            return True, f"Materia '{materia_actualizada['nombre']}' actualizada correctamente"
-        else:
-            return False, "Error al guardar la materia"
+        error = self._aplicar(materias, "Error al guardar la materia",
+                              'reemplazar', 'codigo', codigo_original, materia_actualizada, esperado)
+        if error:
+            return False, error
+        return True, f"Materia '{materia_actualizada['nombre']}' actualizada correctamente"
     
-    def delete_materia(self, codigo: str) -> Tuple[bool, str]:
+    def delete_materia(self, codigo: str, esperado: Optional[str] = None) -> Tuple[bool, str]:
         """
         Elimina una materia.
         
         Args:
             codigo: Código de la materia a eliminar
+            esperado: Etiqueta de la versión que vio el usuario (opcional)
             
         Returns:
             Tupla con (éxito, mensaje)
         """
-        # Cargar materias
-        materias = self.load_materias()
-        
-        # Buscar y eliminar la materia
-        materia_encontrada = None
-        for materia in materias:
-            if materia['codigo'] == codigo:
-                materia_encontrada = materia
-                break
+        # Buscar la materia
+        materia_encontrada = self.get_materia_by_codigo(codigo)
         
         if not materia_encontrada:
             return False, f"No se encontró la materia con código '{codigo}'"
         
-        # Eliminar la materia
-        materias = [m for m in materias if m['codigo'] != codigo]
+        # Eliminar la materia y guardar
+        materias = [m for m in self._materias if m['codigo'] != codigo]
+        error = self._aplicar(materias, "Error al eliminar la materia", 'eliminar', 'codigo', codigo, esperado)
+        if error:
+            return False, error
+        return True, f"Materia '{materia_encontrada['nombre']}' eliminada correctamente"
+
+    # ---------------- Operaciones en lote ----------------
+    # Validan todo el lote de una vez y lo guardan con una sola escritura; si
+    # alguna fila tiene errores no se guarda ninguna. Los errores se reportan
+    # como (número de fila empezando en 1, mensaje).
+
+    def _validar_lote(self, materias: List[Dict], rechazar_existentes: bool) -> List[Tuple[int, str]]:
+        """Valida todas las filas y la unicidad de los códigos dentro del lote (y contra el catálogo)."""
+        errores = validar_materias(materias)
+        codigos = {m.get('codigo') for m in materias if isinstance(m, dict) and isinstance(m.get('codigo'), str)}
+        if rechazar_existentes and not codigos.isdisjoint(self._posicion):
+            errores.extend(
+                (fila, f"Ya existe una materia con el código '{materia['codigo']}'")
+                for fila, materia in enumerate(materias, start=1)
+                if isinstance(materia, dict) and isinstance(materia.get('codigo'), str) and materia['codigo'] in self._posicion
+            )
+            errores.sort(key=lambda error: error[0])
+        return errores
+
+    def add_many(self, materias: List[Dict]) -> Tuple[bool, str, List[Tuple[int, str]]]:
+        """
+        Agrega varias materias.
+
+        Args:
+            materias: Lista de diccionarios con los datos de las materias
+
+        Returns:
+            Tupla con (éxito, mensaje, errores por fila)
+        """
+        self._sincronizar()
+        errores = self._validar_lote(materias, rechazar_existentes=True)
+        if errores:
+            return False, f"No se agregó ninguna materia: {len(errores)} fila(s) con errores", errores
+        if not materias:
+            return True, "No hay materias para agregar", []
+        operaciones = [operacion_agregar(m, 'codigo') for m in materias]
+        error = self._aplicar(self._materias + list(materias), "Error al guardar las materias", 'aplicar_lote', operaciones)
+        if error:
+            return False, error, []
+        return True, f"{len(materias)} materia(s) agregada(s) correctamente", []
+
+    def update_many(self, cambios: Dict[str, Dict]) -> Tuple[bool, str, List[Tuple[int, str]]]:
+        """
+        Actualiza varias materias.
         
-        # Guardar
-        if self._save_materias(materias):
-            return True, f"Materia '{materia_encontrada['nombre']}' eliminada correctamente"
+        Args:
+            cambios: Diccionario {código original: datos actualizados}
+
+        Returns:
+            Tupla con (éxito, mensaje, errores por fila, en el orden de `cambios`)
+        """
+        self._sincronizar()
+        # Códigos que quedan tras el lote: los que no se editan más los nuevos
+        finales = {c: None for c in self._posicion if c not in cambios}
+        materias = list(self._materias)
+        errores = validar_materias(list(cambios.values()))
+        invalidas = {fila for fila, _ in errores}
+        for fila, (codigo_original, materia) in enumerate(cambios.items(), start=1):
+            if fila in invalidas:
+                continue
+            materia_index = self._posicion.get(codigo_original)
+            if materia_index is None:
+                errores.append((fila, f"No se encontró la materia con código '{codigo_original}'"))
+                continue
+            if materia['codigo'] in finales:
+                errores.append((fila, f"Ya existe una materia con el código '{materia['codigo']}'"))
+                continue
+            finales[materia['codigo']] = fila
+            materias[materia_index] = materia
+        if errores:
+            errores.sort(key=lambda error: error[0])
+            return False, f"No se actualizó ninguna materia: {len(errores)} fila(s) con errores", errores
+        if not cambios:
+            return True, "No hay materias para actualizar", []
+        if any(m['codigo'] != c and m['codigo'] in cambios for c, m in cambios.items()):
+            # Códigos intercambiados dentro del lote: reemplazar por código en
+            # secuencia tocaría la fila equivocada, se guarda el catálogo entero
+            error = self._aplicar(materias, "Error al guardar las materias", 'escribir', materias)
         else:
-            return False, "Error al eliminar la materia"
-    
+            operaciones = [operacion_reemplazar('codigo', c, m) for c, m in cambios.items()]
+            error = self._aplicar(materias, "Error al guardar las materias", 'aplicar_lote', operaciones)
+        if error:
+            return False, error, []
+        return True, f"{len(cambios)} materia(s) actualizada(s) correctamente", []
+
+    def delete_many(self, codigos: List[str]) -> Tuple[bool, str, List[Tuple[int, str]]]:
+        """
+        Elimina varias materias.
+
+        Args:
+            codigos: Códigos de las materias a eliminar
+
+        Returns:
+            Tupla con (éxito, mensaje, errores por fila)
+        """
+        self._sincronizar()
+        errores = [
+            (fila, f"No se encontró la materia con código '{codigo}'")
+            for fila, codigo in enumerate(codigos, start=1) if codigo not in self._posicion
+        ]
+        if errores:
+            return False, f"No se eliminó ninguna materia: {len(errores)} fila(s) con errores", errores
+        if not codigos:
+            return True, "No hay materias para eliminar", []
+        eliminar = set(codigos)
+        materias = [m for m in self._materias if m['codigo'] not in eliminar]
+        operaciones = [operacion_eliminar('codigo', c) for c in eliminar]
+        error = self._aplicar(materias, "Error al eliminar las materias", 'aplicar_lote', operaciones)
+        if error:
+            return False, error, []
+        return True, f"{len(eliminar)} materia(s) eliminada(s) correctamente", []
+
+    @staticmethod
+    def parse_csv(texto: str) -> List[Dict]:
+        """
+        Convierte un CSV con encabezados (codigo, nombre, semestre,
+        horas_semanales, horas_semestrales) en materias. Los campos numéricos
+        se convierten a enteros cuando es posible; la validación queda para
+        add_many / update_many.
+        """
+        materias = []
+        for registro in csv.DictReader(io.StringIO(texto.lstrip('\ufeff'))):
+            materia = {}
+            for campo, valor in registro.items():
+                if campo is None:
+                    continue
+                campo = campo.strip().lower()
+                valor = (valor or '').strip()
+                if campo in CAMPOS_ENTEROS:
+                    try:
+                        valor = int(valor)
+                    except ValueError:
+                        pass
+                materia[campo] = valor
+            materias.append(materia)
+        return materias
+
+    def import_csv(self, texto: str, actualizar_existentes: bool = False) -> Tuple[bool, str, List[Tuple[int, str]]]:
+        """
+        Importa materias desde un CSV en una sola escritura.
+
+        Args:
+            texto: Contenido del archivo CSV
+            actualizar_existentes: Si es True, las filas cuyo código ya existe
+                actualizan la materia en lugar de reportarse como duplicadas
+
+        Returns:
+            Tupla con (éxito, mensaje, errores por fila del CSV sin contar el encabezado)
+        """
+        materias = self.parse_csv(texto)
+        if not actualizar_existentes:
+            return self.add_many(materias)
+        self._sincronizar()
+        errores = self._validar_lote(materias, rechazar_existentes=False)
+        if errores:
+            return False, f"No se importó ninguna materia: {len(errores)} fila(s) con errores", errores
+        if not materias:
+            return True, "El archivo no tiene materias", []
+        catalogo = list(self._materias)
+        operaciones = []
+        agregadas = 0
+        for materia in materias:
+            posicion = self._posicion.get(materia['codigo'])
+            if posicion is None:
+                catalogo.append(materia)
+                operaciones.append(operacion_agregar(materia, 'codigo'))
+                agregadas += 1
+            else:
+                catalogo[posicion] = materia
+                operaciones.append(operacion_reemplazar('codigo', materia['codigo'], materia))
+        error = self._aplicar(catalogo, "Error al guardar las materias", 'aplicar_lote', operaciones)
+        if error:
+            return False, error, []
+        return True, f"{agregadas} materia(s) agregada(s) y {len(materias) - agregadas} actualizada(s)", []
+
     def get_materia_by_codigo(self, codigo: str) -> Optional[Dict]:
         """
         Obtiene una materia por su código.
@@ -228,11 +412,9 @@ class MateriasManager:
         Returns:
             Diccionario con los datos de la materia o None si no existe
         """
-        materias = self.load_materias()
-        for materia in materias:
-            if materia['codigo'] == codigo:
-                return materia
-        return None
+        self._sincronizar()
+        i = self._posicion.get(codigo)
+        return None if i is None else self._materias[i]
     
     def get_materias_by_semestre(self, semestre: int) -> List[Dict]:
         """
@@ -244,8 +426,8 @@ class MateriasManager:
         Returns:
             Lista de materias del semestre
         """
-        materias = self.load_materias()
-        return [m for m in materias if m['semestre'] == semestre]
+        self._sincronizar()
+        return list(self._por_semestre.get(semestre, ()))
     
     def get_all_codigos(self) -> List[str]:
         """
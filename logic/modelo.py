@@ -0,0 +1,150 @@
+"""
+Modelo de dominio compacto para el asignador.
+Los profesores y materias llegan como diccionarios (archivos JSON, formularios);
+se analizan y validan una sola vez al cargar y se convierten en objetos
+inmutables con `__slots__`, cadenas internadas e identificadores enteros. La
+búsqueda trabaja sobre estos objetos y los diccionarios solo reaparecen en el
+borde de la API (`como_dict`).
+"""
+import sys
+from dataclasses import dataclass
+
+
+def clave_cohorte(materia):
+    """Identifica al grupo de estudiantes que cursa la materia (diccionario o Materia)."""
+    if isinstance(materia, Materia):
+        return materia.cohorte
+    return (materia["semestre"], materia.get("paralelo"))
+
+
+def cohortes_ocupadas(cohortes):
+    """
+    Cohortes que ocupa una clase de cada cohorte (semestre, paralelo). Una
+    materia sin paralelo la cursa todo el semestre: ocupa su cohorte y la de
+    cada sección del semestre. Una sección solo ocupa la suya, así que
+    secciones distintas no chocan entre sí.
+
+    Returns:
+        Diccionario cohorte -> tupla de cohortes, empezando por ella misma
+    """
+    cohortes = list(dict.fromkeys(cohortes))
+    secciones = {}
+    for cohorte in cohortes:
+        if cohorte[1] is not None:
+            secciones.setdefault(cohorte[0], []).append(cohorte)
+    return {c: (c,) if c[1] is not None else (c, *secciones.get(c[0], ())) for c in cohortes}
+
+
+def _texto(valor):
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+@dataclass(frozen=True, slots=True)
+class Materia:
+    """Materia que dicta un profesor; `duracion` son sus horas semanales."""
+    nombre: str
+    semestre: object
+    duracion: int
+    paralelo: object = None
+
+    @property
+    def cohorte(self):
+        return (self.semestre, self.paralelo)
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """
+        Raises:
+            ValueError: si faltan campos o la duración no es un entero no negativo
+        """
+        faltantes = [c for c in ("nombre", "semestre", "duracion") if c not in datos]
+        if faltantes:
+            raise ValueError(f"A la materia {datos.get('nombre', '?')!r} le faltan los campos {', '.join(faltantes)}")
+        duracion = datos["duracion"]
+        if isinstance(duracion, bool) or not isinstance(duracion, int) or duracion < 0:
+            raise ValueError(f"Duración inválida para la materia {datos['nombre']!r}: {duracion!r}")
+        return cls(_texto(datos["nombre"]), _texto(datos["semestre"]), duracion, _texto(datos.get("paralelo")))
+
+    def como_dict(self):
+        materia = {"nombre": self.nombre, "semestre": self.semestre, "duracion": self.duracion}
+        if self.paralelo is not None:
+            materia["paralelo"] = self.paralelo
+        return materia
+
+
+@dataclass(frozen=True, slots=True)
+class Profesor:
+    """Profesor con su posición en la lista original (`id`)."""
+    id: int
+    nombre: str
+    horarios_disponibles: tuple
+    materias: tuple
+
+    @classmethod
+    def desde_dict(cls, datos, id, materias=None):
+        """
+        Args:
+            datos: Diccionario con nombre, horarios_disponibles y materias
+            id: Identificador entero del profesor
+            materias: Diccionario opcional para compartir materias iguales entre profesores
+
+        Raises:
+            ValueError: si el profesor o alguna de sus materias no es válido
+        """
+        if "nombre" not in datos:
+            raise ValueError(f"El profesor #{id + 1} no tiene nombre")
+        compartidas = {} if materias is None else materias
+        propias = []
+        for m in datos.get("materias", ()):
+            materia = Materia.desde_dict(m)
+            propias.append(compartidas.setdefault(materia, materia))
+        horarios = tuple(_texto(h) for h in datos.get("horarios_disponibles", ()))
+        return cls(id, _texto(datos["nombre"]), horarios, tuple(propias))
+
+    def como_dict(self):
+        return {
+            "nombre": self.nombre,
+            "horarios_disponibles": list(self.horarios_disponibles),
+            "materias": [m.como_dict() for m in self.materias],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Slot:
+    """Franja de la grilla con su índice de bit."""
+    id: int
+    franja: str
+
+
+@dataclass(frozen=True, slots=True)
+class Asignacion:
+    """Un bloque de una materia colocado en una franja."""
+    profesor: Profesor
+    materia: Materia
+    slot: Slot
+
+    def como_dict(self):
+        """Formato de asignación del resto de la aplicación."""
+        asignacion = {
+            "profesor": self.profesor.nombre,
+            "materia": self.materia.nombre,
+            "semestre": self.materia.semestre,
+            "duracion": self.materia.duracion,
+            "horario": self.slot.franja,
+        }
+        if self.materia.paralelo is not None:
+            asignacion["paralelo"] = self.materia.paralelo
+        return asignacion
+
+
+def cargar_profesores(profesores):
+    """
+    Convierte una lista de profesores (diccionarios) en objetos Profesor con
+    `id` igual a su posición. Los que ya son Profesor se conservan tal cual,
+    así que convertir dos veces, o una sublista ya convertida, no cuesta nada.
+
+    Raises:
+        ValueError: ver Profesor.desde_dict
+    """
+    materias = {}
+    return [p if isinstance(p, Profesor) else Profesor.desde_dict(p, i, materias) for i, p in enumerate(profesores)]
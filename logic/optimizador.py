@@ -0,0 +1,272 @@
+"""
+Optimización de la calidad de un horario ya factible.
+Aplica recocido simulado sobre movimientos que mantienen la factibilidad
+(reubicar un bloque en una franja libre o intercambiar dos bloques del mismo
+profesor). Cada movimiento se evalúa por diferencia: solo se recalculan los
+términos de los días y recursos que toca, nunca el horario completo.
+"""
+import math
+import random
+import time
+from dataclasses import dataclass
+
+from logic.franjas import bits, contar, grilla
+from logic.modelo import Profesor, clave_cohorte, cohortes_ocupadas
+
+
+@dataclass
+class Objetivo:
+    """
+    Pesos de la función objetivo (se minimiza).
+
+    huecos: franjas muertas entre clases de una cohorte en un mismo día (un
+        corte de la grilla, como el almuerzo, cuenta como una franja)
+    dispersion: concentración de la carga diaria (suma de cuadrados de bloques
+        por día, para cohortes y profesores)
+    temprano: bloques que empiezan antes de `hora_temprana`
+    """
+    huecos: float = 1.0
+    dispersion: float = 0.2
+    temprano: float = 0.5
+    hora_temprana: int = 9
+
+
+class _Estado:
+    """Ocupaciones y contadores por día que permiten evaluar movimientos en O(1)."""
+
+    def __init__(self, asignaciones, profesores, horarios, objetivo):
+        self.objetivo = objetivo
+        self.indice = indice = grilla(horarios)
+        dias, self.dia, self.temprano = {}, [], []
+        por_dia = {}
+        for i, franja in enumerate(indice.franjas):
+            # Una franja opaca es un día propio que empieza a la hora 0
+            inicio = indice.inicio[i] or 0
+            d = dias.setdefault(indice.dia[i] or franja, len(dias))
+            por_dia.setdefault(d, []).append((inicio, i))
+            self.dia.append(d)
+            self.temprano.append(1 if inicio < objetivo.hora_temprana * 60 else 0)
+        # Posición de cada franja en su día; un corte entre dos franjas deja un lugar vacío
+        self.posicion = [0] * len(indice)
+        for franjas_dia in por_dia.values():
+            pos, anterior = -1, None
+            for _, i in sorted(franjas_dia):
+                seguida = anterior is None or (indice.contiguas[anterior] | indice.solapes[anterior]) >> i & 1
+                pos += 1 if seguida else 2
+                self.posicion[i] = pos
+                anterior = i
+        self.n_dias = max(len(dias), 1)
+
+        disponibles = {}
+        for p in profesores:
+            if isinstance(p, Profesor):
+                disponibles[p.nombre] = self.indice.mascara(p.horarios_disponibles)
+            else:
+                disponibles[p["nombre"]] = self.indice.mascara(p["horarios_disponibles"])
+        ocupa = cohortes_ocupadas(clave_cohorte(a) for a in asignaciones)
+        ids_prof, ids_coh = {}, {c: k for k, c in enumerate(ocupa)}
+        # Cada bloque ocupa su profesor y las cohortes de cohortes_ocupadas
+        self.franja, self.prof, self.coh, self.movibles = [], [], [], []
+        for a in asignaciones:
+            self.franja.append(self.indice.bit(a["horario"]))
+            self.prof.append(ids_prof.setdefault(a["profesor"], len(ids_prof)))
+            self.coh.append(tuple(ids_coh[c] for c in ocupa[clave_cohorte(a)]))
+            # Sin datos del profesor el bloque no se mueve
+            self.movibles.append(disponibles.get(a["profesor"], 0))
+        self.ocup_prof = [0] * len(ids_prof)
+        self.ocup_coh = [0] * len(ids_coh)
+        self.dia_coh = [0] * (len(ids_coh) * self.n_dias)
+        self.carga_prof = [0] * (len(ids_prof) * self.n_dias)
+        self.bloques_prof = [[] for _ in ids_prof]
+        for b, i in enumerate(self.franja):
+            self._poner(b, i)
+            self.bloques_prof[self.prof[b]].append(b)
+
+    def _poner(self, b, i):
+        self.franja[b] = i
+        self.ocup_prof[self.prof[b]] |= 1 << i
+        for c in self.coh[b]:
+            self.ocup_coh[c] |= 1 << i
+            self.dia_coh[c * self.n_dias + self.dia[i]] |= 1 << self.posicion[i]
+        self.carga_prof[self.prof[b] * self.n_dias + self.dia[i]] += 1
+
+    def _quitar(self, b):
+        i = self.franja[b]
+        self.ocup_prof[self.prof[b]] &= ~(1 << i)
+        for c in self.coh[b]:
+            self.ocup_coh[c] &= ~(1 << i)
+            self.dia_coh[c * self.n_dias + self.dia[i]] &= ~(1 << self.posicion[i])
+        self.carga_prof[self.prof[b] * self.n_dias + self.dia[i]] -= 1
+
+    def ocupadas(self, b):
+        """Franjas ocupadas por el profesor o las cohortes del bloque b (incluida la suya)."""
+        ocupadas = self.ocup_prof[self.prof[b]]
+        for c in self.coh[b]:
+            ocupadas |= self.ocup_coh[c]
+        return ocupadas
+
+    # ---------------- Evaluación ----------------
+    def _costo_cohorte_dia(self, c, d):
+        mascara = self.dia_coh[c * self.n_dias + d]
+        if not mascara:
+            return 0.0
+        cantidad = contar(mascara)
+        huecos = mascara.bit_length() - ((mascara & -mascara).bit_length() - 1) - cantidad
+        return self.objetivo.huecos * huecos + self.objetivo.dispersion * cantidad * cantidad
+
+    def _costo_profesor_dia(self, p, d):
+        carga = self.carga_prof[p * self.n_dias + d]
+        return self.objetivo.dispersion * carga * carga
+
+    def _costo_local(self, cohortes, profesores, dias):
+        return sum(self._costo_cohorte_dia(c, d) for c in cohortes for d in dias) + \
+            sum(self._costo_profesor_dia(p, d) for p in profesores for d in dias)
+
+    def costo_total(self):
+        """Costo del horario completo (solo para el valor inicial y los reportes)."""
+        total = sum(self._costo_cohorte_dia(c, d) for c in range(len(self.ocup_coh)) for d in range(self.n_dias))
+        total += sum(self._costo_profesor_dia(p, d) for p in range(len(self.ocup_prof)) for d in range(self.n_dias))
+        total += self.objetivo.temprano * sum(self.temprano[i] for i in self.franja)
+        return total
+
+    def detalle(self):
+        """Valores sin ponderar de cada término del objetivo."""
+        huecos = 0
+        for mascara in self.dia_coh:
+            if mascara:
+                huecos += mascara.bit_length() - ((mascara & -mascara).bit_length() - 1) - contar(mascara)
+        return {
+            "huecos": huecos,
+            "dispersion": sum(contar(m) ** 2 for m in self.dia_coh) + sum(c * c for c in self.carga_prof),
+            "temprano": sum(self.temprano[i] for i in self.franja),
+        }
+
+    # ---------------- Movimientos ----------------
+    def mover(self, b, destino):
+        """Reubica el bloque b. Retorna el cambio de costo."""
+        origen = self.franja[b]
+        dias = {self.dia[origen], self.dia[destino]}
+        antes = self._costo_local(self.coh[b], (self.prof[b],), dias)
+        self._quitar(b)
+        self._poner(b, destino)
+        despues = self._costo_local(self.coh[b], (self.prof[b],), dias)
+        return despues - antes + self.objetivo.temprano * (self.temprano[destino] - self.temprano[origen])
+
+    def intercambiar(self, b1, b2):
+        """Intercambia las franjas de dos bloques del mismo profesor. Retorna el cambio de costo."""
+        x, y = self.franja[b1], self.franja[b2]
+        dias = {self.dia[x], self.dia[y]}
+        cohortes = set(self.coh[b1]) | set(self.coh[b2])
+        antes = self._costo_local(cohortes, (), dias)
+        self._quitar(b1)
+        self._quitar(b2)
+        self._poner(b1, y)
+        self._poner(b2, x)
+        return self._costo_local(cohortes, (), dias) - antes
+
+
+def _intercambio_valido(estado, b1, b2):
+    if estado.coh[b1] == estado.coh[b2]:
+        return False
+    x, y = estado.franja[b1], estado.franja[b2]
+    solapes = estado.indice.solapes
+    for b, origen, destino, otro in ((b1, x, y, b2), (b2, y, x, b1)):
+        for c in estado.coh[b]:
+            # Las franjas que dejan los dos bloques quedan libres
+            libres = 1 << origen | (1 << destino if c in estado.coh[otro] else 0)
+            if solapes[destino] & estado.ocup_coh[c] & ~libres:
+                return False
+    return True
+
+
+def evaluar_horario(asignaciones, profesores, horarios, objetivo=None):
+    """
+    Evalúa la calidad de un horario.
+    Retorna un diccionario con el costo ponderado ("costo") y los valores de
+    cada término ("huecos", "dispersion", "temprano").
+    """
+    estado = _Estado(asignaciones, profesores, horarios, objetivo or Objetivo())
+    detalle = estado.detalle()
+    detalle["costo"] = estado.costo_total()
+    return detalle
+
+
+def optimizar_horarios(asignaciones, profesores, horarios, objetivo=None,
+                       iteraciones=20000, limite_tiempo=None, semilla=0):
+    """
+    Mejora un horario factible por recocido simulado.
+
+    Args:
+        asignaciones: Asignaciones completas y válidas (salida de asignar_horarios)
+        profesores: Profesores con su disponibilidad (diccionarios u objetos Profesor)
+        horarios: Grilla de franjas horarias
+        objetivo: Pesos de la función objetivo (Objetivo por defecto)
+        iteraciones: Cantidad máxima de movimientos evaluados
+        limite_tiempo: Segundos máximos de optimización, o None
+        semilla: Semilla del generador aleatorio (resultado reproducible)
+
+    Returns:
+        Tupla (asignaciones_mejoradas, resumen) donde resumen contiene
+        costo_inicial, costo_final, iteraciones y aceptados
+    """
+    objetivo = objetivo or Objetivo()
+    estado = _Estado(asignaciones, profesores, horarios, objetivo)
+    costo_inicial = estado.costo_total()
+    resumen = {"costo_inicial": costo_inicial, "costo_final": costo_inicial, "iteraciones": 0, "aceptados": 0}
+    if not asignaciones or iteraciones <= 0:
+        return [dict(a) for a in asignaciones], resumen
+
+    rnd = random.Random(semilla)
+    opciones = [list(bits(m)) for m in estado.movibles]
+    n = len(asignaciones)
+    inicio = time.time()
+    temperatura_inicial = max(objetivo.huecos, objetivo.dispersion, objetivo.temprano, 1e-6)
+    temperatura_final = temperatura_inicial * 1e-3
+    costo = mejor_costo = costo_inicial
+    mejor = list(estado.franja)
+    aceptados = 0
+    it = 0
+    for it in range(1, iteraciones + 1):
+        avance = it / iteraciones
+        if limite_tiempo is not None:
+            transcurrido = time.time() - inicio
+            if transcurrido >= limite_tiempo:
+                break
+            avance = max(avance, transcurrido / limite_tiempo)
+        temperatura = temperatura_inicial * (temperatura_final / temperatura_inicial) ** avance
+
+        b = rnd.randrange(n)
+        if rnd.random() < 0.5:
+            if not opciones[b]:
+                continue
+            destino = rnd.choice(opciones[b])
+            origen = estado.franja[b]
+            ocupadas = estado.ocupadas(b) & ~(1 << origen)
+            if destino == origen or estado.indice.solapes[destino] & ocupadas:
+                continue
+            delta = estado.mover(b, destino)
+            deshacer = (estado.mover, b, origen)
+        else:
+            companeros = estado.bloques_prof[estado.prof[b]]
+            b2 = companeros[rnd.randrange(len(companeros))]
+            if not _intercambio_valido(estado, b, b2):
+                continue
+            delta = estado.intercambiar(b, b2)
+            deshacer = (estado.intercambiar, b, b2)
+
+        if delta <= 0 or rnd.random() < math.exp(-delta / temperatura):
+            costo += delta
+            aceptados += 1
+            if costo < mejor_costo - 1e-9:
+                mejor_costo = costo
+                mejor = list(estado.franja)
+        else:
+            deshacer[0](deshacer[1], deshacer[2])
+
+    mejoradas = []
+    for a, i in zip(asignaciones, mejor):
+        nueva = dict(a)
+        nueva["horario"] = estado.indice.franjas[i]
+        mejoradas.append(nueva)
+    resumen.update(costo_final=mejor_costo, iteraciones=it, aceptados=aceptados)
+    return mejoradas, resumen
@@ -0,0 +1,84 @@
+"""
+Repositorio en memoria con índices sobre los archivos de datos.
+Cada archivo se lee a través de su instantánea compartida y los índices se
+construyen una sola vez por versión del archivo; las búsquedas por código,
+nombre, semestre o profesor pasan a ser consultas a diccionarios.
+"""
+from logic.codificacion import ErrorDecodificacion
+from logic.instantaneas import leer_instantanea
+
+
+class IndiceMaterias:
+    """Índices de una lista de materias por código, nombre (sin mayúsculas) y semestre."""
+
+    def __init__(self, materias):
+        self.materias = materias
+        self.por_codigo = {}
+        self.por_nombre = {}
+        self.por_semestre = {}
+        for materia in materias:
+            # Ante duplicados gana la primera aparición, como en una búsqueda lineal
+            self.por_codigo.setdefault(materia.get('codigo'), materia)
+            self.por_nombre.setdefault(str(materia.get('nombre', '')).lower(), materia)
+            self.por_semestre.setdefault(materia.get('semestre'), []).append(materia)
+
+    def buscar_codigo(self, codigo):
+        return self.por_codigo.get(codigo)
+
+    def buscar_nombre(self, nombre):
+        return self.por_nombre.get(nombre.lower())
+
+    def de_semestre(self, semestre):
+        return list(self.por_semestre.get(semestre, ()))
+
+
+class IndiceProfesores:
+    """
+    Posición de cada profesor en la lista, por nombre exacto. Sirve para
+    cualquier colección con nombre: el almacén JSON lo usa para reemplazar,
+    eliminar y verificar precondiciones por nombre.
+    """
+
+    def __init__(self, profesores):
+        self.profesores = profesores
+        self.posicion = {}
+        for i, profesor in enumerate(profesores):
+            self.posicion.setdefault(profesor.get('nombre'), i)
+
+    def buscar(self, nombre):
+        i = self.posicion.get(nombre)
+        return None if i is None else self.profesores[i]
+
+
+class Repositorio:
+    """Entrega los índices vigentes de cada archivo, reconstruyéndolos solo cuando cambia."""
+
+    def __init__(self, leer=leer_instantanea):
+        """
+        Args:
+            leer: Función que retorna los datos de una ruta; debe retornar el
+                mismo objeto mientras los datos no cambien
+        """
+        self._leer = leer
+        self._indices = {}
+
+    def _indice(self, ruta, tipo):
+        try:
+            datos = self._leer(ruta)
+        except (FileNotFoundError, ErrorDecodificacion):
+            datos = []
+        guardado = self._indices.get((ruta, tipo))
+        # La instantánea es el mismo objeto mientras el archivo no cambie
+        if guardado is not None and guardado[0] is datos:
+            return guardado[1]
+        indice = tipo(datos)
+        self._indices[(ruta, tipo)] = (datos, indice)
+        return indice
+
+    def materias(self, ruta):
+        """Índice de las materias del archivo (catálogo o malla curricular)."""
+        return self._indice(ruta, IndiceMaterias)
+
+    def profesores(self, ruta):
+        """Índice de los profesores del archivo."""
+        return self._indice(ruta, IndiceProfesores)
@@ -1,105 +1,99 @@
 """
 Funciones auxiliares para manejo de archivos JSON y gestión de profesores y materias.
+Los datos se leen y escriben a través del almacén activo (JSON por defecto,
+ver logic/almacenamiento.py); cada ruta identifica una colección.
 """
-import json
+from logic.almacenamiento import obtener_almacen
+from logic.codificacion import ErrorDecodificacion
 
 RUTA_PROFESORES = "data/profesores.json"
 RUTA_MATERIAS = "data/materias.json"
 RUTA_MALLA_CURRICULAR = "data/materias.json"
+RUTA_HORARIOS = "data/horarios.json"
 
 def leer_json(ruta):
-    """Lee un archivo JSON y retorna su contenido."""
-    with open(ruta, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Lee un archivo JSON y retorna su contenido (compartido, de solo lectura)."""
+    return obtener_almacen().leer(ruta)
 
 def escribir_json(ruta, datos):
     """Escribe datos en un archivo JSON."""
-    with open(ruta, 'w', encoding='utf-8') as f:
-        json.dump(datos, f, ensure_ascii=False, indent=2)
+    obtener_almacen().escribir(ruta, datos)
+
+def _cargar(ruta):
+    try:
+        return obtener_almacen().leer(ruta)
+    except (FileNotFoundError, ErrorDecodificacion):
+        return []
 
 def guardar_profesores(lista):
     """Guarda la lista completa de profesores en el archivo JSON."""
-    with open(RUTA_PROFESORES, 'w', encoding='utf-8') as f:
-        json.dump(lista, f, ensure_ascii=False, indent=2)
+    escribir_json(RUTA_PROFESORES, lista)
 
 def cargar_profesores():
     """Carga y retorna la lista de profesores desde el archivo JSON."""
-    try:
-        with open(RUTA_PROFESORES, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    return _cargar(RUTA_PROFESORES)
+
+def agregar_profesor(profesor):
+    """
+    Agrega un profesor sin reescribir la lista completa.
+    Lanza ConflictoEdicion (logic/concurrencia.py) si ya existe uno con ese nombre.
+    """
+    obtener_almacen().agregar(RUTA_PROFESORES, profesor, 'nombre')
+
+def eliminar_profesor(nombre, esperado=None):
+    """
+    Elimina un profesor por nombre y actualiza el archivo JSON.
+    Si se indica `esperado` (etiqueta del registro que vio el usuario) y otro
+    usuario lo cambió entretanto, lanza ConflictoEdicion.
+    """
+    obtener_almacen().eliminar(RUTA_PROFESORES, 'nombre', nombre, esperado)
 
-def eliminar_profesor(nombre):
-    """Elimina un profesor por nombre y actualiza el archivo JSON."""
-    profesores = cargar_profesores()
-    profesores = [p for p in profesores if p['nombre'] != nombre]
-    guardar_profesores(profesores)
-
-def actualizar_profesor(nombre, nuevo_profesor):
-    """Actualiza los datos de un profesor identificado por nombre."""
-    profesores = cargar_profesores()
-    for i, p in enumerate(profesores):
-        if p['nombre'] == nombre:
-            profesores[i] = nuevo_profesor
-            break
-    guardar_profesores(profesores)
+def actualizar_profesor(nombre, nuevo_profesor, esperado=None):
+    """Actualiza los datos de un profesor identificado por nombre (ver `esperado` en eliminar_profesor)."""
+    obtener_almacen().reemplazar(RUTA_PROFESORES, 'nombre', nombre, nuevo_profesor, esperado)
 
 # --- Materias ---
 def guardar_materias(lista):
     """Guarda la lista completa de materias en el archivo JSON."""
-    with open(RUTA_MATERIAS, 'w', encoding='utf-8') as f:
-        json.dump(lista, f, ensure_ascii=False, indent=2)
+    escribir_json(RUTA_MATERIAS, lista)
 
 def cargar_materias():
     """Carga y retorna la lista de materias desde el archivo JSON."""
-    try:
-        with open(RUTA_MATERIAS, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    return _cargar(RUTA_MATERIAS)
+
+def agregar_materia(materia):
+    """
+    Agrega una materia sin reescribir la lista completa.
+    Lanza ConflictoEdicion si ya existe una con ese nombre.
+    """
+    obtener_almacen().agregar(RUTA_MATERIAS, materia, 'nombre')
 
-def eliminar_materia(nombre):
+def eliminar_materia(nombre, esperado=None):
     """Elimina una materia por nombre y actualiza el archivo JSON."""
-    materias = cargar_materias()
-    materias = [m for m in materias if m['nombre'] != nombre]
-    guardar_materias(materias)
+    obtener_almacen().eliminar(RUTA_MATERIAS, 'nombre', nombre, esperado)
 
-def actualizar_materia(nombre, nueva_materia):
+def actualizar_materia(nombre, nueva_materia, esperado=None):
     """Actualiza los datos de una materia identificada por nombre."""
-    materias = cargar_materias()
-    for i, m in enumerate(materias):
-        if m['nombre'] == nombre:
-            materias[i] = nueva_materia
-            break
-    guardar_materias(materias)
+    obtener_almacen().reemplazar(RUTA_MATERIAS, 'nombre', nombre, nueva_materia, esperado)
+
+# --- Grilla horaria ---
+def cargar_horarios():
+    """Carga la grilla de franjas horarias (ver logic/franjas.py para su formato)."""
+    return _cargar(RUTA_HORARIOS)
 
 # --- Malla Curricular ---
 def cargar_malla_curricular():
     """Carga y retorna la malla curricular completa desde el archivo JSON."""
-    try:
-        with open(RUTA_MALLA_CURRICULAR, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    return _cargar(RUTA_MALLA_CURRICULAR)
 
 def obtener_materias_por_semestre(semestre):
     """Retorna las materias de un semestre específico."""
-    malla = cargar_malla_curricular()
-    return [m for m in malla if m['semestre'] == semestre]
+    return obtener_almacen().de_semestre(RUTA_MALLA_CURRICULAR, semestre)
 
 def buscar_materia_por_codigo(codigo):
     """Busca una materia por su código y retorna la materia completa."""
-    malla = cargar_malla_curricular()
-    for materia in malla:
-        if materia['codigo'] == codigo:
-            return materia
-    return None
+    return obtener_almacen().buscar_codigo(RUTA_MALLA_CURRICULAR, codigo)
 
 def buscar_materia_por_nombre(nombre):
     """Busca una materia por su nombre y retorna la materia completa."""
-    malla = cargar_malla_curricular()
-    for materia in malla:
-        if materia['nombre'].lower() == nombre.lower():
-            return materia
-    return None 
\ No newline at end of file
+    return obtener_almacen().buscar_nombre(RUTA_MALLA_CURRICULAR, nombre)
@@ -1,11 +1,260 @@
 """
 Reglas de negocio y validaciones para la asignación de horarios.
+
+Las reglas se declaran como datos (Regla) y un Validador las compila una sola
+vez en funciones de verificación especializadas. La validación recorre las
+colecciones por columnas: cada regla se aplica a la columna completa de su
+campo, de modo que validar miles de filas es un puñado de bucles simples.
+Se reportan todos los errores de cada fila, no solo el primero; los campos
+obligatorios faltantes se reportan antes que los demás errores.
 """
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+from logic.franjas import partes_franja
+
+TEXTO = "texto"
+ENTERO = "entero"
+LISTA = "lista"
+
+
+@dataclass(frozen=True)
+class Regla:
+    """
+    Regla declarativa sobre un campo de un registro.
+
+    clase: TEXTO (cadena no vacía), ENTERO (convertible con int) o LISTA
+    Todo campo con regla es obligatorio: un valor ausente o vacío es un error.
+    minimo, maximo: rango permitido para ENTERO
+    falta, tipo, rango: mensajes para campo obligatorio ausente, tipo inválido
+        y valor fuera de rango
+    elementos: Validador que se aplica a cada elemento de una LISTA
+    """
+    campo: str
+    clase: str
+    minimo: Optional[int] = None
+    maximo: Optional[int] = None
+    falta: Optional[str] = None
+    tipo: Optional[str] = None
+    rango: Optional[str] = None
+    elementos: Optional["Validador"] = None
+    etiqueta_elemento: str = "Elemento"
+
+
+def _compilar(regla):
+    """Retorna una función valor -> mensaje de error (o None) especializada para la regla."""
+    tipo = regla.tipo or f"El campo '{regla.campo}' no es válido"
+    rango = regla.rango or tipo
+    minimo, maximo = regla.minimo, regla.maximo
+    if regla.clase == TEXTO:
+        def verificar(valor):
+            return None if isinstance(valor, str) and valor.strip() else tipo
+    elif regla.clase == ENTERO:
+        inferior = float("-inf") if minimo is None else minimo
+        superior = float("inf") if maximo is None else maximo
+
+        def verificar(valor):
+            if type(valor) is not int:
+                try:
+                    valor = int(valor)
+                except (ValueError, TypeError):
+                    return tipo
+            return None if inferior <= valor <= superior else rango
+    elif regla.clase == LISTA:
+        def verificar(valor):
+            return None if isinstance(valor, (list, tuple)) else tipo
+    else:
+        raise ValueError(f"Clase de regla desconocida: {regla.clase}")
+    return verificar
+
+
+class Validador:
+    """Conjunto de reglas compilado para validar colecciones de registros."""
+
+    def __init__(self, reglas, unicos: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            reglas: Secuencia de Regla
+            unicos: {campo: mensaje} para valores que no pueden repetirse en la
+                colección; el mensaje puede usar {valor} y {fila} (la primera aparición)
+        """
+        self.reglas = tuple(reglas)
+        self.unicos = dict(unicos or {})
+        self._compiladas = [(r, _compilar(r)) for r in self.reglas]
+
+    def validar(self, registros) -> List[Tuple[int, str]]:
+        """
+        Valida una colección completa.
+
+        Returns:
+            Lista de (fila, mensaje) con filas contadas desde 1, ordenada por fila
+        """
+        errores = defaultdict(list)
+        if all(map(isinstance, registros, repeat(dict))):
+            indices, filas = range(len(registros)), registros
+        else:
+            indices = []
+            for i, registro in enumerate(registros):
+                if isinstance(registro, dict):
+                    indices.append(i)
+                else:
+                    errores[i].append("La fila no tiene el formato de un registro")
+            filas = [registros[i] for i in indices]
+
+        # Primera pasada: campos obligatorios, columna por columna
+        columnas = {}
+        for regla, _ in self._compiladas:
+            falta = regla.falta or f"El campo '{regla.campo}' es obligatorio"
+            campo = regla.campo
+            valores = [f.get(campo) for f in filas]
+            if all(valores):
+                columnas[campo] = (indices, valores)
+                continue
+            presentes = []
+            for i, valor in zip(indices, valores):
+                if valor:
+                    presentes.append(i)
+                else:
+                    errores[i].append(falta)
+            columnas[campo] = (presentes, [v for v in valores if v])
+
+        # Segunda pasada: tipos, rangos y elementos de las listas
+        for regla, verificar in self._compiladas:
+            presentes, valores = columnas[regla.campo]
+            mensajes = list(map(verificar, valores))
+            if any(mensajes):
+                for i, mensaje in zip(presentes, mensajes):
+                    if mensaje:
+                        errores[i].append(mensaje)
+            if regla.elementos is not None:
+                self._validar_elementos(regla, presentes, valores, errores)
+
+        for campo, mensaje in self.unicos.items():
+            presentes, valores = columnas[campo] if campo in columnas else (indices, [f.get(campo) for f in filas])
+            try:
+                if len(set(valores)) == len(valores):
+                    continue
+            except TypeError:
+                pass
+            vistos = {}
+            for i, valor in zip(presentes, valores):
+                if not isinstance(valor, (str, int)):
+                    continue
+                if valor in vistos:
+                    errores[i].append(mensaje.format(valor=valor, fila=vistos[valor] + 1))
+                else:
+                    vistos[valor] = i
+        return [(i + 1, mensaje) for i in sorted(errores) for mensaje in errores[i]]
+
+    def _validar_elementos(self, regla, presentes, listas, errores):
+        # Todos los elementos de todas las filas se validan en una sola colección
+        duenios = []
+        elementos = []
+        for i, lista in zip(presentes, listas):
+            if isinstance(lista, (list, tuple)):
+                for k, elemento in enumerate(lista, start=1):
+                    duenios.append((i, k))
+                    elementos.append(elemento)
+        for posicion, mensaje in regla.elementos.validar(elementos):
+            i, k = duenios[posicion - 1]
+            errores[i].append(f"{regla.etiqueta_elemento} #{k}: {mensaje}")
+
+    def errores_de(self, registro) -> List[str]:
+        """Mensajes de error de un solo registro."""
+        return [mensaje for _, mensaje in self.validar([registro])]
+
+
+# ---------------- Reglas del dominio ----------------
+MATERIAS = Validador(
+    [
+        Regla("codigo", TEXTO, tipo="El código debe ser una cadena no vacía"),
+        Regla("nombre", TEXTO, tipo="El nombre debe ser una cadena no vacía"),
+        Regla("semestre", ENTERO, minimo=1, maximo=10,
+              tipo="El semestre debe ser un número entero", rango="El semestre debe estar entre 1 y 10"),
+        Regla("horas_semanales", ENTERO, minimo=1,
+              tipo="Las horas semanales deben ser un número entero",
+              rango="Las horas semanales deben ser un número positivo"),
+        Regla("horas_semestrales", ENTERO, minimo=1,
+              tipo="Las horas semestrales deben ser un número entero",
+              rango="Las horas semestrales deben ser un número positivo"),
+    ],
+    unicos={"codigo": "El código '{valor}' se repite en la fila {fila}"},
+)
+
+MATERIAS_DICTADAS = Validador([
+    Regla("nombre", TEXTO, falta="Falta el nombre de la materia",
+          tipo="El nombre de la materia debe ser una cadena no vacía"),
+    Regla("semestre", ENTERO, minimo=1, maximo=12, falta="Falta el semestre de la materia",
+          tipo="El semestre debe ser un número entero", rango="El semestre debe estar entre 1 y 12"),
+    Regla("duracion", ENTERO, minimo=1, falta="Falta la duración de la materia",
+          tipo="La duración debe ser un número entero de horas",
+          rango="La duración debe ser un número positivo"),
+])
+
+PROFESORES = Validador(
+    [
+        Regla("nombre", TEXTO, falta="Falta el nombre del profesor",
+              tipo="El nombre del profesor debe ser una cadena no vacía"),
+        Regla("horarios_disponibles", LISTA, falta="Seleccione al menos un horario disponible",
+              tipo="Los horarios disponibles deben ser una lista"),
+        Regla("materias", LISTA, falta="El profesor debe dictar al menos una materia",
+              tipo="Las materias deben ser una lista", elementos=MATERIAS_DICTADAS,
+              etiqueta_elemento="Materia"),
+    ],
+    unicos={"nombre": "El profesor '{valor}' se repite en la fila {fila}"},
+)
+
+
+def validar_materias(materias) -> List[Tuple[int, str]]:
+    """Valida un catálogo de materias (código, nombre, semestre y horas). Retorna (fila, mensaje)."""
+    return MATERIAS.validar(materias)
+
+
+def validar_materia(materia) -> List[str]:
+    """Valida los datos de una materia del catálogo. Retorna todos los mensajes de error."""
+    return MATERIAS.errores_de(materia)
+
+
+def validar_materia_dictada(materia) -> List[str]:
+    """Valida una materia tal como la dicta un profesor (nombre, semestre y duración)."""
+    return MATERIAS_DICTADAS.errores_de(materia)
+
+
+def validar_profesores(profesores, horarios=None) -> List[Tuple[int, str]]:
+    """
+    Valida una lista de profesores con sus materias. Si se indica la grilla
+    `horarios`, también que cada horario disponible pertenezca a ella.
+    Retorna (fila, mensaje) ordenado por fila.
+    """
+    errores = PROFESORES.validar(profesores)
+    if horarios is not None:
+        grilla = set(horarios)
+        for fila, profesor in enumerate(profesores, start=1):
+            disponibles = profesor.get("horarios_disponibles") if isinstance(profesor, dict) else None
+            if isinstance(disponibles, (list, tuple)):
+                errores.extend(
+                    (fila, f"El horario '{h}' no pertenece a la grilla") for h in disponibles if h not in grilla
+                )
+        errores.sort(key=lambda error: error[0])
+    return errores
+
+
+def validar_profesor(profesor, horarios=None) -> List[str]:
+    """Valida los datos de un profesor. Retorna todos los mensajes de error."""
+    return [mensaje for _, mensaje in validar_profesores([profesor], horarios)]
 
-def validar_profesor(profesor):
-    """Valida los datos de un profesor."""
-    pass
 
-def validar_materia(materia):
-    """Valida los datos de una materia."""
-    pass 
\ No newline at end of file
+def validar_horarios(franjas) -> List[Tuple[int, str]]:
+    """Valida una grilla: cada franja con formato "Día H[:MM]-H[:MM]" y sin repetidas."""
+    errores = []
+    vistas = {}
+    for fila, franja in enumerate(franjas, start=1):
+        if not isinstance(franja, str) or partes_franja(franja) is None:
+            errores.append((fila, f"La franja {franja!r} no tiene el formato 'Día H-H'"))
+        elif franja in vistas:
+            errores.append((fila, f"La franja '{franja}' se repite en la fila {vistas[franja]}"))
+        else:
+            vistas[franja] = fila
+    return errores
@@ -0,0 +1,186 @@
+"""
+Archivo de prueba para verificar los almacenes de datos (JSON y SQLite).
+Este archivo se puede ejecutar independientemente para probar las funciones.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from logic import almacenamiento
+from logic.almacenamiento import AlmacenJSON, AlmacenSQLite, copiar_colecciones
+from logic.concurrencia import ConflictoEdicion, etiqueta
+from logic.diario import escribir_atomico, huella, marcar_compactado, ruta_diario
+
+MATERIAS = [
+    {"codigo": "MAT1", "nombre": "Cálculo", "semestre": 1},
+    {"codigo": "FIS1", "nombre": "Física", "semestre": 1},
+    {"codigo": "PRG2", "nombre": "Programación", "semestre": 2},
+]
+
+
+def test_almacenes_equivalentes():
+    """Ambos almacenes responden igual a lecturas, búsquedas y cambios por fila."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        for almacen in (AlmacenJSON(), AlmacenSQLite(os.path.join(directorio, "datos.db"))):
+            almacen.escribir(ruta, MATERIAS)
+            assert almacen.leer(ruta) == MATERIAS
+            assert almacen.buscar_codigo(ruta, "FIS1") == MATERIAS[1]
+            assert almacen.buscar_nombre(ruta, "CÁLCULO") == MATERIAS[0]
+            assert almacen.de_semestre(ruta, 1) == MATERIAS[:2]
+            version = almacen.version(ruta)
+            assert almacen.reemplazar(ruta, "codigo", "FIS1", dict(MATERIAS[1], semestre=3))
+            assert almacen.eliminar(ruta, "codigo", "MAT1") == 1
+            assert almacen.version(ruta) != version
+            assert [m["codigo"] for m in almacen.leer(ruta)] == ["FIS1", "PRG2"]
+            assert almacen.de_semestre(ruta, 3)[0]["codigo"] == "FIS1"
+
+
+def test_importar_y_exportar():
+    """La migración JSON -> SQLite -> JSON conserva los datos y su orden; el JSON se guarda compacto."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        origen, sqlite = AlmacenJSON(), AlmacenSQLite(os.path.join(directorio, "datos.db"))
+        origen.escribir(ruta, MATERIAS)
+        with open(ruta, encoding="utf-8") as f:
+            assert "\n" not in f.read()
+        assert copiar_colecciones(origen, sqlite, [ruta, "inexistente.json"]) == [ruta]
+        os.remove(ruta)
+        copiar_colecciones(sqlite, AlmacenJSON(legible=True), [ruta])
+        with open(ruta, encoding="utf-8") as f:
+            assert '\n  {\n    "codigo": "MAT1",\n    "nombre": "Cálculo"' in f.read()
+        assert origen.leer(ruta) == MATERIAS
+
+
+def test_diario_y_compactacion():
+    """Los cambios por registro van al diario, se reproducen al releer y se compactan."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        almacen = AlmacenJSON(max_diario=3)
+        almacen.escribir(ruta, MATERIAS)
+        tamano = os.path.getsize(ruta)
+        almacen.eliminar(ruta, "codigo", "MAT1")
+        almacen.agregar(ruta, {"codigo": "QUI1", "nombre": "Química", "semestre": 1})
+        assert os.path.getsize(ruta) == tamano and os.path.exists(ruta_diario(ruta))
+        esperado = [m["codigo"] for m in almacen.leer(ruta)]
+        assert esperado == ["FIS1", "PRG2", "QUI1"]
+        assert [m["codigo"] for m in AlmacenJSON().leer(ruta)] == esperado
+
+        # Una línea truncada por una caída se descarta
+        with open(ruta_diario(ruta), "a", encoding="utf-8") as f:
+            f.write('{"op": "elimi')
+        assert [m["codigo"] for m in AlmacenJSON().leer(ruta)] == esperado
+
+        os.chmod(ruta, 0o644)
+        almacen.compactar(ruta)
+        assert not os.path.exists(ruta_diario(ruta))
+        assert os.stat(ruta).st_mode & 0o777 == 0o644
+        assert [m["codigo"] for m in AlmacenJSON().leer(ruta)] == esperado
+
+
+def test_diario_ante_cambios_externos():
+    """Tocar el archivo conserva el diario; si su contenido cambió por fuera, los cambios pendientes se aplican encima."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        almacen = AlmacenJSON()
+        almacen.escribir(ruta, MATERIAS)
+        almacen.agregar(ruta, {"codigo": "QUI1", "nombre": "Química", "semestre": 1})
+        almacen.reemplazar(ruta, "codigo", "FIS1", dict(MATERIAS[1], semestre=3))
+        esperado = almacen.leer(ruta)
+
+        # Un checkout, un respaldo o `touch` cambian la fecha pero no el contenido
+        os.utime(ruta, ns=(0, 0))
+        assert AlmacenJSON().leer(ruta) == esperado
+        almacen.agregar(ruta, {"codigo": "BIO1", "nombre": "Biología", "semestre": 2})
+        esperado = AlmacenJSON().leer(ruta)
+        assert [m["codigo"] for m in esperado] == ["MAT1", "FIS1", "PRG2", "QUI1", "BIO1"]
+
+        # Otro contenido: el diario se aplica sobre él y se compacta en lugar de perderse
+        escribir_atomico(ruta, MATERIAS[:1])
+        assert [m["codigo"] for m in AlmacenJSON().leer(ruta)] == ["MAT1", "QUI1", "BIO1"]
+        assert not os.path.exists(ruta_diario(ruta))
+
+        # Caída entre el reemplazo del archivo y la eliminación del diario: no se aplica dos veces
+        almacen = AlmacenJSON()
+        almacen.agregar(ruta, {"codigo": "GEO1", "nombre": "Geografía", "semestre": 2})
+        compactado = almacen.leer(ruta)
+        with open(ruta_diario(ruta), "rb") as f:
+            diario = f.read()
+        almacen.compactar(ruta)
+        with open(ruta_diario(ruta), "wb") as f:
+            f.write(diario)
+        with open(ruta, "rb") as f:
+            marcar_compactado(ruta, huella(f.read()))
+        assert AlmacenJSON().leer(ruta) == compactado
+
+
+def test_ediciones_concurrentes():
+    """Una edición sobre una versión vieja se rechaza; las que no chocan se conservan todas."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        for almacen in (AlmacenJSON(), AlmacenSQLite(os.path.join(directorio, "datos.db"))):
+            almacen.escribir(ruta, MATERIAS)
+            vista = etiqueta(MATERIAS[0])
+            assert almacen.reemplazar(ruta, "codigo", "MAT1", dict(MATERIAS[0], semestre=2), esperado=vista)
+            with pytest.raises(ConflictoEdicion):
+                almacen.reemplazar(ruta, "codigo", "MAT1", dict(MATERIAS[0], semestre=5), esperado=vista)
+            with pytest.raises(ConflictoEdicion):
+                almacen.eliminar(ruta, "codigo", "MAT1", esperado=vista)
+            with pytest.raises(ConflictoEdicion):
+                almacen.agregar(ruta, dict(MATERIAS[1]), unico="codigo")
+            assert almacen.buscar_codigo(ruta, "MAT1")["semestre"] == 2
+
+            hilos = [
+                threading.Thread(target=almacen.agregar, args=(ruta, {"codigo": f"N{i}", "nombre": f"N{i}"}, "codigo"))
+                for i in range(8)
+            ]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            assert len(almacen.leer(ruta)) == len(MATERIAS) + 8
+
+
+def test_busquedas_por_nombre_usan_el_indice():
+    """Reemplazar, eliminar y verificar precondiciones por nombre consultan el índice en lugar de recorrer la lista."""
+    lineal = almacenamiento.posicion
+
+    def sin_recorrer_nombres(registros, campo, valor):
+        assert campo != "nombre", "búsqueda lineal por nombre"
+        return lineal(registros, campo, valor)
+
+    profesores = [{"nombre": n, "horarios_disponibles": [], "materias": []} for n in ("Ana", "Luis", "Eva")]
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "profesores.json")
+        for almacen in (AlmacenJSON(), AlmacenSQLite(os.path.join(directorio, "datos.db"))):
+            almacen.escribir(ruta, profesores)
+            almacenamiento.posicion = sin_recorrer_nombres
+            try:
+                nuevo = dict(profesores[1], horarios_disponibles=["Lunes 7-9"])
+                assert almacen.reemplazar(ruta, "nombre", "Luis", nuevo, esperado=etiqueta(profesores[1]))
+                with pytest.raises(ConflictoEdicion):
+                    almacen.eliminar(ruta, "nombre", "Luis", esperado=etiqueta(profesores[1]))
+                with pytest.raises(ConflictoEdicion):
+                    almacen.agregar(ruta, dict(profesores[2]), unico="nombre")
+                assert almacen.eliminar(ruta, "nombre", "Ana") == 1
+                assert almacen.eliminar(ruta, "nombre", "Pedro") == 0
+            finally:
+                almacenamiento.posicion = lineal
+            assert almacen.leer(ruta) == [nuevo, profesores[2]]
+
+
+if __name__ == "__main__":
+    test_almacenes_equivalentes()
+    test_importar_y_exportar()
+    test_diario_y_compactacion()
+    test_diario_ante_cambios_externos()
+    test_ediciones_concurrentes()
+    test_busquedas_por_nombre_usan_el_indice()
+    print("🎉 Todas las pruebas completadas!")
@@ -0,0 +1,379 @@
+"""
+Archivo de prueba para verificar el algoritmo de asignación de horarios.
+Este archivo se puede ejecutar independientemente para probar las funciones.
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic import cli
+from logic.almacenamiento import AlmacenSQLite, configurar_almacen, obtener_almacen
+from logic.asignador import asignar_horarios, reasignar_horarios, resolver_horarios, componentes_independientes
+from logic.escenarios import comparar_escenarios
+from logic.factibilidad import verificar_factibilidad
+from logic.franjas import grilla
+from logic.modelo import cargar_profesores
+from logic.optimizador import evaluar_horario, optimizar_horarios
+
+HORARIOS = [
+    "Lunes 7-9", "Lunes 9-11", "Lunes 11-13", "Lunes 13-15",
+    "Martes 7-9", "Martes 9-11", "Martes 11-13", "Martes 13-15",
+]
+
+
+def _profesor(nombre, horarios, *materias):
+    return {
+        "nombre": nombre,
+        "horarios_disponibles": list(horarios),
+        "materias": [{"nombre": m, "semestre": s, "duracion": d} for m, s, d in materias],
+    }
+
+
+def _verificar(asignaciones, profesores):
+    """Comprueba que la solución cubre todos los bloques sin choques por profesor ni semestre."""
+    usados = set()
+    for a in asignaciones:
+        for clave in (("profesor", a["profesor"], a["horario"]), ("semestre", a["semestre"], a["horario"])):
+            assert clave not in usados, f"Choque de horario: {clave}"
+            usados.add(clave)
+    for prof in profesores:
+        disponibles = set(prof["horarios_disponibles"])
+        for mat in prof["materias"]:
+            bloques = [a for a in asignaciones if a["profesor"] == prof["nombre"] and a["materia"] == mat["nombre"]]
+            assert len(bloques) == (mat["duracion"] + 1) // 2
+            assert all(a["horario"] in disponibles for a in bloques)
+
+
+def test_asignacion_completa():
+    """Todas las materias reciben sus bloques dentro de la disponibilidad."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:4], ("Cálculo", 1, 4), ("Álgebra", 1, 2)),
+        _profesor("Luis", HORARIOS[2:], ("Física", 2, 6)),
+    ]
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert errores == []
+    _verificar(asignaciones, profesores)
+
+
+def test_sin_cruces_entre_profesores_del_mismo_semestre():
+    """Dos profesores del mismo semestre no pueden dictar en la misma franja."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:2], ("Cálculo", 1, 2)),
+        _profesor("Luis", HORARIOS[:1], ("Física", 1, 2)),
+    ]
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert errores == []
+    _verificar(asignaciones, profesores)
+    assert {a["materia"]: a["horario"] for a in asignaciones} == {"Física": "Lunes 7-9", "Cálculo": "Lunes 9-11"}
+
+
+def test_cruce_de_semestre_inevitable():
+    """Si la única forma de cubrir la demanda cruza un semestre se reporta el error."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:1], ("Cálculo", 1, 2)),
+        _profesor("Luis", HORARIOS[:1], ("Física", 1, 2)),
+    ]
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert asignaciones is None
+    assert errores
+
+
+def test_materia_sin_paralelo_choca_con_cada_seccion():
+    """Una materia sin paralelo la cursa todo el semestre: no comparte franja con ninguna sección."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:2], ("Cálculo", 1, 2)),
+        _profesor("Luis", HORARIOS[:2], ("Física", 1, 2)),
+        _profesor("Eva", HORARIOS[:2], ("Química", 1, 2)),
+    ]
+    profesores[1]["materias"][0]["paralelo"] = "B"
+    profesores[2]["materias"][0]["paralelo"] = "C"
+    assert componentes_independientes(profesores) == [[0, 1, 2]]
+    assert componentes_independientes(profesores[1:]) == [[0], [1]]
+
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert errores == []
+    mejoradas, _ = optimizar_horarios(asignaciones, profesores, HORARIOS, iteraciones=500)
+    for resultado in (asignaciones, mejoradas):
+        franja = {a["materia"]: a["horario"] for a in resultado}
+        # Las secciones B y C pueden coincidir entre sí, pero no con Cálculo
+        assert franja["Física"] == franja["Química"] != franja["Cálculo"]
+
+    profesores[1]["horarios_disponibles"] = HORARIOS[:1]
+    profesores[0]["horarios_disponibles"] = HORARIOS[:1]
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert asignaciones is None and errores
+
+
+def test_factibilidad_detecta_semestre_sobresuscrito():
+    """El flujo máximo detecta choques que el conteo de franjas no ve."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:1], ("Cálculo", 1, 2)),
+        _profesor("Luis", HORARIOS[:1], ("Física", 1, 2)),
+        _profesor("Eva", HORARIOS[1:3], ("Química", 1, 2)),
+    ]
+    errores = verificar_factibilidad(profesores, HORARIOS)
+    assert len(errores) == 1
+    assert "Ana" in errores[0] and "Luis" in errores[0] and "Eva" not in errores[0]
+    assert asignar_horarios(profesores, HORARIOS) == (None, errores)
+
+
+def test_bloques_insuficientes():
+    """Si la demanda excede la disponibilidad se reporta el error."""
+    profesores = [_profesor("Ana", HORARIOS[:2], ("Cálculo", 1, 4), ("Álgebra", 1, 2))]
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert asignaciones is None
+    assert errores
+
+
+def test_horarios_fuera_de_la_grilla():
+    """Las franjas que no pertenecen a la grilla base se ignoran."""
+    profesores = [_profesor("Ana", ["Sábado 7-9", "Lunes 7-9"], ("Cálculo", 1, 2))]
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert errores == []
+    assert [a["horario"] for a in asignaciones] == ["Lunes 7-9"]
+
+
+def test_componentes_independientes():
+    """Solo los profesores que comparten semestre quedan en la misma componente."""
+    profesores = [
+        _profesor("Ana", HORARIOS, ("Cálculo", 1, 2)),
+        _profesor("Luis", HORARIOS, ("Física", 2, 2)),
+        _profesor("Eva", HORARIOS, ("Química", 1, 2), ("Biología", 3, 2)),
+        _profesor("Raúl", HORARIOS, ("Historia", 3, 2)),
+    ]
+    assert componentes_independientes(profesores) == [[0, 2, 3], [1]]
+    secuencial, _ = asignar_horarios(profesores, HORARIOS, procesos=1)
+    paralelo, _ = asignar_horarios(profesores, HORARIOS, procesos=2)
+    assert secuencial == paralelo
+    assert [a["profesor"] for a in secuencial] == ["Ana", "Luis", "Eva", "Eva", "Raúl"]
+
+
+def test_limite_de_tiempo_y_progreso():
+    """Con límite de tiempo se reporta el progreso y se conserva el mejor parcial."""
+    profesores = [
+        _profesor("Ana", HORARIOS, ("Cálculo", 1, 4)),
+        _profesor("Luis", HORARIOS, ("Física", 1, 4)),
+    ]
+    reportes = []
+    resultado = resolver_horarios(profesores, HORARIOS, limite_tiempo=30, progreso=reportes.append)
+    assert resultado.completo and not resultado.agotado
+    assert reportes[-1]["colocados"] == reportes[-1]["total"] == 4
+
+    resultado = resolver_horarios(profesores, HORARIOS, limite_tiempo=0)
+    assert resultado.agotado and not resultado.completo
+    assert resultado.bloques_pendientes == 4
+    assert resultado.errores
+
+
+def test_optimizacion_conserva_factibilidad_y_mejora():
+    """La optimización no empeora el costo ni rompe las restricciones."""
+    profesores = [
+        _profesor("Ana", HORARIOS, ("Cálculo", 1, 4), ("Álgebra", 1, 2)),
+        _profesor("Luis", HORARIOS, ("Física", 1, 4)),
+    ]
+    asignaciones, _ = asignar_horarios(profesores, HORARIOS)
+    mejoradas, resumen = optimizar_horarios(asignaciones, profesores, HORARIOS, iteraciones=2000)
+    _verificar(mejoradas, profesores)
+    assert resumen["costo_final"] <= resumen["costo_inicial"]
+    assert abs(evaluar_horario(mejoradas, profesores, HORARIOS)["costo"] - resumen["costo_final"]) < 1e-6
+
+
+def test_estadisticas_opcionales():
+    """Las estadísticas solo se retornan cuando se piden."""
+    profesores = [_profesor("Ana", HORARIOS, ("Cálculo", 1, 4)), _profesor("Luis", HORARIOS, ("Física", 2, 2))]
+    assert len(asignar_horarios(profesores, HORARIOS)) == 2
+    asignaciones, errores, stats = asignar_horarios(profesores, HORARIOS, estadisticas=True)
+    assert errores == [] and len(asignaciones) == 3
+    assert stats.componentes == 2
+    assert stats.nodos >= 3
+    assert stats.picos["profundidad"] == 2
+    assert set(stats.tiempos) >= {"carga", "presolve", "busqueda", "postproceso", "total"}
+
+
+def test_reasignacion_incremental_conserva_lo_no_afectado():
+    """Editar un profesor solo mueve sus bloques; los demás conservan sus franjas."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:4], ("Cálculo", 1, 4)),
+        _profesor("Luis", HORARIOS, ("Física", 2, 4)),
+        _profesor("Eva", HORARIOS, ("Química", 1, 2)),
+    ]
+    anteriores, _ = asignar_horarios(profesores, HORARIOS)
+    profesores[0] = _profesor("Ana", HORARIOS[2:6], ("Cálculo", 1, 4))
+    resultado = reasignar_horarios(profesores, HORARIOS, anteriores, {"profesores": ["Ana"]}, estadisticas=True)
+    asignaciones, errores = resultado.asignaciones, resultado.errores
+    assert resultado.completo and errores == [] and resultado.estadisticas.nodos > 0
+    _verificar(asignaciones, profesores)
+    for a in anteriores:
+        if a["profesor"] == "Luis":
+            assert a in asignaciones
+
+
+def test_reasignacion_respeta_el_limite_de_tiempo():
+    """Un recálculo tras una edición también se detiene al agotar el tiempo y conserva lo no afectado."""
+    profesores = [
+        _profesor("Ana", HORARIOS, ("Cálculo", 1, 4)),
+        _profesor("Luis", HORARIOS, ("Física", 2, 4)),
+    ]
+    anteriores, _ = asignar_horarios(profesores, HORARIOS)
+    profesores[0] = _profesor("Ana", HORARIOS[4:], ("Cálculo", 1, 4))
+    reportes = []
+    resultado = reasignar_horarios(profesores, HORARIOS, anteriores, {"profesores": ["Ana"]},
+                                   limite_tiempo=0, progreso=reportes.append)
+    assert resultado.agotado and not resultado.completo
+    assert resultado.bloques_pendientes == 2
+    assert {a["profesor"] for a in resultado.asignaciones} == {"Luis"}
+    assert resultado.errores[0].startswith("Tiempo agotado")
+
+    resultado = reasignar_horarios(profesores, HORARIOS, anteriores, {"profesores": ["Ana"]},
+                                   limite_tiempo=30, progreso=reportes.append)
+    assert resultado.completo and not resultado.agotado
+    assert reportes[-1]["colocados"] == reportes[-1]["total"] == 4
+
+
+def test_modelo_se_carga_una_vez_y_valida():
+    """Los profesores se convierten una vez; los datos inválidos dan un error claro."""
+    profesores = [
+        _profesor("Ana", HORARIOS, ("Cálculo", 1, 4)),
+        _profesor("Luis", HORARIOS, ("Cálculo", 1, 4)),
+    ]
+    modelo = cargar_profesores(profesores)
+    assert cargar_profesores(modelo) == modelo
+    assert modelo[0].materias[0] is modelo[1].materias[0]
+    assert asignar_horarios(modelo, HORARIOS) == asignar_horarios(profesores, HORARIOS)
+
+    profesores[1]["materias"][0]["duracion"] = "cuatro"
+    asignaciones, errores = asignar_horarios(profesores, HORARIOS)
+    assert asignaciones is None and "Duración inválida" in errores[0]
+
+
+def test_grilla_con_franjas_superpuestas():
+    """Franjas de distinta duración que se superponen no se asignan a la vez."""
+    horarios = ["Lunes 7-9", "Lunes 8-10", "Lunes 9-11", "Sábado 8:30-11:30", "Jueves 18-21"]
+    indice = grilla(horarios)
+    assert grilla(list(horarios)) is indice
+    assert not indice.disjunta and indice.franjas_de(indice.solapes[1]) == horarios[:3]
+    assert indice.franjas_de(indice.contiguas[0]) == ["Lunes 9-11"]
+    assert indice.horas("Sábado 8:30-11:30") == 3 and indice.bloques_para(4) == 2
+
+    profesores = [
+        _profesor("Ana", horarios[:3], ("Cálculo", 1, 4)),
+        _profesor("Luis", horarios[1:2] + horarios[3:], ("Física", 2, 4)),
+    ]
+    asignaciones, errores = asignar_horarios(profesores, horarios)
+    assert errores == []
+    assert sorted(a["horario"] for a in asignaciones if a["profesor"] == "Ana") == ["Lunes 7-9", "Lunes 9-11"]
+    profesores.append(_profesor("Eva", ["Lunes 8-10"], ("Química", 1, 2)))
+    assert asignar_horarios(profesores, horarios)[0] is None
+
+
+def test_linea_de_comandos():
+    """La ejecución sin interfaz escribe asignaciones y carga, y el código de salida refleja la factibilidad."""
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = {n: os.path.join(directorio, f"{n}.json") for n in ("profesores", "horarios", "salida")}
+        profesores = [
+            _profesor("Ana", HORARIOS[:4], ("Cálculo", 1, 4)),
+            _profesor("Luis", HORARIOS[2:], ("Física", 2, 2)),
+        ]
+        for nombre, datos in (("profesores", profesores), ("horarios", HORARIOS)):
+            with open(rutas[nombre], "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+        argumentos = ["--profesores", rutas["profesores"], "--horarios", rutas["horarios"]]
+
+        assert cli.main(argumentos + ["--salida", rutas["salida"]]) == cli.SALIDA_COMPLETA
+        with open(rutas["salida"], encoding="utf-8") as f:
+            informe = json.load(f)
+        _verificar(informe["asignaciones"], profesores)
+        assert informe["carga"] == [
+            {"profesor": "Ana", "bloques": 2, "horas": 4.0},
+            {"profesor": "Luis", "bloques": 1, "horas": 2.0},
+        ]
+
+        salida_csv = os.path.join(directorio, "horario.csv")
+        assert cli.main(argumentos + ["--formato", "csv", "--salida", salida_csv, "--sin-optimizar"]) == 0
+        with open(os.path.join(directorio, "horario_carga.csv"), encoding="utf-8") as f:
+            assert [fila["bloques"] for fila in csv.DictReader(f)] == ["2", "1"]
+
+        with open(rutas["profesores"], "w", encoding="utf-8") as f:
+            json.dump(profesores + [_profesor("Eva", HORARIOS[:1], ("Química", 1, 6))], f)
+        assert cli.main(argumentos + ["--salida", rutas["salida"]]) == cli.SALIDA_INFACTIBLE
+        catalogo = os.path.join(directorio, "materias.json")
+        with open(catalogo, "w", encoding="utf-8") as f:
+            json.dump([{"codigo": "MAT1", "nombre": "Cálculo", "semestre": 1}], f)
+        assert cli.main(argumentos + ["--materias", catalogo]) == cli.SALIDA_DATOS_INVALIDOS
+
+
+def test_linea_de_comandos_con_sqlite():
+    """Con SQLite activo, las rutas explícitas se leen como archivos y sin ellas se usan las colecciones."""
+    anterior = obtener_almacen()
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenSQLite(os.path.join(directorio, "horarios.db"))
+        configurar_almacen(almacen)
+        try:
+            profesores = [_profesor("Ana", HORARIOS[:4], ("Cálculo", 1, 4))]
+            rutas = {n: os.path.join(directorio, f"{n}.json") for n in ("profesores", "horarios")}
+            for nombre, datos in (("profesores", profesores), ("horarios", HORARIOS)):
+                with open(rutas[nombre], "w", encoding="utf-8") as f:
+                    json.dump(datos, f)
+            salida = os.path.join(directorio, "salida.json")
+            argumentos = ["--profesores", rutas["profesores"], "--horarios", rutas["horarios"], "--salida", salida]
+            assert cli.main(argumentos) == cli.SALIDA_COMPLETA
+
+            almacen.escribir(cli.RUTA_PROFESORES, profesores + [_profesor("Luis", HORARIOS[2:], ("Física", 2, 2))])
+            almacen.escribir(cli.RUTA_HORARIOS, HORARIOS)
+            assert cli.main(["--salida", salida]) == cli.SALIDA_COMPLETA
+            with open(salida, encoding="utf-8") as f:
+                assert {a["profesor"] for a in json.load(f)["asignaciones"]} == {"Ana", "Luis"}
+        finally:
+            configurar_almacen(anterior)
+
+
+def test_escenarios_en_paralelo():
+    """Cada escenario aplica sus cambios sobre la base; el resultado no depende del número de procesos."""
+    profesores = [
+        _profesor("Ana", HORARIOS[:4], ("Cálculo", 1, 4)),
+        _profesor("Luis", HORARIOS[2:], ("Física", 2, 2)),
+    ]
+    escenarios = [
+        {"nombre": "Ana sin lunes temprano", "cambios": [
+            {"op": "quitar_horarios", "profesor": "Ana", "horarios": HORARIOS[:3]},
+        ]},
+        {"nombre": "Nueva sección", "cambios": [
+            {"op": "agregar_materia", "profesor": "Luis", "materia": {"nombre": "Física", "semestre": 2, "duracion": 2, "paralelo": "B"}},
+        ]},
+        {"nombre": "Profesor inexistente", "cambios": [{"op": "quitar_profesor", "profesor": "Eva"}]},
+    ]
+    filas = comparar_escenarios(profesores, HORARIOS, escenarios, procesos=1)
+    assert [f["escenario"] for f in filas] == ["Base"] + [e["nombre"] for e in escenarios]
+    assert [f["factible"] for f in filas] == [True, False, True, False]
+    assert filas[1]["bloques_pendientes"] > 0 and filas[2]["bloques_asignados"] == 4
+    assert filas[0]["costo"] is not None and filas[3]["errores"]
+    assert len(profesores[0]["horarios_disponibles"]) == 4
+    assert comparar_escenarios(profesores, HORARIOS, escenarios, procesos=2) == filas
+
+
+if __name__ == "__main__":
+    test_asignacion_completa()
+    test_sin_cruces_entre_profesores_del_mismo_semestre()
+    test_cruce_de_semestre_inevitable()
+    test_materia_sin_paralelo_choca_con_cada_seccion()
+    test_factibilidad_detecta_semestre_sobresuscrito()
+    test_bloques_insuficientes()
+    test_horarios_fuera_de_la_grilla()
+    test_componentes_independientes()
+    test_limite_de_tiempo_y_progreso()
+    test_optimizacion_conserva_factibilidad_y_mejora()
+    test_estadisticas_opcionales()
+    test_reasignacion_incremental_conserva_lo_no_afectado()
+    test_reasignacion_respeta_el_limite_de_tiempo()
+    test_modelo_se_carga_una_vez_y_valida()
+    test_grilla_con_franjas_superpuestas()
+    test_linea_de_comandos()
+    test_linea_de_comandos_con_sqlite()
+    test_escenarios_en_paralelo()
+    print("🎉 Todas las pruebas completadas!")
@@ -0,0 +1,75 @@
+"""
+Archivo de prueba para verificar la caché de resultados y las instantáneas de datos.
+Este archivo se puede ejecutar independientemente para probar las funciones.
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.asignador import resolver_horarios
+from logic import cache as modulo_cache
+from logic.cache import CacheResultados, clave_contenido
+from logic.instantaneas import leer_instantanea
+from logic.utils import escribir_json
+
+HORARIOS = ["Lunes 7-9", "Lunes 9-11", "Martes 7-9", "Martes 9-11"]
+PROFESORES = [{
+    "nombre": "Ana",
+    "horarios_disponibles": HORARIOS,
+    "materias": [{"nombre": "Cálculo", "semestre": 1, "duracion": 4}],
+}]
+
+
+def test_clave_canonica():
+    """La clave no depende del orden de las claves y cambia con los datos, las opciones o la versión."""
+    clave = clave_contenido(PROFESORES, HORARIOS, optimizar=True)
+    reordenado = [{k: PROFESORES[0][k] for k in reversed(list(PROFESORES[0]))}]
+    assert clave_contenido(reordenado, HORARIOS, optimizar=True) == clave
+    assert clave_contenido(PROFESORES, HORARIOS, optimizar=False) != clave
+    assert clave_contenido(PROFESORES, HORARIOS[:3], optimizar=True) != clave
+    modulo_cache.VERSION += 1
+    try:
+        assert clave_contenido(PROFESORES, HORARIOS, optimizar=True) != clave
+    finally:
+        modulo_cache.VERSION -= 1
+
+
+def test_niveles_memoria_y_disco():
+    """Un resultado guardado sobrevive al descarte de memoria y el disco respeta su tamaño."""
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheResultados(directorio, max_memoria=1)
+        resultado = resolver_horarios(PROFESORES, HORARIOS)
+        cache.guardar("a", resultado)
+        cache.guardar("b", {"otro": 1})
+        assert list(cache._memoria) == ["b"]
+        recuperado = cache.obtener("a")
+        assert recuperado == resultado and recuperado is not resultado
+        assert cache.obtener("inexistente") is None
+
+        pequena = CacheResultados(directorio, max_bytes_disco=1)
+        pequena.guardar("c", resultado)
+        assert not [n for n in os.listdir(directorio) if n.endswith(".pkl")]
+        assert pequena.obtener("c") == resultado
+
+
+def test_instantanea_compartida_hasta_que_cambia_el_archivo():
+    """Dos lecturas comparten el mismo objeto; escribir el archivo produce una nueva instantánea."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "datos.json")
+        escribir_json(ruta, PROFESORES)
+        primera = leer_instantanea(ruta)
+        assert leer_instantanea(ruta) is primera
+        escribir_json(ruta, PROFESORES + PROFESORES)
+        segunda = leer_instantanea(ruta)
+        assert segunda is not primera and len(segunda) == 2
+
+
+if __name__ == "__main__":
+    test_clave_canonica()
+    test_niveles_memoria_y_disco()
+    test_instantanea_compartida_hasta_que_cambia_el_archivo()
+    print("🎉 Todas las pruebas completadas!")
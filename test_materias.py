@@ -5,11 +5,14 @@ Este archivo se puede ejecutar independientemente para probar las funciones.
 
 import sys
 import os
+import subprocess
+import tempfile
 
 # Agregar el directorio actual al path para importar módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from logic.materias_manager import MateriasManager
+from logic.utils import escribir_json
 
 
 def test_materias_manager():
@@ -82,15 +85,110 @@ def test_materias_manager():
     success, message = manager.delete_materia('TEST001')
     print(f"   Resultado: {success} - {message}")
     
-    # Limpiar archivo de prueba
+    # Limpiar archivo de prueba y su diario de cambios
     try:
         os.remove("test_materias.json")
         print("\n✅ Archivo de prueba eliminado")
     except FileNotFoundError:
         pass
+    for sufijo in (".diario", ".lock"):
+        if os.path.exists("test_materias.json" + sufijo):
+            os.remove("test_materias.json" + sufijo)
     
     print("\n🎉 Todas las pruebas completadas!")
 
 
+def test_operaciones_en_lote():
+    """Las operaciones en lote validan todas las filas y guardan todo o nada."""
+    with tempfile.TemporaryDirectory() as directorio:
+        manager = MateriasManager(os.path.join(directorio, "materias.json"))
+        csv_materias = (
+            "codigo,nombre,semestre,horas_semanales,horas_semestrales\n"
+            "MAT1,Cálculo,1,4,64\n"
+            "FIS1,Física,11,4,64\n"
+            "MAT1,Álgebra,1,4,64\n"
+        )
+        success, _, errores = manager.import_csv(csv_materias)
+        assert not success and [fila for fila, _ in errores] == [2, 3]
+        assert manager.load_materias() == []
+
+        success, _, errores = manager.import_csv(csv_materias.replace(",11,", ",2,").replace("MAT1,Á", "ALG1,Á"))
+        assert success and errores == []
+        assert manager.get_all_codigos() == ["MAT1", "FIS1", "ALG1"]
+
+        success, _, _ = manager.update_many({
+            "MAT1": dict(manager.get_materia_by_codigo("MAT1"), semestre=3),
+            "FIS1": dict(manager.get_materia_by_codigo("FIS1"), codigo="FIS2"),
+        })
+        assert success and [m["codigo"] for m in manager.get_materias_by_semestre(3)] == ["MAT1"]
+
+        success, _, errores = manager.delete_many(["ALG1", "NOEXISTE"])
+        assert not success and errores[0][0] == 2
+        assert manager.delete_many(["ALG1", "FIS2"])[0]
+        assert MateriasManager(manager.file_path).get_all_codigos() == ["MAT1"]
+
+
+def test_indice_consistente():
+    """El índice en memoria sigue a las altas, cambios y bajas, y a las escrituras externas del archivo."""
+    def materia(codigo, nombre, semestre):
+        return {"codigo": codigo, "nombre": nombre, "semestre": semestre,
+                "horas_semanales": 4, "horas_semestrales": 64}
+
+    def codigos(materias):
+        return [m["codigo"] for m in materias]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        manager = MateriasManager(ruta)
+        assert manager.add_materia(materia("MAT1", "Cálculo", 1))[0]
+        assert manager.add_materia(materia("FIS1", "Física", 1))[0]
+        assert codigos(manager.get_materias_by_semestre(1)) == ["MAT1", "FIS1"]
+
+        assert manager.update_materia("MAT1", materia("MAT2", "Cálculo II", 2))[0]
+        assert manager.get_materia_by_codigo("MAT1") is None
+        assert manager.get_materia_by_codigo("MAT2")["nombre"] == "Cálculo II"
+        assert codigos(manager.get_materias_by_semestre(1)) == ["FIS1"]
+        assert codigos(manager.get_materias_by_semestre(2)) == ["MAT2"]
+        assert not manager.add_materia(materia("MAT2", "Otra", 3))[0]
+        assert manager.add_materia(materia("MAT1", "Cálculo", 1))[0]
+
+        assert manager.delete_materia("FIS1")[0]
+        assert manager.get_materia_by_codigo("FIS1") is None
+        assert codigos(manager.get_materias_by_semestre(1)) == ["MAT1"]
+        assert manager.get_all_codigos() == ["MAT2", "MAT1"]
+
+        # Otro gestor y una escritura directa del archivo cambian los datos por fuera
+        otro = MateriasManager(ruta)
+        assert otro.add_materia(materia("QUI1", "Química", 1))[0]
+        assert manager.get_materia_by_codigo("QUI1")["nombre"] == "Química"
+        assert codigos(manager.get_materias_by_semestre(1)) == ["MAT1", "QUI1"]
+
+        escribir_json(ruta, [materia("BIO1", "Biología", 3)])
+        assert manager.get_materia_by_codigo("MAT1") is None
+        assert manager.get_materias_by_semestre(1) == []
+        assert codigos(manager.get_materias_by_semestre(3)) == ["BIO1"]
+        assert manager.update_materia("BIO1", materia("BIO1", "Biología I", 3))[0]
+        assert MateriasManager(ruta).get_materia_by_codigo("BIO1")["nombre"] == "Biología I"
+
+
+def test_errores_sin_streamlit():
+    """La lógica no importa Streamlit; los errores de carga quedan en el gestor."""
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    codigo = "import sys, logic.materias_manager, logic.asignador, logic.utils; print('streamlit' in sys.modules)"
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == "False"
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("[{")
+        manager = MateriasManager(ruta)
+        assert manager.load_materias() == []
+        assert manager.error_carga.startswith("Error al cargar materias")
+
+
 if __name__ == "__main__":
-    test_materias_manager() 
\ No newline at end of file
+    test_materias_manager()
+    test_operaciones_en_lote()
+    test_indice_consistente()
+    test_errores_sin_streamlit()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Archivo de prueba para verificar el repositorio en memoria y sus índices.
+Este archivo se puede ejecutar independientemente para probar las funciones.
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.repositorio import Repositorio
+from logic.utils import escribir_json
+
+MATERIAS = [
+    {"codigo": "MAT1", "nombre": "Cálculo I", "semestre": 1, "duracion": 4},
+    {"codigo": "FIS1", "nombre": "Física I", "semestre": 1, "duracion": 4},
+    {"codigo": "MAT2", "nombre": "Cálculo II", "semestre": 2, "duracion": 4},
+    {"codigo": "MAT1", "nombre": "Cálculo I repetida", "semestre": 3, "duracion": 2},
+]
+PROFESORES = [
+    {"nombre": "Ana", "horarios_disponibles": ["Lunes 7-9"], "materias": []},
+    {"nombre": "Luis", "horarios_disponibles": ["Martes 7-9"], "materias": []},
+]
+
+
+def test_busquedas_de_materias():
+    """Búsqueda por código, por nombre sin distinguir mayúsculas y por semestre."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        escribir_json(ruta, MATERIAS)
+        indice = Repositorio().materias(ruta)
+        assert indice.buscar_codigo("FIS1")["nombre"] == "Física I"
+        # Ante códigos repetidos gana la primera aparición
+        assert indice.buscar_codigo("MAT1")["semestre"] == 1
+        assert indice.buscar_codigo("QUI1") is None
+        assert indice.buscar_nombre("cálculo ii")["codigo"] == "MAT2"
+        assert indice.buscar_nombre("CÁLCULO I")["semestre"] == 1
+        assert indice.buscar_nombre("Química") is None
+        assert [m["codigo"] for m in indice.de_semestre(1)] == ["MAT1", "FIS1"]
+        assert indice.de_semestre(9) == []
+        # de_semestre entrega una copia: modificarla no altera el índice
+        indice.de_semestre(1).clear()
+        assert len(indice.de_semestre(1)) == 2
+
+        assert Repositorio().materias(os.path.join(directorio, "inexistente.json")).buscar_codigo("MAT1") is None
+
+
+def test_busqueda_de_profesores():
+    """Los profesores se encuentran por nombre exacto."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "profesores.json")
+        escribir_json(ruta, PROFESORES)
+        indice = Repositorio().profesores(ruta)
+        assert indice.buscar("Luis")["horarios_disponibles"] == ["Martes 7-9"]
+        assert indice.buscar("ana") is None
+
+
+def test_indice_se_reconstruye_al_escribir():
+    """El índice se reutiliza mientras el archivo no cambia y se reconstruye tras escribir_json."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "materias.json")
+        escribir_json(ruta, MATERIAS)
+        repositorio = Repositorio()
+        primero = repositorio.materias(ruta)
+        assert repositorio.materias(ruta) is primero
+
+        escribir_json(ruta, MATERIAS[1:] + [{"codigo": "QUI1", "nombre": "Química", "semestre": 2, "duracion": 2}])
+        segundo = repositorio.materias(ruta)
+        assert segundo is not primero
+        assert segundo.buscar_codigo("QUI1")["nombre"] == "Química"
+        assert segundo.buscar_codigo("MAT1")["semestre"] == 3
+        assert segundo.buscar_nombre("Cálculo I") is None
+        assert [m["codigo"] for m in segundo.de_semestre(2)] == ["MAT2", "QUI1"]
+
+
+if __name__ == "__main__":
+    test_busquedas_de_materias()
+    test_busqueda_de_profesores()
+    test_indice_se_reconstruye_al_escribir()
+    print("🎉 Todas las pruebas completadas!")
@@ -0,0 +1,65 @@
+"""
+Archivo de prueba para verificar el motor de validaciones.
+Este archivo se puede ejecutar independientemente para probar las funciones.
+"""
+
+import sys
+import os
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logic.validaciones import validar_horarios, validar_materia, validar_materias, validar_profesores
+
+
+def test_todos_los_errores_por_fila():
+    """Se reportan todos los errores de cada fila, los obligatorios primero."""
+    errores = validar_materia({
+        'codigo': '',
+        'nombre': 'Materia Inválida',
+        'semestre': 15,
+        'horas_semanales': -5,
+        'horas_semestrales': 0,
+    })
+    assert errores == [
+        "El campo 'codigo' es obligatorio",
+        "El campo 'horas_semestrales' es obligatorio",
+        "El semestre debe estar entre 1 y 10",
+        "Las horas semanales deben ser un número positivo",
+    ]
+    valida = {'codigo': 'MAT1', 'nombre': 'Cálculo', 'semestre': '1', 'horas_semanales': 4, 'horas_semestrales': 64}
+    assert validar_materias([valida, dict(valida), "no es un registro"]) == [
+        (2, "El código 'MAT1' se repite en la fila 1"),
+        (3, "La fila no tiene el formato de un registro"),
+    ]
+
+
+def test_profesores_y_grilla():
+    """Las materias de cada profesor y sus horarios se validan en la misma pasada."""
+    profesores = [
+        {"nombre": "Ana", "horarios_disponibles": ["Lunes 7-9"], "materias": [{"nombre": "Cálculo", "semestre": 1, "duracion": 4}]},
+        {"nombre": "Luis", "horarios_disponibles": ["Sábado 7-9"], "materias": [
+            {"nombre": "Física", "semestre": 1, "duracion": 2},
+            {"nombre": "", "semestre": 20, "duracion": "dos"},
+        ]},
+        {"nombre": "Ana", "horarios_disponibles": [], "materias": []},
+    ]
+    assert validar_profesores(profesores, ["Lunes 7-9"]) == [
+        (2, "Materia #2: Falta el nombre de la materia"),
+        (2, "Materia #2: El semestre debe estar entre 1 y 12"),
+        (2, "Materia #2: La duración debe ser un número entero de horas"),
+        (2, "El horario 'Sábado 7-9' no pertenece a la grilla"),
+        (3, "Seleccione al menos un horario disponible"),
+        (3, "El profesor debe dictar al menos una materia"),
+        (3, "El profesor 'Ana' se repite en la fila 1"),
+    ]
+    assert validar_horarios(["Lunes 7-9", "Sábado 8:30-10", "Lunes 7-9", "Tarde"]) == [
+        (3, "La franja 'Lunes 7-9' se repite en la fila 1"),
+        (4, "La franja 'Tarde' no tiene el formato 'Día H-H'"),
+    ]
+
+
+if __name__ == "__main__":
+    test_todos_los_errores_por_fila()
+    test_profesores_y_grilla()
+    print("🎉 Todas las pruebas completadas!")
@@ -0,0 +1,158 @@
+"""
+Módulo de interfaz de usuario para comparar escenarios hipotéticos.
+Permite armar escenarios con cambios sobre los datos actuales ("¿y si el
+profesor X pierde dos franjas?", "¿y si abrimos otra sección?") y resolverlos
+todos en paralelo en una tabla comparativa.
+"""
+
+import streamlit as st
+import pandas as pd
+from logic import utils
+from logic.escenarios import comparar_escenarios
+from logic.validaciones import validar_materia_dictada
+
+TIPOS_CAMBIO = {
+    "Quitar horarios a un profesor": "quitar_horarios",
+    "Agregar horarios a un profesor": "agregar_horarios",
+    "Agregar una materia o sección": "agregar_materia",
+    "Quitar una materia": "quitar_materia",
+    "Quitar un profesor": "quitar_profesor",
+    "Quitar franjas de la grilla": "quitar_franjas",
+}
+
+
+def render_escenarios_section():
+    """
+    Renderiza la sección de escenarios: editor de cambios, lista de escenarios
+    y tabla comparativa.
+    """
+    st.subheader("🔀 Comparar escenarios")
+    profesores = utils.cargar_profesores()
+    horarios = utils.cargar_horarios()
+    if not profesores:
+        st.info("Debe registrar al menos un profesor para comparar escenarios.")
+        return
+
+    escenarios = st.session_state.setdefault("escenarios", [])
+    cambios = st.session_state.setdefault("cambios_escenario", [])
+
+    render_editor_cambio(profesores, horarios, cambios)
+
+    nombre = st.text_input("Nombre del escenario", value=f"Escenario {len(escenarios) + 1}", key="nombre_escenario")
+    if st.button("Guardar escenario", disabled=not cambios):
+        escenarios.append({"nombre": nombre, "cambios": list(cambios)})
+        cambios.clear()
+        st.rerun()
+
+    if escenarios:
+        st.markdown("#### Escenarios a comparar")
+        for i, escenario in enumerate(escenarios):
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                st.markdown(f"**{escenario['nombre']}**: " + "; ".join(describir_cambio(c) for c in escenario["cambios"]))
+            with col2:
+                if st.button("Quitar", key=f"quitar_escenario_{i}"):
+                    escenarios.pop(i)
+                    st.rerun()
+
+    limite = st.number_input("Tiempo máximo por escenario (segundos)", min_value=1, max_value=600, value=30, step=1,
+                             key="limite_escenarios")
+    if escenarios and st.button("Comparar escenarios", type="primary"):
+        with st.spinner(f"Resolviendo {len(escenarios) + 1} escenarios..."):
+            st.session_state["comparacion_escenarios"] = comparar_escenarios(
+                profesores, horarios, escenarios, limite_tiempo=limite
+            )
+    filas = st.session_state.get("comparacion_escenarios")
+    if filas:
+        mostrar_comparacion(filas)
+
+
+def render_editor_cambio(profesores, horarios, cambios):
+    """Formulario para agregar un cambio al escenario en edición."""
+    st.markdown("#### Cambios del escenario")
+    tipo = TIPOS_CAMBIO[st.selectbox("Tipo de cambio", list(TIPOS_CAMBIO), key="tipo_cambio")]
+    nombres = [p["nombre"] for p in profesores]
+    cambio = {"op": tipo}
+    if tipo == "quitar_franjas":
+        cambio["horarios"] = st.multiselect("Franjas", horarios, key="franjas_cambio")
+        completo = bool(cambio["horarios"])
+    else:
+        cambio["profesor"] = st.selectbox("Profesor", nombres, key="profesor_cambio")
+        profesor = profesores[nombres.index(cambio["profesor"])]
+        completo = True
+        if tipo == "quitar_horarios":
+            cambio["horarios"] = st.multiselect("Horarios a quitar", profesor["horarios_disponibles"], key="horarios_cambio")
+            completo = bool(cambio["horarios"])
+        elif tipo == "agregar_horarios":
+            libres = [h for h in horarios if h not in profesor["horarios_disponibles"]]
+            cambio["horarios"] = st.multiselect("Horarios a agregar", libres, key="horarios_cambio")
+            completo = bool(cambio["horarios"])
+        elif tipo == "quitar_materia":
+            cambio["materia"] = st.selectbox("Materia", [m["nombre"] for m in profesor["materias"]], key="materia_cambio")
+            completo = cambio["materia"] is not None
+        elif tipo == "agregar_materia":
+            col1, col2, col3, col4 = st.columns(4)
+            materia = {
+                "nombre": col1.text_input("Materia", key="materia_nueva"),
+                "semestre": col2.number_input("Semestre", min_value=1, max_value=12, value=1, key="semestre_nueva"),
+                "duracion": col3.number_input("Horas semanales", min_value=1, max_value=20, value=4, key="duracion_nueva"),
+            }
+            paralelo = col4.text_input("Paralelo (opcional)", key="paralelo_nueva").strip()
+            if paralelo:
+                materia["paralelo"] = paralelo
+            cambio["materia"] = materia
+            completo = not validar_materia_dictada(materia)
+
+    if cambios:
+        for c in cambios:
+            st.markdown(f"- {describir_cambio(c)}")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Agregar cambio", disabled=not completo):
+            cambios.append(cambio)
+            st.rerun()
+    with col2:
+        if cambios and st.button("Descartar cambios"):
+            cambios.clear()
+            st.rerun()
+
+
+def describir_cambio(cambio):
+    """Texto breve de un cambio para mostrarlo en pantalla."""
+    tipo = cambio["op"]
+    if tipo in ("quitar_horarios", "agregar_horarios"):
+        accion = "sin" if tipo == "quitar_horarios" else "con"
+        return f"{cambio['profesor']} {accion} {', '.join(cambio['horarios'])}"
+    if tipo == "agregar_materia":
+        materia = cambio["materia"]
+        paralelo = f" ({materia['paralelo']})" if materia.get("paralelo") else ""
+        return f"{cambio['profesor']} dicta {materia['nombre']}{paralelo}, {materia['duracion']} h"
+    if tipo == "quitar_materia":
+        return f"{cambio['profesor']} deja {cambio['materia']}"
+    if tipo == "quitar_profesor":
+        return f"sin {cambio['profesor']}"
+    if tipo == "quitar_franjas":
+        return f"grilla sin {', '.join(cambio['horarios'])}"
+    return tipo
+
+
+def mostrar_comparacion(filas):
+    """Muestra la tabla comparativa y los errores de cada escenario."""
+    st.markdown("#### Comparación")
+    tabla = pd.DataFrame(filas).drop(columns=["errores"]).rename(columns={
+        "escenario": "Escenario",
+        "factible": "Factible",
+        "agotado": "Tiempo agotado",
+        "bloques_pendientes": "Bloques sin asignar",
+        "bloques_asignados": "Bloques asignados",
+        "costo": "Costo (menor es mejor)",
+        "huecos": "Horas muertas",
+        "dispersion": "Dispersión",
+        "temprano": "Clases temprano",
+    })
+    st.dataframe(tabla, use_container_width=True, hide_index=True)
+    for fila in filas:
+        if fila["errores"]:
+            with st.expander(f"Detalle: {fila['escenario']}"):
+                for error in fila["errores"]:
+                    st.markdown(f"- {error}")
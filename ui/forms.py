@@ -4,19 +4,65 @@ Incluye formularios para registrar, editar, eliminar y seleccionar profesores y
 """
 import streamlit as st
 from logic import utils
+from logic.concurrencia import ConflictoEdicion, etiqueta
+from logic.validaciones import validar_materia_dictada, validar_profesor
 # from ui.layout import tarjeta_profesor, tarjeta_materia
 from logic.asignador import asignar_horarios
 import pandas as pd
 
-HORARIOS_BASE = [
-    "Lunes 7-9", "Lunes 9-11", "Lunes 11-13", "Lunes 13-15",
-    "Martes 7-9", "Martes 9-11", "Martes 11-13", "Martes 13-15",
-    "Miércoles 7-9", "Miércoles 9-11", "Miércoles 11-13", "Miércoles 13-15",
-    "Jueves 7-9", "Jueves 9-11", "Jueves 11-13", "Jueves 13-15",
-    "Viernes 7-9", "Viernes 9-11", "Viernes 11-13", "Viernes 13-15"
-]
 DURACIONES = [1, 2, 4, 6]
 
+def registrar_cambio_horario(tipo, nombre):
+    """
+    Anota en la sesión un profesor o materia editado desde el último cálculo,
+    para que el recálculo de horarios solo repare lo afectado.
+    tipo: "profesores" o "materias".
+    """
+    cambios = st.session_state.setdefault("cambios_horario", {"profesores": [], "materias": []})
+    if nombre not in cambios[tipo]:
+        cambios[tipo].append(nombre)
+
+def version_vista(registro, clave):
+    """
+    Etiqueta del registro tal como el usuario lo vio en la ejecución anterior
+    del script. Un clic vuelve a ejecutarlo con los datos recién leídos, así
+    que se compara contra lo que había en pantalla y no contra lo actual.
+    Sirve para acciones de un clic (eliminar); los formularios de edición
+    usan edicion(), que conserva la etiqueta de cuando se abrieron.
+    """
+    clave = f"etiqueta_{clave}"
+    vista = st.session_state.get(clave)
+    st.session_state[clave] = etiqueta(registro)
+    return vista or st.session_state[clave]
+
+def edicion(clave, registro=None):
+    """
+    Registro y etiqueta tomados al abrir un formulario de edición. La primera
+    llamada con `registro` guarda la instantánea; las ejecuciones siguientes
+    la conservan, aunque otro usuario cambie el registro, hasta cerrar_edicion.
+    Retorna (registro, etiqueta) o None si el formulario no está abierto.
+    """
+    clave = f"edicion_{clave}"
+    if clave not in st.session_state and registro is not None:
+        st.session_state[clave] = (registro, etiqueta(registro))
+    return st.session_state.get(clave)
+
+def cerrar_edicion(clave):
+    st.session_state.pop(f"edicion_{clave}", None)
+
+def _escribir(escritura, *args, **kwargs):
+    """Ejecuta una escritura de utils; ante un conflicto lo informa y retorna False."""
+    try:
+        escritura(*args, **kwargs)
+        return True
+    except ConflictoEdicion as e:
+        st.error(f"{e}. Recargue la página para ver los datos actuales.")
+        return False
+
+def _advertir(errores):
+    """Muestra todos los errores de validación de un formulario."""
+    st.warning("Por favor, corrija los datos antes de guardar:\n" + "\n".join(f"- {e}" for e in errores))
+
 def formulario_profesor(default=None):
     """
     Formulario para ingresar o editar un profesor y sus materias.
@@ -24,12 +70,12 @@ def formulario_profesor(default=None):
     """
     if default is None:
         nombre = st.text_input("Nombre del profesor")
-        horarios = st.multiselect("Horarios disponibles", HORARIOS_BASE)
+        horarios = st.multiselect("Horarios disponibles", utils.cargar_horarios())
         n_materias = st.slider("¿Cuántas materias dicta?", min_value=1, max_value=10, value=1)
         materias_default = [{} for _ in range(n_materias)]
     else:
         nombre = st.text_input("Nombre del profesor", value=default['nombre'], key=f"edit_nombre_{default['nombre']}")
-        horarios = st.multiselect("Horarios disponibles", HORARIOS_BASE, default=default['horarios_disponibles'], key=f"edit_horarios_{default['nombre']}")
+        horarios = st.multiselect("Horarios disponibles", utils.cargar_horarios(), default=default['horarios_disponibles'], key=f"edit_horarios_{default['nombre']}")
         n_materias = st.slider("¿Cuántas materias dicta?", min_value=1, max_value=10, value=len(default['materias']), key=f"edit_nmat_{default['nombre']}")
         materias_default = default['materias'][:n_materias] + [{} for _ in range(n_materias - len(default['materias']))]
     materias = []
@@ -70,10 +116,10 @@ def formulario_profesor_con_malla(default=None):
     # Datos básicos del profesor
     if default is None:
         nombre = st.text_input("Nombre del profesor")
-        horarios = st.multiselect("Horarios disponibles", HORARIOS_BASE)
+        horarios = st.multiselect("Horarios disponibles", utils.cargar_horarios())
     else:
         nombre = st.text_input("Nombre del profesor", value=default['nombre'], key=f"edit_nombre_{default['nombre']}")
-        horarios = st.multiselect("Horarios disponibles", HORARIOS_BASE, default=default['horarios_disponibles'], key=f"edit_horarios_{default['nombre']}")
+        horarios = st.multiselect("Horarios disponibles", utils.cargar_horarios(), default=default['horarios_disponibles'], key=f"edit_horarios_{default['nombre']}")
 
     # Selección de materias por semestre
     st.markdown("### Selección de materias desde la malla curricular")
@@ -136,43 +182,61 @@ def gestionar_profesores():
     st.markdown("### Gestión de Profesores")
     profesores = utils.cargar_profesores()
     for prof in profesores:
+        vista = version_vista(prof, f"profesor_{prof['nombre']}")
         with st.expander(f"{prof['nombre']}"):
             st.markdown(f"**Horarios disponibles:** {', '.join(prof['horarios_disponibles']) if prof['horarios_disponibles'] else 'Ninguno'}")
             st.markdown("**Materias:**")
             for m in prof['materias']:
                 st.markdown(f"- {m['nombre']} (Semestre: {m['semestre']}, Duración: {m['duracion']}h)")
+            clave = f"profesor_{prof['nombre']}"
             col1, col2 = st.columns(2)
             with col1:
                 if st.button(f"Editar", key=f"editar_{prof['nombre']}"):
+                    edicion(clave, prof)
+                abierta = edicion(clave)
+                if abierta:
+                    original, etiqueta_original = abierta
                     with st.form(f"form_edit_{prof['nombre']}", clear_on_submit=True):
-                        nombre, horarios, materias = formulario_profesor(default=prof)
+                        nombre, horarios, materias = formulario_profesor(default=original)
                         submit = st.form_submit_button("Guardar cambios")
+                        cancelar = st.form_submit_button("Cancelar")
+                        if cancelar:
+                            cerrar_edicion(clave)
+                            st.experimental_rerun()
                         if submit:
-                            if not nombre or not horarios or any(not m["nombre"] or not m["semestre"] or not m["duracion"] for m in materias):
-                                st.warning("Por favor, complete todos los campos antes de guardar.")
+                            nuevo_prof = {"nombre": nombre, "horarios_disponibles": horarios, "materias": materias}
+                            errores = validar_profesor(nuevo_prof)
+                            if errores:
+                                _advertir(errores)
                             else:
-                                nuevo_prof = {"nombre": nombre, "horarios_disponibles": horarios, "materias": materias}
-                                utils.actualizar_profesor(prof['nombre'], nuevo_prof)
-                                st.success("Profesor actualizado.")
-                                st.experimental_rerun()
+                                if _escribir(utils.actualizar_profesor, prof['nombre'], nuevo_prof,
+                                                      esperado=etiqueta_original):
+                                    cerrar_edicion(clave)
+                                    registrar_cambio_horario("profesores", prof['nombre'])
+                                    registrar_cambio_horario("profesores", nombre)
+                                    st.success("Profesor actualizado.")
+                                    st.experimental_rerun()
             with col2:
                 if st.button(f"Eliminar", key=f"eliminar_{prof['nombre']}"):
-                    utils.eliminar_profesor(prof['nombre'])
-                    st.success("Profesor eliminado.")
-                    st.experimental_rerun()
+                    if _escribir(utils.eliminar_profesor, prof['nombre'], esperado=vista):
+                        registrar_cambio_horario("profesores", prof['nombre'])
+                        st.success("Profesor eliminado.")
+                        st.experimental_rerun()
     st.markdown("---")
     st.markdown("#### Agregar nuevo profesor")
     with st.form("form_nuevo_profesor", clear_on_submit=True):
         nombre, horarios, materias = formulario_profesor()
         submit = st.form_submit_button("Agregar profesor")
         if submit:
-            if not nombre or not horarios or any(not m["nombre"] or not m["semestre"] or not m["duracion"] for m in materias):
-                st.warning("Por favor, complete todos los campos antes de agregar el profesor.")
+            nuevo_prof = {"nombre": nombre, "horarios_disponibles": horarios, "materias": materias}
+            errores = validar_profesor(nuevo_prof)
+            if errores:
+                _advertir(errores)
             else:
-                nuevo_prof = {"nombre": nombre, "horarios_disponibles": horarios, "materias": materias}
-                utils.guardar_profesores(profesores + [nuevo_prof])
-                st.success("Profesor agregado.")
-                st.experimental_rerun()
+                if _escribir(utils.agregar_profesor, nuevo_prof):
+                    registrar_cambio_horario("profesores", nombre)
+                    st.success("Profesor agregado.")
+                    st.experimental_rerun()
 
 def seleccionar_profesores_para_calculo(profesores):
     """
@@ -190,39 +254,53 @@ def gestionar_materias():
     st.markdown("### Gestión de Materias")
     materias = utils.cargar_materias()
     for mat in materias:
+        vista = version_vista(mat, f"materia_dictada_{mat['nombre']}")
+        clave = f"materia_dictada_{mat['nombre']}"
         with st.expander(f"{mat['nombre']}"):
             st.markdown(f"- **Duración:** {mat['duracion']} horas/semana")
             st.markdown(f"- **Semestre:** {mat['semestre']}")
             col1, col2 = st.columns(2)
             with col1:
                 if st.button(f"Editar", key=f"editar_mat_{mat['nombre']}"):
+                    edicion(clave, mat)
+                abierta = edicion(clave)
+                if abierta:
+                    original, etiqueta_original = abierta
                     with st.form(f"form_edit_mat_{mat['nombre']}", clear_on_submit=True):
-                        nombre, duracion, semestre = formulario_materia(default=mat)
+                        nombre, duracion, semestre = formulario_materia(default=original)
                         submit = st.form_submit_button("Guardar cambios")
+                        cancelar = st.form_submit_button("Cancelar")
+                        if cancelar:
+                            cerrar_edicion(clave)
+                            st.experimental_rerun()
                         if submit:
-                            if not nombre or not duracion or not semestre:
-                                st.warning("Por favor, complete todos los campos antes de guardar.")
-                            else:
-                                nueva_mat = {"nombre": nombre, "duracion": duracion, "semestre": semestre}
-                                utils.actualizar_materia(mat['nombre'], nueva_mat)
+                            nueva_mat = dict(original, nombre=nombre, duracion=duracion, semestre=semestre)
+                            errores = validar_materia_dictada(nueva_mat)
+                            if errores:
+                                _advertir(errores)
+                            elif _escribir(utils.actualizar_materia, mat['nombre'], nueva_mat,
+                                                    esperado=etiqueta_original):
+                                cerrar_edicion(clave)
+                                registrar_cambio_horario("materias", mat['nombre'])
                                 st.success("Materia actualizada.")
                                 st.experimental_rerun()
             with col2:
                 if st.button(f"Eliminar", key=f"eliminar_mat_{mat['nombre']}"):
-                    utils.eliminar_materia(mat['nombre'])
-                    st.success("Materia eliminada.")
-                    st.experimental_rerun()
+                    if _escribir(utils.eliminar_materia, mat['nombre'], esperado=vista):
+                        registrar_cambio_horario("materias", mat['nombre'])
+                        st.success("Materia eliminada.")
+                        st.experimental_rerun()
     st.markdown("---")
     st.markdown("#### Agregar nueva materia")
     with st.form("form_nueva_materia", clear_on_submit=True):
         nombre, duracion, semestre = formulario_materia()
         submit = st.form_submit_button("Agregar materia")
         if submit:
-            if not nombre or not duracion or not semestre:
-                st.warning("Por favor, complete todos los campos antes de agregar la materia.")
-            else:
-                nueva_mat = {"nombre": nombre, "duracion": duracion, "semestre": semestre}
-                utils.guardar_materias(materias + [nueva_mat])
+            nueva_mat = {"nombre": nombre, "duracion": duracion, "semestre": semestre}
+            errores = validar_materia_dictada(nueva_mat)
+            if errores:
+                _advertir(errores)
+            elif _escribir(utils.agregar_materia, nueva_mat):
                 st.success("Materia agregada.")
                 st.experimental_rerun()
 
@@ -255,10 +333,13 @@ def gestionar_profesores_con_malla_dashboard():
     
     # Mostrar profesores existentes
     for prof in profesores:
+        vista = version_vista(prof, f"profesor_malla_{prof['nombre']}")
         tarjeta_profesor(
             prof,
             on_edit=lambda p=prof: editar_profesor_con_malla(p),
-            on_delete=lambda p=prof: (utils.eliminar_profesor(p['nombre']), st.experimental_rerun())
+            on_delete=lambda p=prof, v=vista: (
+                _escribir(utils.eliminar_profesor, p['nombre'], esperado=v) and st.experimental_rerun()
+            )
         )
     
     # Botón para agregar nuevo profesor
@@ -271,35 +352,42 @@ def gestionar_profesores_con_malla_dashboard():
         nombre, horarios, materias = formulario_profesor_con_malla()
         
         if st.button("Guardar profesor", key="save_prof_malla"):
-            if not nombre or not horarios or not materias:
-                st.warning("Por favor, complete todos los campos y seleccione al menos una materia.")
+            nuevo_prof = {
+                "nombre": nombre,
+                "horarios_disponibles": horarios,
+                "materias": materias
+            }
+            errores = validar_profesor(nuevo_prof)
+            if errores:
+                _advertir(errores)
             else:
-                nuevo_prof = {
-                    "nombre": nombre, 
-                    "horarios_disponibles": horarios, 
-                    "materias": materias
-                }
-                utils.guardar_profesores(profesores + [nuevo_prof])
-                st.success("Profesor agregado exitosamente.")
-                st.session_state['show_prof_malla_form'] = False
-                st.experimental_rerun()
+                if _escribir(utils.agregar_profesor, nuevo_prof):
+                    st.success("Profesor agregado exitosamente.")
+                    st.session_state['show_prof_malla_form'] = False
+                    st.experimental_rerun()
 
 def editar_profesor_con_malla(prof):
     """
-    Editar profesor usando la malla curricular.
+    Editar profesor usando la malla curricular. El formulario parte del
+    profesor tal como estaba al abrirlo (ver edicion).
     """
+    clave = f"profesor_malla_{prof['nombre']}"
+    original, vista = edicion(clave, prof)
     st.markdown(f"##### Editar Profesor: {prof['nombre']}")
-    nombre, horarios, materias = formulario_profesor_con_malla(default=prof)
+    nombre, horarios, materias = formulario_profesor_con_malla(default=original)
     
     if st.button("Guardar cambios", key=f"save_edit_prof_malla_{prof['nombre']}"):
-        if not nombre or not horarios or not materias:
-            st.warning("Por favor, complete todos los campos y seleccione al menos una materia.")
+        nuevo_prof = {
+            "nombre": nombre,
+            "horarios_disponibles": horarios,
+            "materias": materias
+        }
+        errores = validar_profesor(nuevo_prof)
+        if errores:
+            _advertir(errores)
         else:
-            nuevo_prof = {
-                "nombre": nombre, 
-                "horarios_disponibles": horarios, 
-                "materias": materias
-            }
-            utils.actualizar_profesor(prof['nombre'], nuevo_prof)
-            st.success("Profesor actualizado exitosamente.")
-            st.experimental_rerun() 
\ No newline at end of file
+            if _escribir(utils.actualizar_profesor, prof['nombre'], nuevo_prof, esperado=vista):
+                cerrar_edicion(clave)
+                registrar_cambio_horario("profesores", prof['nombre'])
+                st.success("Profesor actualizado exitosamente.")
+                st.experimental_rerun()
\ No newline at end of file
@@ -7,6 +7,8 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, List, Optional
 from logic.materias_manager import MateriasManager
+from logic.concurrencia import etiqueta
+from ui.forms import registrar_cambio_horario, version_vista
 
 
 def render_materias_section():
@@ -22,6 +24,8 @@ def render_materias_section():
     
     # Cargar materias actuales
     materias = materias_manager.load_materias()
+    if materias_manager.error_carga:
+        st.error(materias_manager.error_carga)
     
     # Crear dos columnas: tabla y formularios
     col1, col2 = st.columns([2, 1])
@@ -31,6 +35,7 @@ def render_materias_section():
     
     with col2:
         render_materias_forms(materias_manager)
+        render_import_materias(materias_manager)
 
 
 def render_materias_table(materias: List[Dict], materias_manager: MateriasManager):
@@ -116,6 +121,7 @@ def render_edit_delete_controls(materias: List[Dict], materias_manager: Materias
             materia = materias_manager.get_materia_by_codigo(codigo_seleccionado)
             
             if materia:
+                vista = version_vista(materia, f"materia_{codigo_seleccionado}")
                 # Mostrar datos actuales
                 st.markdown("**Datos actuales:**")
                 col1, col2 = st.columns(2)
@@ -140,8 +146,9 @@ def render_edit_delete_controls(materias: List[Dict], materias_manager: Materias
                 
                 with col_delete:
                     if st.button("🗑️ Eliminar", key="btn_delete_materia", type="secondary"):
-                        success, message = materias_manager.delete_materia(codigo_seleccionado)
+                        success, message = materias_manager.delete_materia(codigo_seleccionado, esperado=vista)
                         if success:
+                            registrar_cambio_horario("materias", materia['nombre'])
                             st.success(message)
                             st.rerun()
                         else:
@@ -170,6 +177,36 @@ def render_materias_forms(materias_manager: MateriasManager):
         render_add_materia_form(materias_manager)
 
 
+def render_import_materias(materias_manager: MateriasManager):
+    """
+    Renderiza la importación masiva de materias desde un archivo CSV.
+
+    Args:
+        materias_manager: Instancia del gestor de materias
+    """
+    st.markdown("---")
+    st.subheader("📥 Importar archivo")
+    st.caption("CSV con encabezados: codigo, nombre, semestre, horas_semanales, horas_semestrales")
+
+    archivo = st.file_uploader("Archivo CSV de materias:", type=["csv"], key="import_materias_csv")
+    actualizar = st.checkbox("Actualizar las materias cuyo código ya existe", key="import_materias_actualizar")
+
+    if archivo is not None and st.button("📥 Importar materias", key="btn_import_materias"):
+        try:
+            texto = archivo.getvalue().decode("utf-8")
+        except UnicodeDecodeError:
+            st.error("El archivo debe estar codificado en UTF-8")
+            return
+        success, message, errores = materias_manager.import_csv(texto, actualizar_existentes=actualizar)
+        if success:
+            st.success(message)
+            st.rerun()
+        else:
+            st.error(message)
+            for fila, error in errores:
+                st.markdown(f"- Fila {fila}: {error}")
+
+
 def render_add_materia_form(materias_manager: MateriasManager):
     """
     Renderiza el formulario para agregar una nueva materia.
@@ -262,9 +299,12 @@ def render_edit_materia_form(materias_manager: MateriasManager):
             }
             
             # Validar y actualizar
-            success, message = materias_manager.update_materia(materia['codigo'], materia_actualizada)
+            success, message = materias_manager.update_materia(
+                materia['codigo'], materia_actualizada, esperado=etiqueta(materia)
+            )
             
             if success:
+                registrar_cambio_horario("materias", materia['nombre'])
                 st.success(message)
                 st.session_state.show_edit_form = False
                 st.session_state.editing_materia = None
@@ -282,6 +322,8 @@ def render_materias_filter_section():
     
     materias_manager = MateriasManager()
     materias = materias_manager.load_materias()
+    if materias_manager.error_carga:
+        st.error(materias_manager.error_carga)
     
     if not materias:
         st.info("No hay materias para filtrar.")